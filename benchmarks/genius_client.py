@@ -0,0 +1,120 @@
+"""Benchmark of the shared Genius client against a client created for each track.
+
+The requests of the search of tracks (the search itself, then the page of the lyrics) are sent by a pool of threads
+to a local mock of Genius, either with a new `genius.Genius` client for each track, which opens a new connection
+for each request, or with the `GeniusClient` shared by the threads, which keeps its connections alive.
+The pages are only downloaded, not parsed, so that only the cost of the connections is compared.
+
+The connections cost more over TLS. To serve HTTPS, create a certificate for `localhost` and pass it:
+
+    openssl req -x509 -newkey rsa:2048 -nodes -subj /CN=localhost -addext subjectAltName=DNS:localhost \
+        -keyout key.pem -out cert.pem
+
+Run from the root of the repository:
+
+    python -m benchmarks.genius_client [--tracks 400] [--threads 8] [--latency 0] [--cert cert.pem --key key.pem]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import genius
+import requests
+
+from benchmarks.mock_genius import ARTIST, MockGenius
+from src.genius_client import GeniusClient
+from src.scheduler import SearchScheduler
+
+# Token sent to the mock
+TOKEN = "x" * 64
+
+
+def search_new_client(title: str) -> None:
+    """Search the track with a new client, as each worker used to.
+
+    Args:
+        title (str): Title of the track.
+    """
+    client = genius.Genius(TOKEN)
+    song = next(client.search(f"{title} {ARTIST}"))
+    requests.get(song.url).raise_for_status()
+
+
+def run(
+    mock: MockGenius,
+    label: str,
+    search: Callable[[str], None],
+    tracks: int,
+    threads: int,
+) -> None:
+    """Search new `tracks` with the `search` function from a pool of `threads`, and print the throughput.
+
+    Args:
+        mock (MockGenius): Mock of Genius.
+        label (str): Label of the run.
+        search (Callable[[str], None]): Function searching a track from its title.
+        tracks (int): Number of tracks.
+        threads (int): Number of threads.
+    """
+    titles = [f"{label} song {index}" for index in range(tracks)]
+    before = mock.get_stats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(search, titles))
+    elapsed = time.perf_counter() - start
+    after = mock.get_stats()
+    print(
+        f"{label}: {tracks / elapsed:.0f} tracks/s ({elapsed:.2f} s), "
+        f"{after['requests'] - before['requests']} requests, "
+        f"{after['connections'] - before['connections']} connections"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tracks", type=int, default=400, help="Tracks searched per run"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=8, help="Threads searching the tracks"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0, help="Delay of the responses in seconds"
+    )
+    parser.add_argument("--cert", default="", help="Certificate, to serve HTTPS")
+    parser.add_argument("--key", default="", help="Private key of the certificate")
+    args = parser.parse_args()
+
+    if args.cert != "":
+        os.environ["REQUESTS_CA_BUNDLE"] = os.path.abspath(args.cert)
+    mock = MockGenius(args.latency, cert=args.cert, key=args.key)
+    genius.API.BASE_URL = mock.url
+    shared_client = GeniusClient(
+        TOKEN, args.threads, SearchScheduler(10000, args.threads, 0)
+    )
+
+    def search_shared_client(title: str) -> None:
+        """Search the track with the shared client.
+
+        Args:
+            title (str): Title of the track.
+        """
+        song = next(shared_client.search(f"{title} {ARTIST}"))
+        shared_client.get_page(song.url)
+
+    try:
+        run(mock, "client per track", search_new_client, args.tracks, args.threads)
+        run(mock, "shared client", search_shared_client, args.tracks, args.threads)
+    finally:
+        shared_client.close()
+        mock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark of the extraction of the lyrics from the pages of the songs.
+
+The pages of the fixtures are padded to the size of a real page of Genius (about 600 KB),
+with scripts before the lyrics and a long header and footer around them.
+The streaming extractor of `GeniusClient.parse_lyrics` is compared to the tree built by BeautifulSoup,
+after checking that both extract the same lyrics.
+
+Run from the root of the repository:
+
+    python -m benchmarks.lyrics_extraction [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from src.genius_client import GeniusClient
+from tests.test_genius_client import PAGES, extract_lyrics_tree
+
+
+def pad_page(html: str) -> str:
+    """Pad the `html` of a page to the size of a real page of Genius.
+
+    Args:
+        html (str): HTML of the page of the song.
+
+    Returns:
+        str: Padded HTML.
+    """
+    script = "<script>window.__STATE__ = {%s};</script>" % ", ".join(
+        f'"key{i}": "<span class=\\"x\\">{i}</span>"' for i in range(4000)
+    )
+    header = "".join(
+        f'<div class="Header-{i}"><a href="/x">Nav {i}</a><span class="c">{i}</span></div>'
+        for i in range(1500)
+    )
+    footer = "".join(
+        f'<div class="Footer"><p>Footer {i}</p><ul><li>x</li></ul></div>'
+        for i in range(1500)
+    )
+    head, _, body = html.partition("<body>")
+    body, _, tail = body.rpartition("</body>")
+    return f"{head}{script}<body>{header}{body}{footer}{script * 2}</body>{tail}"
+
+
+def measure(
+    extract: Callable[[str], list[str]], pages: list[str], repeat: int
+) -> float:
+    """Return the mean time in milliseconds the `extract` function takes on one of the `pages`.
+
+    Args:
+        extract (Callable[[str], list[str]]): Function extracting the lyrics.
+        pages (list[str]): HTML of the pages.
+        repeat (int): Number of times each page is extracted.
+
+    Returns:
+        float: Mean time in milliseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract(page)
+    return (time.perf_counter() - start) / (repeat * len(pages)) * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Extractions of each page"
+    )
+    args = parser.parse_args()
+
+    pages = [pad_page(page.read_text(encoding="utf-8")) for page in PAGES]
+    for page in pages:
+        assert GeniusClient.parse_lyrics(page) == extract_lyrics_tree(page)
+    size = sum(map(len, pages)) // len(pages) // 1024
+    print(f"{len(pages)} pages of {size} KB on average")
+
+    tree = measure(extract_lyrics_tree, pages, args.repeat)
+    streaming = measure(GeniusClient.parse_lyrics, pages, args.repeat)
+    print(f"BeautifulSoup tree: {tree:.1f} ms per page")
+    print(
+        f"Streaming extractor: {streaming:.1f} ms per page ({tree / streaming:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
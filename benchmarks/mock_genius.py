@@ -0,0 +1,249 @@
+"""Local mock of the API and of the pages of the lyrics of Genius.
+
+The search returns the song searched, and its page holds lyrics in the markup of Genius.
+Each response can be delayed to simulate the latency of Genius, and the requests beyond a rate can be throttled (429).
+The connections and requests received are counted, and returned by `/stats`.
+
+Run from the root of the repository, the URL of the server is printed once it listens:
+
+    python -m benchmarks.mock_genius [--latency 0.05] [--rate 0] [--cert cert.pem --key key.pem]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import ssl
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# Artist of the songs of the mock, the title of a song is the text searched before it
+ARTIST = "Mock Artist"
+
+# Lyrics of every song of the mock
+LYRICS = "[Verse 1]<br/>First line of the song<br/>Second line of the song"
+
+
+class MockGeniusHandler(BaseHTTPRequestHandler):
+    """Handler of the requests to the mock, keeping the connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    # The headers and the body are written separately, which Nagle's algorithm would delay on a kept-alive connection
+    disable_nagle_algorithm = True
+    server: MockGeniusServer
+
+    def setup(self) -> None:
+        """Count the new connection."""
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, *args) -> None:
+        """Don't log the requests."""
+
+    def send(
+        self, status: int, body: str = "", content_type: str = "text/html"
+    ) -> None:
+        """Send the response.
+
+        Args:
+            status (int): Status of the response.
+            body (str): Body of the response. Defaults to an empty string.
+            content_type (str): Type of the body. Defaults to `text/html`.
+        """
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        """Respond to a search, to a page of lyrics or to the statistics."""
+        url = urllib.parse.urlparse(self.path)
+        if url.path == "/stats":
+            self.send(200, json.dumps(self.server.counts), "application/json")
+            return
+
+        self.server.count("requests")
+        time.sleep(self.server.latency)
+        if self.server.is_throttled():
+            self.server.count("throttled")
+            self.send(429)
+        elif url.path == "/search":
+            self.server.count("searches")
+            text = urllib.parse.parse_qs(url.query)["q"][0]
+            title = text.removesuffix(f" {ARTIST}")
+            song = {
+                "id": 1,
+                "title": title,
+                "title_with_featured": title,
+                "url": f"{self.server.url}/lyrics/{urllib.parse.quote(title)}",
+                "primary_artist": {"id": 1, "name": ARTIST, "url": ""},
+            }
+            body = {"meta": {"status": 200}, "response": {"hits": [{"result": song}]}}
+            self.send(200, json.dumps(body), "application/json")
+        elif url.path.startswith("/lyrics/"):
+            self.server.count("lyrics")
+            self.send(
+                200,
+                '<html><body><div data-lyrics-container="true">'
+                f"{LYRICS}</div></body></html>",
+            )
+        else:
+            self.send(404)
+
+
+class MockGeniusServer(ThreadingHTTPServer):
+    """Server of the mock.
+
+    Attributes:
+        latency (float): Time in seconds each response is delayed.
+        rate (float): Number of requests per second above which the requests are throttled, or 0 to never throttle.
+        url (str): URL of the server.
+        counts (Counter): Number of connections and of requests received, by kind.
+        sent (deque[float]): Times of the requests responded during the last second.
+        lock (threading.Lock): Lock protecting the counts and the times.
+    """
+
+    daemon_threads = True
+    # Accept all the connections opened at once by the benchmarks, as Genius would
+    request_queue_size = 1024
+
+    def __init__(
+        self, port: int, latency: float, rate: float, tls: Optional[ssl.SSLContext]
+    ) -> None:
+        """Init MockGeniusServer.
+
+        Args:
+            port (int): Port to listen to, or 0 for any free port.
+            latency (float): Time in seconds each response is delayed.
+            rate (float): Number of requests per second above which the requests are throttled, or 0 to never throttle.
+            tls (ssl.SSLContext | None): Context of the TLS connections, or `None` to serve HTTP.
+        """
+        super().__init__(("127.0.0.1", port), MockGeniusHandler)
+        if tls is not None:
+            self.socket = tls.wrap_socket(self.socket, server_side=True)
+        self.latency: float = latency
+        self.rate: float = rate
+        scheme = "http" if tls is None else "https"
+        self.url: str = f"{scheme}://localhost:{self.server_address[1]}"
+        self.counts: Counter = Counter()
+        self.sent: deque[float] = deque()
+        self.lock: threading.Lock = threading.Lock()
+
+    def count(self, kind: str) -> None:
+        """Count a connection or a request of the `kind`.
+
+        Args:
+            kind (str): Kind of connection or request.
+        """
+        with self.lock:
+            self.counts[kind] += 1
+
+    def is_throttled(self) -> bool:
+        """Return if the request should be throttled, because of the requests responded during the last second.
+
+        Returns:
+            bool: If the request should be throttled.
+        """
+        if self.rate == 0:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            while len(self.sent) > 0 and self.sent[0] < now - 1:
+                self.sent.popleft()
+            if len(self.sent) >= self.rate:
+                return True
+            self.sent.append(now)
+            return False
+
+
+class MockGenius:
+    """Mock running in its own process, so that it doesn't compete for the GIL with the client benchmarked.
+
+    Attributes:
+        process (subprocess.Popen): Process of the mock.
+        url (str): URL of the mock.
+    """
+
+    def __init__(
+        self, latency: float = 0, rate: float = 0, cert: str = "", key: str = ""
+    ) -> None:
+        """Init MockGenius, and wait for the mock to listen.
+
+        Args:
+            latency (float): Time in seconds each response is delayed. Defaults to 0.
+            rate (float): Number of requests per second above which the requests are throttled. Defaults to 0.
+            cert (str): Certificate of the TLS connections, or an empty string to serve HTTP. Defaults to "".
+            key (str): Private key of the certificate. Defaults to "".
+        """
+        arguments = ["--latency", str(latency), "--rate", str(rate)]
+        if cert != "":
+            arguments += ["--cert", cert, "--key", key]
+        self.process: subprocess.Popen = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.mock_genius", *arguments],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.url: str = self.process.stdout.readline().strip()
+
+    def get_stats(self) -> Counter:
+        """Return the number of connections and of requests received so far, by kind.
+
+        Returns:
+            Counter: Number of connections and of requests.
+        """
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        with urllib.request.urlopen(f"{self.url}/stats", context=context) as response:
+            stats = Counter(json.load(response))
+        # Don't count the connection of this request
+        stats["connections"] -= 1
+        return stats
+
+    def close(self) -> None:
+        """Stop the mock."""
+        self.process.terminate()
+        self.process.wait()
+
+
+def main() -> None:
+    """Run the mock until it is interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--port", type=int, default=0, help="Port, any free port by default"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0, help="Delay of the responses in seconds"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=0, help="Requests per second before throttling"
+    )
+    parser.add_argument("--cert", default="", help="Certificate, to serve HTTPS")
+    parser.add_argument("--key", default="", help="Private key of the certificate")
+    args = parser.parse_args()
+
+    tls = None
+    if args.cert != "":
+        tls = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        tls.load_cert_chain(args.cert, args.key)
+    server = MockGeniusServer(args.port, args.latency, args.rate, tls)
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
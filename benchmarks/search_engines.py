@@ -0,0 +1,166 @@
+"""Benchmark of the search of the lyrics by the pool of workers and by the asyncio engine.
+
+The lyrics of tracks are searched on a local mock of Genius delaying its responses,
+with several numbers of requests in flight. The pool runs one thread per request in flight,
+while the engine sends them all from the thread of its event loop.
+
+Run from the root of the repository:
+
+    python -m benchmarks.search_engines [--tracks 1000] [--latency 1] [--concurrency 64,256]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import threading
+import time
+import types
+from pathlib import Path
+
+import genius
+from PySide6 import QtCore
+
+from benchmarks.mock_genius import ARTIST, MockGenius
+from src.cache import LyricsCache
+from src.genius_client import GeniusClient
+from src.scheduler import SearchScheduler
+from src.search_async import AsyncSearchEngine
+from src.tag import WorkerSearchLyrics
+from src.track import Track
+
+
+def create_tracks(label: str, count: int) -> list[Track]:
+    """Create the tracks to search, of which the titles are unique to the run.
+
+    Args:
+        label (str): Label of the run.
+        count (int): Number of tracks.
+
+    Returns:
+        list[Track]: Tracks to search.
+    """
+    tracks = []
+    for index in range(count):
+        track = Track(Path(f"/music/{label}/{index}.mp3"))
+        track.title = f"{label} song {index}"
+        track.artists = [ARTIST]
+        track.main_artist = ARTIST
+        tracks.append(track)
+    return tracks
+
+
+def search_pool(workers: list[WorkerSearchLyrics], concurrency: int) -> int:
+    """Search the tracks of the `workers` with a pool of `concurrency` threads.
+
+    Args:
+        workers (list[WorkerSearchLyrics]): Workers holding the tracks.
+        concurrency (int): Number of requests in flight.
+
+    Returns:
+        int: Peak number of threads.
+    """
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(concurrency)
+    for worker in workers:
+        worker.setAutoDelete(False)
+        pool.start(worker)
+    peak = 0
+    while not pool.waitForDone(50):
+        peak = max(peak, threading.active_count() + pool.activeThreadCount())
+    return peak
+
+
+def search_engine(workers: list[WorkerSearchLyrics], client: GeniusClient) -> int:
+    """Search the tracks of the `workers` with the asyncio engine.
+
+    Args:
+        workers (list[WorkerSearchLyrics]): Workers holding the tracks.
+        client (GeniusClient): Genius client of the engine.
+
+    Returns:
+        int: Peak number of threads.
+    """
+    engine = AsyncSearchEngine(client)
+    searched = []
+    for worker in workers:
+        worker.signals.signal_lyrics_searched.connect(
+            searched.append, QtCore.Qt.ConnectionType.DirectConnection
+        )
+        engine.start(worker)
+    peak = 0
+    while len(searched) < len(workers):
+        time.sleep(0.05)
+        peak = max(peak, threading.active_count())
+    engine.close()
+    return peak
+
+
+def run(mock: MockGenius, engine: str, tracks: int, concurrency: int) -> None:
+    """Search the lyrics of new `tracks` with the `engine`, and print its throughput.
+
+    Args:
+        mock (MockGenius): Mock of Genius.
+        engine (str): `pool` or `asyncio`.
+        tracks (int): Number of tracks.
+        concurrency (int): Number of requests in flight.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        gtagger = types.SimpleNamespace(
+            lyrics_cache=LyricsCache(Path(directory) / "lyrics_cache.sqlite")
+        )
+        client = GeniusClient(
+            "x" * 64, concurrency, SearchScheduler(10000, concurrency, 3)
+        )
+        searched = create_tracks(f"{engine}{concurrency}", tracks)
+        workers = [
+            WorkerSearchLyrics(client, [track], True, gtagger) for track in searched
+        ]
+        before = mock.get_stats()
+        start = time.perf_counter()
+        if engine == "pool":
+            peak = search_pool(workers, concurrency)
+        else:
+            peak = search_engine(workers, client)
+        elapsed = time.perf_counter() - start
+        requests = mock.get_stats()["requests"] - before["requests"]
+        client.close()
+        gtagger.lyrics_cache.close()
+
+    found = sum(1 for track in searched if track.has_lyrics_new())
+    print(
+        f"{engine}, {concurrency} requests in flight: {tracks / elapsed:.0f} tracks/s "
+        f"({elapsed:.2f} s), {found} found, {requests} requests, {peak} threads at most"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tracks", type=int, default=1000, help="Tracks searched per run"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=1, help="Delay of the responses in seconds"
+    )
+    parser.add_argument(
+        "--concurrency", default="64,256", help="Requests in flight of each run"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = QtCore.QCoreApplication([])
+    mock = MockGenius(args.latency)
+    genius.API.BASE_URL = mock.url
+    try:
+        for concurrency in map(int, args.concurrency.split(",")):
+            for engine in ("pool", "asyncio"):
+                run(mock, engine, args.tracks, concurrency)
+    finally:
+        mock.close()
+    app.shutdown()
+
+
+if __name__ == "__main__":
+    main()
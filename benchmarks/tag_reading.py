@@ -0,0 +1,199 @@
+"""Benchmark of the reading of the tags of a library with several numbers of workers.
+
+Without a library, a synthetic one is generated: small FLAC and MP3 files with tags and a cover.
+The latency of a network storage can be simulated by delaying the reading of each file.
+Each run starts with an empty scan cache, so that every file is read with `mutagen`.
+With one worker, the files are read one by one, as they were before the pool of workers.
+
+Run from the root of the repository:
+
+    python -m benchmarks.tag_reading [--library DIRECTORY | --files 600] [--latency 0.01] [--workers 1,4,8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+import tempfile
+import time
+import types
+from pathlib import Path
+
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import APIC, ID3, TALB, TIT2, TPE1, TRCK, USLT
+from PySide6 import QtCore, QtGui
+
+from src.cache import ScanCache
+from src.files import iterate_directory
+from src.tag import ThreadReadTracks
+from src.track import Track
+
+
+def create_cover(color: str) -> bytes:
+    """Return a PNG cover of the `color`.
+
+    Args:
+        color (str): Name of the color.
+
+    Returns:
+        bytes: Data of the cover.
+    """
+    image = QtGui.QImage(600, 600, QtGui.QImage.Format.Format_RGB32)
+    image.fill(QtGui.QColor(color))
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def create_flac(path: Path, title: str, artist: str, album: str, cover: bytes) -> None:
+    """Create a FLAC file of 200 seconds with a single frame, and tag it.
+
+    Args:
+        path (Path): Path to the file.
+        title (str): Title of the track.
+        artist (str): Artist of the track.
+        album (str): Album of the track.
+        cover (bytes): Data of the cover.
+    """
+    stream_info = struct.pack(">HH", 4096, 4096) + b"\x00\x00\x10" * 2
+    stream_info += ((44100 << 44) | (1 << 41) | (15 << 36) | 44100 * 200).to_bytes(
+        8, "big"
+    )
+    stream_info += b"\x00" * 16
+    path.write_bytes(
+        b"fLaC\x00"
+        + len(stream_info).to_bytes(3, "big")
+        + stream_info
+        + b"\x81"
+        + (1024).to_bytes(3, "big")
+        + b"\x00" * 1024
+        + b"\xff\xf8"
+        + b"\x00" * 2000
+    )
+    file = FLAC(path)
+    file["title"] = title
+    file["artist"] = artist
+    file["album"] = album
+    file["lyrics"] = "First line\nSecond line"
+    picture = Picture()
+    picture.type = 3
+    picture.mime = "image/png"
+    picture.data = cover
+    file.add_picture(picture)
+    file.save()
+
+
+def create_mp3(path: Path, title: str, artist: str, album: str, cover: bytes) -> None:
+    """Create a MP3 file of 200 frames, and tag it.
+
+    Args:
+        path (Path): Path to the file.
+        title (str): Title of the track.
+        artist (str): Artist of the track.
+        album (str): Album of the track.
+        cover (bytes): Data of the cover.
+    """
+    path.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 200)
+    tags = ID3()
+    tags.add(TIT2(text=title))
+    tags.add(TPE1(text=artist))
+    tags.add(TALB(text=album))
+    tags.add(TRCK(text="1"))
+    tags.add(USLT(text="First line\nSecond line"))
+    tags.add(APIC(mime="image/png", type=3, desc="", data=cover))
+    tags.save(path)
+
+
+def create_library(directory: Path, files: int) -> None:
+    """Create a synthetic library of `files` files, half FLAC and half MP3, in albums of 12 tracks.
+
+    Args:
+        directory (Path): Directory of the library.
+        files (int): Number of files.
+    """
+    covers = [create_cover(color) for color in ("red", "green", "blue")]
+    for index in range(files):
+        album = f"Album {index // 12}"
+        (directory / album).mkdir(exist_ok=True)
+        create = create_flac if index % 2 else create_mp3
+        extension = "flac" if index % 2 else "mp3"
+        create(
+            directory / album / f"{index:05}.{extension}",
+            f"Song {index}",
+            f"Artist {index // 120}",
+            album,
+            covers[index // 12 % len(covers)],
+        )
+
+
+def run(library: Path, workers: int) -> None:
+    """Read the files of the `library` with `workers` workers and an empty scan cache, and print the throughput.
+
+    Args:
+        library (Path): Directory of the library.
+        workers (int): Number of workers.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        gtagger = types.SimpleNamespace(
+            scan_cache=ScanCache(Path(directory) / "scan_cache.sqlite")
+        )
+        thread = ThreadReadTracks(iterate_directory(library, True), workers, gtagger)
+        tracks = []
+        thread.add_tracks.connect(
+            lambda batch, _: tracks.extend(batch),
+            QtCore.Qt.ConnectionType.DirectConnection,
+        )
+        start = time.perf_counter()
+        thread.run()
+        elapsed = time.perf_counter() - start
+        gtagger.scan_cache.close()
+    print(
+        f"{workers} workers: {len(tracks) / elapsed:.0f} files/s ({len(tracks)} files in {elapsed:.2f} s)"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--library", type=Path, help="Library to read, a synthetic one by default"
+    )
+    parser.add_argument(
+        "--files", type=int, default=600, help="Files of the synthetic library"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0,
+        help="Delay of the reading of each file in seconds",
+    )
+    parser.add_argument("--workers", default="1,4,8", help="Workers of each run")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtGui.QGuiApplication([])
+    if args.latency > 0:
+        read_tags = Track.read_tags
+
+        def read_tags_delayed(track: Track) -> bool:
+            """Read the tags of the `track` after the latency of the storage."""
+            time.sleep(args.latency)
+            return read_tags(track)
+
+        Track.read_tags = read_tags_delayed
+
+    with tempfile.TemporaryDirectory() as directory:
+        library = args.library
+        if library is None:
+            library = Path(directory)
+            create_library(library, args.files)
+        for workers in map(int, args.workers.split(",")):
+            run(library, workers)
+    app.shutdown()
+
+
+if __name__ == "__main__":
+    main()
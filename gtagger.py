@@ -1,11 +1,15 @@
 """Runs GTagger."""
 
+import locale
+import logging as log
+import multiprocessing
 import sys
 
 import qdarktheme
 from PySide6 import QtCore, QtWidgets
 
-from src.consts import SIZE_MAIN_WINDOW
+from src.cache import LyricsCache, ScanCache, get_cache_path
+from src.consts import FILENAME_LYRICS_CACHE, FILENAME_SCAN_CACHE, SIZE_MAIN_WINDOW
 from src.enums import CustomColors
 from src.settings import SettingsManager
 from src.window_main import WindowMain
@@ -16,6 +20,8 @@ class GTagger(QtWidgets.QApplication):
 
     Attributes:
         settings_manager (SettingsManager): Settings manager of the application.
+        scan_cache (ScanCache): Cache of the tags read from the files.
+        lyrics_cache (LyricsCache): Cache of the lyrics found on Genius.
     """
 
     def __init__(self) -> None:
@@ -26,9 +32,23 @@ class GTagger(QtWidgets.QApplication):
         QtCore.QCoreApplication.setApplicationName("GTagger")
         QtCore.QCoreApplication.setOrganizationDomain("https://github.com/maelchiotti")
 
+        # Sort the tracks according to the locale of the user
+        try:
+            locale.setlocale(locale.LC_COLLATE, "")
+        except locale.Error as exception:
+            log.error("Error while setting the locale : %s", str(exception))
+
         # Create the settings manager
         self.settings_manager: SettingsManager = SettingsManager()
 
+        # Create the scan cache
+        self.scan_cache: ScanCache = ScanCache(get_cache_path(FILENAME_SCAN_CACHE))
+
+        # Create the lyrics cache
+        self.lyrics_cache: LyricsCache = LyricsCache(
+            get_cache_path(FILENAME_LYRICS_CACHE)
+        )
+
         # Set the application stylesheet
         self.set_stylesheet()
 
@@ -67,6 +87,9 @@ class GTagger(QtWidgets.QApplication):
 
 
 if __name__ == "__main__":
+    # Needed by the processes parsing the lyrics when GTagger is frozen into an executable
+    multiprocessing.freeze_support()
+
     gtagger = GTagger()
 
     main_window = WindowMain(gtagger)
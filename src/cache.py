@@ -0,0 +1,537 @@
+"""Persistent caches."""
+
+from __future__ import annotations
+
+import logging as log
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from PySide6 import QtCore, QtGui
+
+from src.consts import (
+    MAX_ENTRIES_LYRICS_CACHE,
+    MAX_ENTRIES_SCAN_CACHE,
+    SEPARATOR_ARTISTS_CACHE,
+    TTL_LYRICS_CACHE,
+    TTL_NOT_FOUND_LYRICS_CACHE,
+    VERSION_LYRICS_CACHE,
+    VERSION_SCAN_CACHE,
+)
+from src.enums import FileType
+from src.track import Track
+
+
+def get_cache_path(filename: str) -> Path:
+    """Return the path to the cache file `filename`, creating its directory if needed.
+
+    If the directory can't be created, the error is only logged, since the cache can work without its file.
+
+    Args:
+        filename (str): Name of the cache file.
+
+    Returns:
+        Path: Path to the cache file.
+    """
+    directory = Path(
+        QtCore.QStandardPaths.writableLocation(
+            QtCore.QStandardPaths.StandardLocation.CacheLocation
+        )
+    )
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as exception:
+        log.error(
+            "Error while creating the cache directory '%s' : %s",
+            directory,
+            str(exception),
+        )
+    return directory / filename
+
+
+class SQLiteCache(ABC):
+    """Persistent cache stored in a SQLite database.
+
+    The cache can be used from multiple threads. Writes are grouped in a transaction
+    that is committed every `commit_interval` writes and when `commit` is called.
+
+    If the database can't be opened (for example because it is corrupted), it is deleted and created again.
+    If that fails too, the cache is kept in memory, so that the application still works without it.
+
+    Attributes:
+        path (Path): Path to the database.
+        version (int): Version of the tables, they are dropped if the database has another one.
+        commit_interval (int): Number of writes after which the transaction is committed.
+        connection (sqlite3.Connection): Connection to the database.
+        lock (threading.Lock): Lock protecting the connection.
+        writes (int): Number of writes since the last commit.
+    """
+
+    # Tables of the cache, dropped when their version is outdated
+    TABLES: list[str] = []
+
+    def __init__(self, path: Path, version: int, commit_interval: int) -> None:
+        """Init SQLiteCache.
+
+        Args:
+            path (Path): Path to the database.
+            version (int): Version of the tables.
+            commit_interval (int): Number of writes after which the transaction is committed.
+        """
+        self.path: Path = path
+        self.version: int = version
+        self.commit_interval: int = commit_interval
+        self.lock: threading.Lock = threading.Lock()
+        self.writes: int = 0
+        try:
+            self.open(path)
+        except sqlite3.Error as exception:
+            log.error(
+                "Error while opening the cache '%s', it is created again : %s",
+                path,
+                str(exception),
+            )
+            try:
+                for file in (path, *self.get_journal_paths(path)):
+                    file.unlink(missing_ok=True)
+                self.open(path)
+            except (sqlite3.Error, OSError) as exception:
+                log.error(
+                    "Error while creating the cache '%s' again, it is kept in memory : %s",
+                    path,
+                    str(exception),
+                )
+                self.open(":memory:")
+
+    def open(self, path: Path | str) -> None:
+        """Open the database at `path`, dropping its tables if their version is outdated, and create them.
+
+        Args:
+            path (Path | str): Path to the database, or `:memory:` for a database kept in memory.
+
+        Raises:
+            sqlite3.Error: If the database could not be opened or set up.
+        """
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False
+        )
+        try:
+            with self.lock:
+                version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+                if version != self.version:
+                    for table in self.TABLES:
+                        self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+                    self.connection.execute(f"PRAGMA user_version = {self.version}")
+                self.connection.execute("PRAGMA journal_mode = WAL")
+                self.connection.execute("PRAGMA synchronous = NORMAL")
+                self.create_tables()
+                self.connection.commit()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+    @staticmethod
+    def get_journal_paths(path: Path) -> list[Path]:
+        """Return the paths to the files SQLite keeps next to the database at `path`.
+
+        Args:
+            path (Path): Path to the database.
+
+        Returns:
+            list[Path]: Paths to the write-ahead log and its shared memory.
+        """
+        return [path.with_name(path.name + suffix) for suffix in ("-wal", "-shm")]
+
+    @abstractmethod
+    def create_tables(self) -> None:
+        """Create the tables of the database if they don't exist.
+
+        Called with the lock held.
+        """
+
+    def written(self) -> None:
+        """Count a write, and commit the transaction if enough writes were made.
+
+        Called with the lock held.
+        """
+        self.writes += 1
+        if self.writes >= self.commit_interval:
+            self.connection.commit()
+            self.writes = 0
+
+    def commit(self) -> None:
+        """Commit the pending writes."""
+        with self.lock:
+            self.connection.commit()
+            self.writes = 0
+
+    def close(self) -> None:
+        """Commit the pending writes and close the connection."""
+        self.commit()
+        with self.lock:
+            self.connection.close()
+
+
+class ScanCache(SQLiteCache):
+    """SQLite cache of the tags read from the files.
+
+    The tags of a file are stored with its path, size and modification time.
+    As long as the size and modification time of the file don't change,
+    its tags can be restored without parsing it with `mutagen`.
+
+    Covers are stored once per hash, already scaled, so that tracks of the same album share the same row.
+    They are also kept in memory once loaded, so that these tracks share the same image.
+
+    Each entry keeps the time at which its file was last read or restored. The entries of the files
+    that were not seen for the longest time (such as deleted or moved files) are evicted
+    when there are more than `max_entries`, along with the covers no entry uses anymore.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept.
+        covers (dict[str, QtGui.QImage]): Covers already loaded, by hash.
+        seen (list[str]): Paths of the tracks restored since the last commit, of which the time is updated then.
+    """
+
+    TABLES = ["tracks", "covers"]
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = MAX_ENTRIES_SCAN_CACHE,
+        commit_interval: int = 500,
+    ) -> None:
+        """Init ScanCache.
+
+        Args:
+            path (Path): Path to the database.
+            max_entries (int): Maximum number of entries kept. Defaults to `MAX_ENTRIES_SCAN_CACHE`.
+            commit_interval (int): Number of writes after which the transaction is committed. Defaults to 500.
+        """
+        self.max_entries: int = max_entries
+        self.covers: dict[str, QtGui.QImage] = {}
+        self.seen: list[str] = []
+        super().__init__(path, VERSION_SCAN_CACHE, commit_interval)
+
+    def create_tables(self) -> None:
+        """Create the tables of the database if they don't exist.
+
+        Called with the lock held.
+        """
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS tracks (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL,
+                file_type TEXT NOT NULL,
+                title TEXT NOT NULL,
+                artists TEXT NOT NULL,
+                album TEXT NOT NULL,
+                track_number INTEGER NOT NULL,
+                duration REAL NOT NULL,
+                lyrics TEXT NOT NULL,
+                cover_hash TEXT NOT NULL,
+                time REAL NOT NULL
+            )"""
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS tracks_time ON tracks (time)"
+        )
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS covers (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            )"""
+        )
+
+    def load_track(self, track: Track) -> bool:
+        """Restore the tags of the `track` from the cache.
+
+        The size and modification time of the `track` must already be set.
+
+        Args:
+            track (Track): Track to restore.
+
+        Returns:
+            bool: If the tags of the `track` were in the cache and up to date.
+        """
+        try:
+            with self.lock:
+                row = self.connection.execute(
+                    """SELECT file_type, title, artists, album, track_number, duration, lyrics, cover_hash
+                    FROM tracks WHERE path = ? AND size = ? AND mtime = ?""",
+                    (track.get_filepath(), track.size, track.mtime),
+                ).fetchone()
+                if row is None:
+                    return False
+                cover = self.covers.get(row[7])
+                cover_data = None
+                if row[7] != "" and cover is None:
+                    cover_row = self.connection.execute(
+                        "SELECT data FROM covers WHERE hash = ?", (row[7],)
+                    ).fetchone()
+                    if cover_row is None:
+                        return False
+                    cover_data = cover_row[0]
+                self.seen.append(track.get_filepath())
+        except sqlite3.Error as exception:
+            log.error(
+                "Error while loading the file '%s' from the cache : %s",
+                track.filename,
+                str(exception),
+            )
+            return False
+
+        track.file_type = FileType(row[0])
+        track.title = row[1]
+        track.artists = row[2].split(SEPARATOR_ARTISTS_CACHE) if row[2] != "" else []
+        track.main_artist = track.artists[0] if len(track.artists) > 0 else ""
+        track.album = row[3]
+        track.track_number = row[4]
+        track.duration = row[5]
+        track.lyrics_original = row[6]
+        track.cover_hash = row[7]
+        if cover_data is not None:
+            cover = QtGui.QImage()
+            cover.loadFromData(cover_data)
+            with self.lock:
+                cover = self.covers.setdefault(track.cover_hash, cover)
+        track.cover = cover
+        return True
+
+    def save_track(self, track: Track) -> None:
+        """Store the tags of the `track` in the cache.
+
+        Args:
+            track (Track): Track to store.
+        """
+        new_cover = False
+        if track.cover is not None:
+            with self.lock:
+                # Share the image if this cover was already loaded
+                new_cover = track.cover_hash not in self.covers
+                track.cover = self.covers.setdefault(track.cover_hash, track.cover)
+
+        cover_data = None
+        if new_cover:
+            data = QtCore.QByteArray()
+            buffer = QtCore.QBuffer(data)
+            buffer.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+            track.cover.save(buffer, "PNG")
+            cover_data = bytes(data)
+
+        try:
+            with self.lock:
+                if cover_data is not None:
+                    self.connection.execute(
+                        "INSERT OR IGNORE INTO covers (hash, data) VALUES (?, ?)",
+                        (track.cover_hash, cover_data),
+                    )
+                self.connection.execute(
+                    """INSERT OR REPLACE INTO tracks
+                    (path, size, mtime, file_type, title, artists, album, track_number, duration, lyrics, cover_hash, time)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        track.get_filepath(),
+                        track.size,
+                        track.mtime,
+                        track.file_type.value,
+                        track.title,
+                        SEPARATOR_ARTISTS_CACHE.join(track.artists),
+                        track.album,
+                        track.track_number,
+                        track.duration,
+                        track.lyrics_original,
+                        track.cover_hash,
+                        time.time(),
+                    ),
+                )
+                self.written()
+        except sqlite3.Error as exception:
+            log.error(
+                "Error while saving the file '%s' to the cache : %s",
+                track.filename,
+                str(exception),
+            )
+
+    def commit(self) -> None:
+        """Update the time of the tracks restored since the last commit, and commit the pending writes."""
+        try:
+            with self.lock:
+                seen = [(time.time(), path) for path in self.seen]
+                self.seen = []
+                self.connection.executemany(
+                    "UPDATE tracks SET time = ? WHERE path = ?", seen
+                )
+        except sqlite3.Error as exception:
+            log.error(
+                "Error while updating the files seen in the cache : %s", str(exception)
+            )
+        super().commit()
+
+    def evict(self) -> None:
+        """Remove the entries not seen for the longest time beyond `max_entries`, and the covers left unused."""
+        try:
+            with self.lock:
+                self.connection.execute(
+                    """DELETE FROM tracks WHERE rowid IN (
+                        SELECT rowid FROM tracks ORDER BY time DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,),
+                )
+                self.connection.execute(
+                    "DELETE FROM covers WHERE hash NOT IN (SELECT cover_hash FROM tracks)"
+                )
+                self.connection.commit()
+                self.writes = 0
+        except sqlite3.Error as exception:
+            log.error("Error while evicting the scan cache : %s", str(exception))
+
+    def close(self) -> None:
+        """Commit the pending writes, evict the entries in excess and close the connection."""
+        self.commit()
+        self.evict()
+        super().close()
+
+
+class LyricsCache(SQLiteCache):
+    """SQLite cache of the lyrics found on Genius.
+
+    The lyrics are stored already formatted, with the normalized title and main artist used to search them,
+    so that a track searched before (or a duplicate of it in another directory) doesn't need to be searched again.
+    A search that didn't find any lyrics is stored too, with an empty string as lyrics.
+
+    The entries expire after `ttl` seconds, or `ttl_not_found` seconds if no lyrics were found,
+    so that the lyrics added to Genius since are eventually found.
+    The oldest entries are evicted when there are more than `max_entries`.
+
+    Attributes:
+        ttl (float): Time in seconds after which the lyrics found expire.
+        ttl_not_found (float): Time in seconds after which a search that didn't find any lyrics expires.
+        max_entries (int): Maximum number of entries kept.
+    """
+
+    TABLES = ["lyrics"]
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = TTL_LYRICS_CACHE,
+        ttl_not_found: float = TTL_NOT_FOUND_LYRICS_CACHE,
+        max_entries: int = MAX_ENTRIES_LYRICS_CACHE,
+        commit_interval: int = 50,
+    ) -> None:
+        """Init LyricsCache.
+
+        Args:
+            path (Path): Path to the database.
+            ttl (float): Time in seconds after which the lyrics found expire. Defaults to `TTL_LYRICS_CACHE`.
+            ttl_not_found (float): Time in seconds after which a search that didn't find any lyrics expires.
+                Defaults to `TTL_NOT_FOUND_LYRICS_CACHE`.
+            max_entries (int): Maximum number of entries kept. Defaults to `MAX_ENTRIES_LYRICS_CACHE`.
+            commit_interval (int): Number of writes after which the transaction is committed. Defaults to 50.
+        """
+        self.ttl: float = ttl
+        self.ttl_not_found: float = ttl_not_found
+        self.max_entries: int = max_entries
+        super().__init__(path, VERSION_LYRICS_CACHE, commit_interval)
+
+    def create_tables(self) -> None:
+        """Create the tables of the database if they don't exist.
+
+        Called with the lock held.
+        """
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS lyrics (
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL,
+                lyrics TEXT NOT NULL,
+                time REAL NOT NULL,
+                PRIMARY KEY (title, artist)
+            )"""
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS lyrics_time ON lyrics (time)"
+        )
+
+    def load(self, title: str, artist: str) -> Optional[str]:
+        """Return the lyrics searched with the `title` and `artist`.
+
+        Args:
+            title (str): Normalized title used to search the lyrics.
+            artist (str): Normalized main artist used to search the lyrics.
+
+        Returns:
+            str | None: Lyrics, an empty string if no lyrics were found,
+                or `None` if the search is not in the cache or expired.
+        """
+        try:
+            with self.lock:
+                row = self.connection.execute(
+                    "SELECT lyrics, time FROM lyrics WHERE title = ? AND artist = ?",
+                    (title, artist),
+                ).fetchone()
+        except sqlite3.Error as exception:
+            log.error(
+                "Error while loading the lyrics of '%s' from the cache : %s",
+                title,
+                str(exception),
+            )
+            return None
+
+        if row is None:
+            return None
+        lyrics, saved = row
+        ttl = self.ttl if lyrics != "" else self.ttl_not_found
+        if time.time() - saved > ttl:
+            return None
+        return lyrics
+
+    def save(self, title: str, artist: str, lyrics: str) -> None:
+        """Store the `lyrics` searched with the `title` and `artist`.
+
+        Args:
+            title (str): Normalized title used to search the lyrics.
+            artist (str): Normalized main artist used to search the lyrics.
+            lyrics (str): Lyrics, or an empty string if no lyrics were found.
+        """
+        try:
+            with self.lock:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO lyrics (title, artist, lyrics, time) VALUES (?, ?, ?, ?)",
+                    (title, artist, lyrics, time.time()),
+                )
+                self.written()
+        except sqlite3.Error as exception:
+            log.error(
+                "Error while saving the lyrics of '%s' to the cache : %s",
+                title,
+                str(exception),
+            )
+
+    def evict(self) -> None:
+        """Remove the expired entries, and the oldest entries beyond `max_entries`."""
+        now = time.time()
+        try:
+            with self.lock:
+                self.connection.execute(
+                    "DELETE FROM lyrics WHERE (lyrics != '' AND time < ?) OR (lyrics = '' AND time < ?)",
+                    (now - self.ttl, now - self.ttl_not_found),
+                )
+                self.connection.execute(
+                    """DELETE FROM lyrics WHERE rowid IN (
+                        SELECT rowid FROM lyrics ORDER BY time DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,),
+                )
+                self.connection.commit()
+                self.writes = 0
+        except sqlite3.Error as exception:
+            log.error("Error while evicting the lyrics cache : %s", str(exception))
+
+    def close(self) -> None:
+        """Evict the entries in excess, commit the pending writes and close the connection."""
+        self.evict()
+        super().close()
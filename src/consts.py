@@ -27,6 +27,12 @@ SIZE_LOGO = QtCore.QSize(250, 250)
 # Size of the margin between track layouts
 MARGIN_TRACK_LAYOUT = 5
 
+# Size of the padding inside track layouts
+PADDING_TRACK_LAYOUT = 9
+
+# Size of the spacing between the elements of track layouts
+SPACING_TRACK_LAYOUT = 6
+
 # Size of the progress bar
 WIDTH_PROGRESS_BAR = 300
 HEIGHT_PROGRESS_BAR = 25
@@ -37,13 +43,155 @@ MARGIN_CENTRAL_WIDGET = QtCore.QMargins(5, 5, 5, 5)
 # Sizes of the cover
 SIZE_COVER = 128
 
+# Aspect ratio kept when scaling the covers,
+# resolved on import since the enums of PySide6 are not safe to resolve for the first time from several threads
+ASPECT_RATIO_COVER = QtCore.Qt.AspectRatioMode.KeepAspectRatio
+
 # Number of lyrics lines to display depending on the mode
 LINES_LYRICS = 9
 
-# Maximum number of track searches to process
-# The correct one is mostly the first one, rarely the second one and almost never another one
+# Default number of workers reading the tags of the files
+# Reading is mostly I/O-bound (especially on network storage), so more workers than cores is beneficial
+DEFAULT_WORKERS_READ = 8
+
+# Maximum number of workers reading the tags of the files
+MAX_WORKERS_READ = 64
+
+# Default number of workers saving the lyrics to the files of each storage device
+# Writing is I/O-bound, but too many concurrent writes make the seeks of a hard drive dominate
+DEFAULT_WORKERS_SAVE = 4
+
+# Maximum number of workers saving the lyrics to the files of each storage device
+MAX_WORKERS_SAVE = 64
+
+# Default padding in KiB reserved after the tags when a file must be rewritten to save the lyrics
+# It leaves room for a few more lyrics, so that the next saves update the file in place
+DEFAULT_PADDING_SAVE = 16
+
+# Maximum padding in KiB reserved after the tags when a file must be rewritten
+MAX_PADDING_SAVE = 1024
+
+# Maximum number of tracks sent to the GUI in one batch
+SIZE_BATCH_TRACKS = 200
+
+# Maximum time in seconds between two batches of tracks sent to the GUI
+INTERVAL_BATCH_TRACKS = 0.1
+
+# Name of the file of the scan cache
+FILENAME_SCAN_CACHE = "scan_cache.sqlite"
+
+# Version of the scan cache, to increment when the stored tags change
+VERSION_SCAN_CACHE = 3
+
+# Maximum number of tracks in the scan cache
+MAX_ENTRIES_SCAN_CACHE = 200000
+
+# Separator of the artists in the scan cache
+SEPARATOR_ARTISTS_CACHE = "\x1f"
+
+# Name of the file of the lyrics cache
+FILENAME_LYRICS_CACHE = "lyrics_cache.sqlite"
+
+# Version of the lyrics cache, to increment when the lyrics found for a search change
+VERSION_LYRICS_CACHE = 3
+
+# Time in seconds after which the lyrics found expire in the lyrics cache
+TTL_LYRICS_CACHE = 90 * 24 * 3600
+
+# Time in seconds after which a search that didn't find any lyrics expires in the lyrics cache
+TTL_NOT_FOUND_LYRICS_CACHE = 3 * 24 * 3600
+
+# Maximum number of entries in the lyrics cache
+MAX_ENTRIES_LYRICS_CACHE = 100000
+
+# Size of the n-grams of the search index
+SIZE_NGRAM_SEARCH_INDEX = 3
+
+# Separator of the title and the artists in the search index
+SEPARATOR_SEARCH_INDEX = "\n"
+
+# Delay in milliseconds after the last keystroke before the tracks are filtered
+DELAY_FILTER_TRACKS = 150
+
+# Maximum number of ranges of rows inserted or removed when filtering before the whole list is reset
+MAX_RANGES_FILTER_TRACKS = 100
+
+# Timeout in seconds to connect to Genius
+TIMEOUT_CONNECT_GENIUS = 5
+
+# Timeout in seconds between two bytes received from Genius, which bounds how long a stalled request blocks a worker
+TIMEOUT_READ_GENIUS = 10
+
+# Time in seconds after which a request to Genius is not retried anymore
+DEADLINE_REQUEST_GENIUS = 60
+
+# Time in milliseconds the searches in progress are waited for when the app is closed
+DEADLINE_SHUTDOWN_SEARCH = 2000
+
+# Time in seconds the asyncio searches wait before trying again to use the scheduler held by another thread
+INTERVAL_LOCK_SEARCH = 0.001
+
+# Default maximum number of requests sent to Genius per second
+DEFAULT_RATE_SEARCH = 10
+
+# Maximum of the setting for the number of requests sent to Genius per second
+MAX_RATE_SEARCH = 100
+
+# Default maximum number of requests to Genius in flight, which is also the number of workers searching for lyrics
+DEFAULT_CONCURRENCY_SEARCH = 8
+
+# Maximum of the setting for the number of requests to Genius in flight
+MAX_CONCURRENCY_SEARCH = 64
+
+# Default maximum number of retries of a request to Genius that was throttled or failed
+DEFAULT_RETRIES_SEARCH = 3
+
+# Maximum of the setting for the number of retries of a request to Genius
+MAX_RETRIES_SEARCH = 10
+
+# Latency in seconds of the requests to Genius above which fewer requests are sent in parallel
+TARGET_LATENCY_SEARCH = 3
+
+# Factor applied to the number of requests to Genius in flight when they are slow or throttled
+DECREASE_CONCURRENCY_SEARCH = 0.5
+
+# Base delay in seconds before retrying a request to Genius, doubled at each retry
+BASE_BACKOFF_SEARCH = 0.5
+
+# Maximum delay in seconds before retrying a request to Genius
+MAX_BACKOFF_SEARCH = 30
+
+# Maximum number of candidates of a search of which the lyrics are fetched
+# The best ranked candidate is almost always the correct one, the next ones are only tried if its lyrics are discarded
 MAX_SEARCH_INDEX = 3
 
+# Minimum similarity between the title of the track and the title of a result of the search to consider it
+MIN_SIMILARITY_TITLE_CANDIDATE = 0.7
+
+# Minimum similarity between the main artist of the track and the artist of a result of the search to consider it
+MIN_SIMILARITY_ARTIST_CANDIDATE = 0.6
+
+# Minimum number of songs of an artist to search for them all at once by listing the songs of the artist
+MIN_SEARCHES_ARTIST = 4
+
+# Number of songs of an artist listed per request
+SIZE_PAGE_ARTIST = 50
+
+# Maximum number of pages of songs of an artist to list, from the most to the least popular
+MAX_PAGES_ARTIST = 20
+
+# Minimum number of songs of an album to search for them all at once by looking up the tracklist of the album
+MIN_SEARCHES_ALBUM = 3
+
+# Number of tracks of an album searched to find the album on Genius
+ATTEMPTS_ALBUM = 2
+
+# Number of tracks of an album listed per request
+SIZE_PAGE_ALBUM = 50
+
+# Minimum similarity between the title of a track and the title of the song at the same position in the album
+MIN_SIMILARITY_POSITION_ALBUM = 0.4
+
 # URL of the Genius API page
 URL_TOKEN = QtCore.QUrl("https://genius.com/api-clients")
 
@@ -53,21 +201,59 @@ SPLITTERS = " featuring | feat. | feat | ft. | ft | & | / "
 # Remove multiple new lines
 RE_REMOVE_LINES = re.compile(r"\n{2,}")
 
+# Words of the mentions of the version of a track, such as "Remastered 2011" or "Radio Edit"
+VERSION_WORDS = (
+    r"(?:radio|live|alternat(?:e|ive)|extended|remaster(?:ed)?|version|edit|mono|stereo"
+    r"|explicit|clean|bonus|deluxe|demo|acoustic|single|album|original)"
+)
+
 # Unwanted text in the title that would probably make the search fail
 UNWANTED_TITLE_TEXT = [
-    re.compile(r"\(radio\)", re.IGNORECASE),
-    re.compile(r"\(radio edit\)", re.IGNORECASE),
-    re.compile(r"\(live\)", re.IGNORECASE),
-    re.compile(r"\(live version\)", re.IGNORECASE),
-    re.compile(r"\(alternative\)", re.IGNORECASE),
-    re.compile(r"\(alternative version\)", re.IGNORECASE),
-    re.compile(r"\(extended\)", re.IGNORECASE),
-    re.compile(r"\(extended version\)", re.IGNORECASE),
+    # Mentions of the version between parentheses or brackets, such as (Live) or [Remastered 2011]
+    re.compile(
+        r"\s*[\(\[][^\)\]]*\b(?:radio|live|alternative|extended|remaster(?:ed)?|version|edit|mono|stereo"
+        r"|explicit|clean|bonus|deluxe|demo|acoustic)\b[^\)\]]*[\)\]]",
+        re.IGNORECASE,
+    ),
+    # Featured artists between parentheses or brackets, such as (feat. Artist) or (with Artist),
+    # the name after "with" must start with a capital letter and not be a pronoun, to keep titles like "Song (with you)"
+    re.compile(
+        r"\s*[\(\[](?:feat\.?|ft\.?|featuring"
+        r"|with(?!\s+(?:me|you|him|her|us|them|it)\b)(?=\s+(?-i:[^\W_a-z])))\s+[^\)\]]+[\)\]]",
+        re.IGNORECASE,
+    ),
+    # Mentions after a dash made only of words of the version and of years, such as " - 2011 Remaster",
+    # or of a live performance, such as " - Live at Wembley", so that titles like "Mono - No Edit" are kept
+    re.compile(
+        rf"\s+-\s+(?:(?:{VERSION_WORDS}|\d+)\s+)*(?:{VERSION_WORDS}(?:\s+\d+)?|live\s+(?:at|from|in)\s+.+)$",
+        re.IGNORECASE,
+    ),
+    # Featured artists without parentheses, such as " feat. Artist"
+    re.compile(r"\s+(?:feat\.?|ft\.|featuring)\s+.*$", re.IGNORECASE),
 ]
 
+# Punctuation ignored when matching titles and artists
+RE_PUNCTUATION_MATCHING = re.compile(r"[^\w\s]|_")
+
 # If the artist is one of these, the lyrics are certainly wrong
 DISCARD_ARTISTS = ["Genius", "Apple Music", "Pop Genius"]
 
+# Opening of a container of the lyrics in the page of a song, quoted (not escaped as in the scripts of the page)
+RE_LYRICS_CONTAINER = re.compile(
+    r"data-lyrics-container\s*=\s*[\"']?true", re.IGNORECASE
+)
+
+# Scripts, styles and comments of the page of a song, in which the openings of containers are not real containers
+RE_SKIPPED_LYRICS = re.compile(
+    r"<script\b[^<]*(?:<(?!/script)[^<]*)*</script\s*>"
+    r"|<style\b[^<]*(?:<(?!/style)[^<]*)*</style\s*>"
+    r"|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Number of characters of the page of a song parsed at once, so that the parsing stops soon after the lyrics
+SIZE_CHUNK_LYRICS = 16384
+
 # The lyrics of the song are missing
 MISSING_LYRICS = "Tell us that you would like to have the lyrics of this song."
 
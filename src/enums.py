@@ -11,6 +11,14 @@ class Settings(Enum):
     RECURSIVE_SEARCH = "recursive_search"
     OVERWRITE_LYRICS = "overwrite_lyrics"
     TOOLBAR_POSITION = "toolbar_position"
+    WORKERS_READ = "workers_read"
+    WORKERS_SAVE = "workers_save"
+    PADDING_SAVE = "padding_save"
+    RATE_SEARCH = "rate_search"
+    CONCURRENCY_SEARCH = "concurrency_search"
+    RETRIES_SEARCH = "retries_search"
+    ASYNC_SEARCH = "async_search"
+    PIPELINE_SEARCH = "pipeline_search"
 
 
 class CustomColors(Enum):
@@ -58,6 +66,16 @@ class Sort(Enum):
     ASCENDING = "ascending"
 
 
+class SortField(Enum):
+    """Enumerates the different fields the list of tracks can be sorted by."""
+
+    TITLE = "Title"
+    ARTISTS = "Artists"
+    ALBUM = "Album"
+    DURATION = "Duration"
+    STATE = "State"
+
+
 class Logo(Enum):
     """Enumerates the different logos."""
 
@@ -1,5 +1,12 @@
 """Exceptions."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mutagen import PaddingInfo
+
 
 class DiscardLyrics(Exception):
     """Raised when the lyrics are probably wrong and should be discarded."""
@@ -14,3 +21,42 @@ class DiscardLyrics(Exception):
         """
         message = f"Discarded the lyrics because {error} for the track '{title}': {length} characters"
         super().__init__(message)
+        self.error: str = error
+        self.title: str = title
+        self.length: int = length
+
+    def __reduce__(self) -> tuple[type[DiscardLyrics], tuple[str, str, int]]:
+        """Pickle DiscardLyrics with the arguments of its constructor, so that it can be raised in another process.
+
+        Returns:
+            tuple[type[DiscardLyrics], tuple[str, str, int]]: Class and arguments to recreate the exception.
+        """
+        return DiscardLyrics, (self.error, self.title, self.length)
+
+
+class SearchCancelled(Exception):
+    """Raised when the search for lyrics is stopped while a request to Genius is waiting or in flight."""
+
+    def __init__(self, url: str) -> None:
+        """Init SearchCancelled.
+
+        Args:
+            url (str): URL of the request that was cancelled.
+        """
+        super().__init__(f"Cancelled the request '{url}'")
+
+
+class SavePlanned(Exception):
+    """Raised by the padding function of a dry run of a save, to stop it before anything is written."""
+
+    def __init__(self, info: PaddingInfo) -> None:
+        """Init SavePlanned.
+
+        Args:
+            info (PaddingInfo): Padding left after the tags and size of the data following them,
+                if the save had been done.
+        """
+        super().__init__(
+            f"Planned a save leaving {info.padding} bytes of padding before {info.size} bytes"
+        )
+        self.info: PaddingInfo = info
@@ -0,0 +1,52 @@
+"""Enumerates the files to read."""
+
+from __future__ import annotations
+
+import logging as log
+import os
+from pathlib import Path
+from typing import Iterator
+
+from src.enums import FileType
+
+# Extensions of the supported files
+EXTENSIONS = {
+    f".{file_type.value}"
+    for file_type in FileType
+    if file_type != FileType.NOT_SUPPORTED
+}
+
+
+def iterate_directory(directory: Path, recursive: bool) -> Iterator[Path]:
+    """Yield the supported files in the `directory` as soon as they are found.
+
+    The directory tree is walked only once with `os.scandir`, which avoids a `stat` call per entry on most systems.
+    Symbolic links to directories are not followed.
+
+    Args:
+        directory (Path): Directory to walk.
+        recursive (bool): If the subdirectories should be walked too.
+
+    Yields:
+        Path: Path of a supported file.
+    """
+    directories = [directory]
+    while len(directories) > 0:
+        current = directories.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            directories.append(Path(entry.path))
+                    elif (
+                        os.path.splitext(entry.name)[1].lower() in EXTENSIONS
+                        and entry.is_file()
+                    ):
+                        yield Path(entry.path)
+        except OSError as exception:
+            log.error(
+                "Error while listing the directory '%s' : %s",
+                current,
+                str(exception),
+            )
@@ -0,0 +1,349 @@
+"""Genius client shared by the workers searching for lyrics."""
+
+from __future__ import annotations
+
+import multiprocessing
+import socket
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Any
+
+import genius
+import requests
+from genius.exceptions import APIException
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from src.consts import (
+    RE_LYRICS_CONTAINER,
+    RE_SKIPPED_LYRICS,
+    SIZE_CHUNK_LYRICS,
+    TIMEOUT_CONNECT_GENIUS,
+    TIMEOUT_READ_GENIUS,
+)
+from src.scheduler import SearchScheduler
+
+
+class LyricsExtractor(HTMLParser):
+    """Streaming extractor of the text of the containers of the lyrics in the page of a song.
+
+    Instead of building the tree of the whole page, the parser only keeps the text inside the containers,
+    walked the same way as `genius.scraper._extract_lyrics`: the line breaks become new lines
+    and the other tags are walked through. The comments, scripts and styles are skipped.
+    The text inside a container nested in another one is kept in both, as when searching for the containers in a tree.
+
+    Attributes:
+        containers (list[list[str]]): Text of each container, in the order they are opened.
+        open_containers (list[tuple[list[str], int]]): Text and depth of each container not closed yet.
+        closed (int): Number of containers closed.
+        depth (int): Number of `div` tags open.
+        skipped_tag (str | None): Script or style tag of which the content is skipped, if any.
+    """
+
+    def __init__(self) -> None:
+        """Init LyricsExtractor."""
+        super().__init__()
+
+        self.containers: list[list[str]] = []
+        self.open_containers: list[tuple[list[str], int]] = []
+        self.closed: int = 0
+        self.depth: int = 0
+        self.skipped_tag: str | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Open a container, or add a new line to the open containers.
+
+        Args:
+            tag (str): Name of the tag.
+            attrs (list[tuple[str, str | None]]): Attributes of the tag.
+        """
+        if tag == "div":
+            self.depth += 1
+            if ("data-lyrics-container", "true") in attrs:
+                container = []
+                self.containers.append(container)
+                self.open_containers.append((container, self.depth))
+        elif tag == "br":
+            for container, _ in self.open_containers:
+                container.append("\n")
+        elif tag in ("script", "style"):
+            self.skipped_tag = tag
+
+    def handle_endtag(self, tag: str) -> None:
+        """Close the containers opened by the tag.
+
+        Args:
+            tag (str): Name of the tag.
+        """
+        if tag == "div" and self.depth > 0:
+            while (
+                len(self.open_containers) > 0
+                and self.open_containers[-1][1] == self.depth
+            ):
+                self.open_containers.pop()
+                self.closed += 1
+            self.depth -= 1
+        elif tag == self.skipped_tag:
+            self.skipped_tag = None
+
+    def handle_data(self, data: str) -> None:
+        """Add the text to the open containers.
+
+        Args:
+            data (str): Text, with the character references converted.
+        """
+        if self.skipped_tag is None:
+            for container, _ in self.open_containers:
+                container.append(data)
+
+
+class AbortableConnectionPool:
+    """Mixin of a `urllib3` connection pool keeping track of the connections in use, so that they can be aborted.
+
+    Attributes:
+        connections_in_use (weakref.WeakSet): Connections checked out of the pool by a request.
+        lock_in_use (threading.Lock): Lock protecting the connections in use.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Init AbortableConnectionPool."""
+        super().__init__(*args, **kwargs)
+        self.connections_in_use: weakref.WeakSet = weakref.WeakSet()
+        self.lock_in_use: threading.Lock = threading.Lock()
+
+    def _get_conn(self, timeout: float | None = None):
+        """Get a connection from the pool, and keep track of it while it is in use."""
+        conn = super()._get_conn(timeout)
+        with self.lock_in_use:
+            self.connections_in_use.add(conn)
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        """Put a connection back into the pool, once the request is done with it."""
+        # The connection is None if it was dropped because of an error
+        if conn is not None:
+            with self.lock_in_use:
+                self.connections_in_use.discard(conn)
+        super()._put_conn(conn)
+
+    def abort(self) -> None:
+        """Shut down the sockets of the connections in use, so that the requests blocked on them fail immediately."""
+        with self.lock_in_use:
+            connections = list(self.connections_in_use)
+        for conn in connections:
+            sock = conn.sock
+            if sock is None:
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                # The socket was already closed
+                pass
+
+
+class AbortableHTTPConnectionPool(AbortableConnectionPool, HTTPConnectionPool):
+    """HTTP connection pool of which the connections in use can be aborted."""
+
+
+class AbortableHTTPSConnectionPool(AbortableConnectionPool, HTTPSConnectionPool):
+    """HTTPS connection pool of which the connections in use can be aborted."""
+
+
+class AbortableHTTPAdapter(HTTPAdapter):
+    """Transport adapter of which the requests in flight can be aborted from another thread."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        """Init the pool manager, creating abortable connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": AbortableHTTPConnectionPool,
+            "https": AbortableHTTPSConnectionPool,
+        }
+
+    def abort(self) -> None:
+        """Abort the requests in flight."""
+        for key in list(self.poolmanager.pools.keys()):
+            pool = self.poolmanager.pools.get(key)
+            if isinstance(pool, AbortableConnectionPool):
+                pool.abort()
+
+
+class PooledAPI(genius.API):
+    """`wrap-genius` API sending its requests through a shared session.
+
+    Attributes:
+        session (requests.Session): Session sending the requests.
+        scheduler (SearchScheduler): Scheduler of the requests.
+        timeout (tuple[float, float]): Timeouts in seconds to connect and to read the responses.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        session: requests.Session,
+        scheduler: SearchScheduler,
+        timeout: tuple[float, float],
+    ) -> None:
+        """Init PooledAPI.
+
+        Args:
+            access_token (str): Genius client access token.
+            session (requests.Session): Session sending the requests.
+            scheduler (SearchScheduler): Scheduler of the requests.
+            timeout (tuple[float, float]): Timeouts in seconds to connect and to read the responses.
+        """
+        super().__init__(access_token)
+        self.session: requests.Session = session
+        self.scheduler: SearchScheduler = scheduler
+        self.timeout: tuple[float, float] = timeout
+
+    def __call__(self, service: str, **params) -> dict[str, Any]:
+        """Call the `service` of the API with the `params`.
+
+        Args:
+            service (str): Service to call.
+            **params: Parameters of the request.
+
+        Returns:
+            dict[str, Any]: Response of the API.
+
+        Raises:
+            requests.RequestException: If the request failed.
+            APIException: If the API returned an error.
+        """
+        params["text_format"] = "plain"
+        response = self.scheduler.get(
+            self.session,
+            f"{self.BASE_URL}/{service}",
+            params=params,
+            headers={"Authorization": self.access_token},
+            timeout=self.timeout,
+        )
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+        data = response.json()
+        if data["meta"]["status"] != 200:
+            raise APIException(
+                status=data["meta"]["status"],
+                message=data["meta"]["message"],
+                url=response.url,
+            )
+        return data["response"]
+
+
+class GeniusClient(genius.Genius):
+    """Genius client shared by the workers searching for lyrics.
+
+    `wrap-genius` opens a new connection for each request. This client sends the requests to the API
+    and to the lyrics pages through a single session, whose connection pool is sized to the number of workers,
+    so that the connections are kept alive and reused between the tracks.
+    The requests are sent when the scheduler allows it, and the requests in flight can be aborted
+    when the search is stopped. The session can be used by multiple threads.
+
+    Parsing the pages of the lyrics is CPU-bound, so it is done by a pool of processes
+    instead of the threads downloading them, which would otherwise contend for the GIL.
+
+    Attributes:
+        access_token (str): Genius client access token.
+        pool_size (int): Maximum number of connections kept alive per host.
+        scheduler (SearchScheduler): Scheduler of the requests.
+        timeout (tuple[float, float]): Timeouts in seconds to connect and to read the responses.
+        adapter (AbortableHTTPAdapter): Adapter of the session, aborting the requests in flight.
+        session (requests.Session): Session sending the requests.
+        api (PooledAPI): API sending its requests through the session.
+        executor (ProcessPoolExecutor): Pool of processes parsing the pages of the lyrics.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        pool_size: int,
+        scheduler: SearchScheduler,
+        timeout: tuple[float, float] = (TIMEOUT_CONNECT_GENIUS, TIMEOUT_READ_GENIUS),
+    ) -> None:
+        """Init GeniusClient.
+
+        Args:
+            access_token (str): Genius client access token.
+            pool_size (int): Maximum number of connections kept alive per host.
+            scheduler (SearchScheduler): Scheduler of the requests.
+            timeout (tuple[float, float]): Timeouts in seconds to connect and to read the responses.
+                Defaults to `(TIMEOUT_CONNECT_GENIUS, TIMEOUT_READ_GENIUS)`.
+        """
+        super().__init__(access_token)
+
+        self.access_token: str = access_token
+        self.pool_size: int = pool_size
+        self.scheduler: SearchScheduler = scheduler
+        self.timeout: tuple[float, float] = timeout
+        self.adapter: AbortableHTTPAdapter = AbortableHTTPAdapter(
+            pool_maxsize=pool_size
+        )
+        self.session: requests.Session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.api: PooledAPI = PooledAPI(access_token, self.session, scheduler, timeout)
+        # The processes are spawned rather than forked, because forking the threads of Qt is unsafe
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def get_page(self, url: str) -> str:
+        """Download the page of the song at `url`, without parsing it.
+
+        Args:
+            url (str): URL of the song.
+
+        Returns:
+            str: HTML of the page.
+
+        Raises:
+            requests.RequestException: If the page could not be downloaded.
+        """
+        response = self.scheduler.get(self.session, url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    @staticmethod
+    def parse_lyrics(html: str) -> list[str]:
+        """Extract the lyrics from the `html` of the page of a song.
+
+        This is the same scraping as `genius.api.Song.lyrics`, without parsing the whole page:
+        the parsing starts at the first container of the lyrics, and stops once every container is closed.
+        The openings of containers quoted in the scripts, styles and comments of the page are not counted.
+
+        Args:
+            html (str): HTML of the page of the song.
+
+        Returns:
+            list[str]: Lines of the lyrics.
+        """
+        skipped = [match.span() for match in RE_SKIPPED_LYRICS.finditer(html)]
+        starts = [
+            match.start()
+            for match in RE_LYRICS_CONTAINER.finditer(html)
+            if not any(start <= match.start() < end for start, end in skipped)
+        ]
+        extractor = LyricsExtractor()
+        if len(starts) > 0:
+            position = max(0, html.rfind("<", 0, starts[0]))
+            # The chunks end after a tag, so that the last one is not left incomplete when the parsing stops
+            while position < len(html) and extractor.closed < len(starts):
+                end = html.find(">", position + SIZE_CHUNK_LYRICS) + 1 or len(html)
+                extractor.feed(html[position:end])
+                position = end
+            extractor.close()
+
+        lyrics = "".join("".join(container) for container in extractor.containers)
+        return lyrics.replace("е", "e").split("\n")
+
+    def abort(self) -> None:
+        """Abort the requests in flight, which fail with a connection error."""
+        self.adapter.abort()
+
+    def close(self) -> None:
+        """Close the connections of the session and stop the processes parsing the pages."""
+        self.session.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
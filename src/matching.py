@@ -0,0 +1,87 @@
+"""Normalizes and matches the titles and artists of the tracks."""
+
+from __future__ import annotations
+
+import unicodedata
+from difflib import SequenceMatcher
+
+from src.consts import RE_PUNCTUATION_MATCHING, UNWANTED_TITLE_TEXT
+
+
+def normalize(text: str) -> str:
+    """Normalize the `text` so that it can be compared regardless of its case, accents, punctuation and spacing.
+
+    Only the accents of the Latin letters are removed, since the marks of other scripts change the letters.
+
+    Args:
+        text (str): Text to normalize.
+
+    Returns:
+        str: Normalized text.
+    """
+    characters = []
+    latin = False
+    for character in unicodedata.normalize("NFKD", text.casefold()):
+        if unicodedata.category(character) != "Mn":
+            latin = unicodedata.name(character, "").startswith("LATIN")
+        elif latin:
+            # Remove the accent of a Latin letter
+            continue
+        characters.append(character)
+    # Recompose the characters that kept their marks (such as kana or Hangul)
+    text = unicodedata.normalize("NFC", "".join(characters))
+    text = text.replace("&", " and ")
+    return " ".join(RE_PUNCTUATION_MATCHING.sub(" ", text).split())
+
+
+def clean_title(title: str) -> str:
+    """Remove the text from the `title` that would probably make the search fail.
+
+    This includes the featured artists and the mentions of the version,
+    such as `(feat. Artist)`, `[Remastered 2011]` or ` - Live at Wembley`.
+
+    Args:
+        title (str): Title to clean.
+
+    Returns:
+        str: Cleaned title, or the title itself if nothing would be left of it.
+    """
+    cleaned_title = title
+    for re_unwanted_text in UNWANTED_TITLE_TEXT:
+        cleaned_title = re_unwanted_text.sub("", cleaned_title)
+    cleaned_title = cleaned_title.strip()
+    return cleaned_title if cleaned_title != "" else title.strip()
+
+
+def get_tokens(text: str) -> list[str]:
+    """Return the distinct words of the normalized `text`, sorted.
+
+    Args:
+        text (str): Text to split.
+
+    Returns:
+        list[str]: Sorted distinct words.
+    """
+    return sorted(set(normalize(text).split()))
+
+
+def get_similarity(text: str, other_text: str) -> float:
+    """Return the similarity between the words of the `text` and of the `other_text`.
+
+    The words are normalized and sorted, so that their order and repetitions don't matter,
+    and compared as a whole, so that a typo in a word only slightly lowers the similarity.
+
+    Args:
+        text (str): Text to compare.
+        other_text (str): Other text to compare.
+
+    Returns:
+        float: Similarity between 0 and 1.
+    """
+    tokens = get_tokens(text)
+    other_tokens = get_tokens(other_text)
+    if tokens == other_tokens:
+        return 1.0
+    if len(tokens) == 0 or len(other_tokens) == 0:
+        return 0.0
+    return SequenceMatcher(None, " ".join(tokens), " ".join(other_tokens)).ratio()
@@ -0,0 +1,363 @@
+"""Scheduler of the requests sent to Genius."""
+
+from __future__ import annotations
+
+import logging as log
+import math
+import random
+import threading
+import time
+from typing import Callable, Mapping, Optional
+
+import requests
+
+from src.consts import (
+    BASE_BACKOFF_SEARCH,
+    DEADLINE_REQUEST_GENIUS,
+    DECREASE_CONCURRENCY_SEARCH,
+    MAX_BACKOFF_SEARCH,
+    TARGET_LATENCY_SEARCH,
+)
+from src.exceptions import SearchCancelled
+
+
+class SearchScheduler:
+    """Scheduler of the requests sent to Genius by the workers searching for lyrics.
+
+    Genius throttles the clients sending too many requests, so the requests are not sent as soon as a worker needs them:
+    - a token bucket limits the number of requests sent per second, while allowing short bursts,
+    - an adaptive limit caps the number of requests in flight. It grows by one request per round trip
+    while the responses are fast, and is cut when a response is slow, throttled (429) or failed (5xx),
+    - the throttled and failed requests are retried after an exponential backoff with jitter,
+    or after the delay requested by Genius. Meanwhile, no other request is sent.
+
+    When the search is stopped, the scheduler is cancelled: the waiting requests and the retries are abandoned,
+    so that the workers stop within the time of the requests in flight.
+
+    The scheduler can be used by multiple threads.
+
+    Attributes:
+        rate (float): Maximum number of requests sent per second.
+        max_concurrency (int): Maximum number of requests in flight.
+        max_retries (int): Maximum number of retries of a request.
+        target_latency (float): Latency in seconds above which the concurrency limit is decreased.
+        condition (threading.Condition): Condition protecting the state of the scheduler and notified when it changes.
+        tokens (float): Number of requests that can be sent immediately.
+        last_refill (float): Time at which the tokens were last refilled.
+        limit (float): Current maximum number of requests in flight.
+        in_flight (int): Number of requests in flight.
+        last_decrease (float): Time at which the concurrency limit was last decreased.
+        paused_until (float): Time until which no request is sent.
+        cancelled (threading.Event): Set when the search is stopped, until the scheduler is configured again.
+        listeners (list[Callable[[], None]]): Functions called when the state of the scheduler changes,
+            for the requests that wait outside of the condition.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_concurrency: int,
+        max_retries: int,
+        target_latency: float = TARGET_LATENCY_SEARCH,
+    ) -> None:
+        """Init SearchScheduler.
+
+        Args:
+            rate (float): Maximum number of requests sent per second.
+            max_concurrency (int): Maximum number of requests in flight.
+            max_retries (int): Maximum number of retries of a request.
+            target_latency (float): Latency in seconds above which the concurrency limit is decreased.
+                Defaults to `TARGET_LATENCY_SEARCH`.
+        """
+        self.rate: float = rate
+        self.max_concurrency: int = max_concurrency
+        self.max_retries: int = max_retries
+        self.target_latency: float = target_latency
+        self.condition: threading.Condition = threading.Condition()
+        self.tokens: float = max_concurrency
+        self.last_refill: float = time.monotonic()
+        self.limit: float = max_concurrency
+        self.in_flight: int = 0
+        self.last_decrease: float = 0
+        self.paused_until: float = 0
+        self.cancelled: threading.Event = threading.Event()
+        self.listeners: list[Callable[[], None]] = []
+
+    def configure(
+        self, rate: float, max_concurrency: int, max_retries: int, idle: bool = False
+    ) -> None:
+        """Change the settings of the scheduler, keeping the concurrency limit it learned, for a new search.
+
+        Args:
+            rate (float): Maximum number of requests sent per second.
+            max_concurrency (int): Maximum number of requests in flight.
+            max_retries (int): Maximum number of retries of a request.
+            idle (bool): If no request is outstanding, because the previous search is done.
+                The count of requests in flight is then reset, so that it can't stay wrong after an interrupted search.
+                Defaults to `False`.
+        """
+        with self.condition:
+            self.rate = rate
+            self.max_concurrency = max_concurrency
+            self.max_retries = max_retries
+            self.limit = min(self.limit, max_concurrency)
+            if idle:
+                self.in_flight = 0
+            self.cancelled.clear()
+            self.notify()
+
+    def cancel(self) -> None:
+        """Cancel the requests waiting to be sent and the retries, because the search is stopped."""
+        with self.condition:
+            self.cancelled.set()
+            self.notify()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call the `listener` whenever the state of the scheduler changes, such as when a request is done.
+
+        The `listener` is called with the condition held, so it must return quickly.
+
+        Args:
+            listener (Callable[[], None]): Function to call.
+        """
+        with self.condition:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        """Stop calling the `listener` when the state of the scheduler changes.
+
+        Args:
+            listener (Callable[[], None]): Function to stop calling.
+        """
+        with self.condition:
+            self.listeners.remove(listener)
+
+    def notify(self) -> None:
+        """Wake up the requests waiting for the state of the scheduler to change.
+
+        Called with the condition held.
+        """
+        self.condition.notify_all()
+        for listener in self.listeners:
+            listener()
+
+    def refill(self, now: float) -> None:
+        """Refill the tokens according to the time elapsed since the last refill.
+
+        The bucket holds at most `max_concurrency` tokens, which is the size of the bursts.
+        Called with the condition held.
+
+        Args:
+            now (float): Current time.
+        """
+        self.tokens = min(
+            self.max_concurrency, self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+
+    def try_acquire(self, url: str) -> float:
+        """Count a request as in flight if it can be sent now, or return how long to wait before trying again.
+
+        Called with the condition held.
+
+        Args:
+            url (str): URL of the request.
+
+        Returns:
+            float: 0 if the request can be sent, otherwise the delay in seconds to wait,
+                infinite if a request in flight must be done first.
+
+        Raises:
+            SearchCancelled: If the scheduler was cancelled.
+        """
+        if self.cancelled.is_set():
+            raise SearchCancelled(url)
+        now = time.monotonic()
+        self.refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return math.inf
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def acquire(self, url: str) -> None:
+        """Wait until a request can be sent, and count it as in flight.
+
+        Args:
+            url (str): URL of the request.
+
+        Raises:
+            SearchCancelled: If the scheduler was cancelled while waiting.
+        """
+        with self.condition:
+            while (delay := self.try_acquire(url)) > 0:
+                self.condition.wait(None if delay == math.inf else delay)
+
+    def release(self, latency: Optional[float], throttled: bool = False) -> None:
+        """Count a request as done, and adapt the concurrency limit to how Genius responded.
+
+        The limit increases additively when the response was fast, and decreases multiplicatively when it was slow
+        or throttled, at most once per round trip so that a burst of throttled requests doesn't collapse it.
+        The limit is kept when the request failed without Genius responding, since it says nothing about its load.
+
+        Args:
+            latency (float | None): Time in seconds the request took,
+                or `None` if it failed without a response nor a timeout.
+            throttled (bool): If the request was throttled, failed because of Genius or timed out. Defaults to `False`.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if latency is None:
+                pass
+            elif throttled or latency > self.target_latency:
+                if now - self.last_decrease > latency:
+                    self.limit = max(1, self.limit * DECREASE_CONCURRENCY_SEARCH)
+                    self.last_decrease = now
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.notify()
+
+    def pause(self, delay: float) -> None:
+        """Stop sending requests for `delay` seconds.
+
+        Args:
+            delay (float): Delay in seconds.
+        """
+        with self.condition:
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            self.notify()
+
+    @staticmethod
+    def is_throttled(status: int) -> bool:
+        """Return if a response was throttled or failed because of Genius, and should be retried.
+
+        Args:
+            status (int): Status code of the response.
+
+        Returns:
+            bool: If the response was throttled (429) or failed (5xx).
+        """
+        return status == 429 or status >= 500
+
+    @staticmethod
+    def get_backoff(attempt: int, retry_after: Optional[float]) -> float:
+        """Return the delay before retrying a request.
+
+        Args:
+            attempt (int): Number of the attempt that failed, starting at 0.
+            retry_after (float | None): Delay requested by Genius, if any.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        backoff = random.uniform(
+            0, min(MAX_BACKOFF_SEARCH, BASE_BACKOFF_SEARCH * 2**attempt)
+        )
+        if retry_after is not None:
+            return retry_after + backoff
+        return backoff
+
+    @staticmethod
+    def get_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+        """Return the delay requested by Genius before retrying the request.
+
+        Args:
+            headers (Mapping[str, str]): Headers of the response to the request.
+
+        Returns:
+            float | None: Delay in seconds, or `None` if Genius didn't request any.
+        """
+        try:
+            return min(MAX_BACKOFF_SEARCH, float(headers["Retry-After"]))
+        except (KeyError, ValueError):
+            return None
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """Send a GET request to `url` through the `session` once the scheduler allows it.
+
+        The request is retried up to `max_retries` times if it is throttled, if Genius fails,
+        or if it times out, as long as the retry would be sent before `DEADLINE_REQUEST_GENIUS`.
+        The other errors of the connection, such as a failed DNS resolution, are raised at once.
+
+        Args:
+            session (requests.Session): Session sending the request.
+            url (str): URL of the request.
+            **kwargs: Arguments of `requests.Session.get`.
+
+        Returns:
+            requests.Response: Response to the request. It can be a throttled or failed response
+                if the request still failed after the retries.
+
+        Raises:
+            requests.RequestException: If the connection failed, or still timed out after the retries.
+            SearchCancelled: If the scheduler was cancelled before the request succeeded.
+        """
+        deadline = time.monotonic() + DEADLINE_REQUEST_GENIUS
+        attempt = 0
+        while True:
+            self.acquire(url)
+            start = time.monotonic()
+            response: Optional[requests.Response] = None
+            timed_out = False
+            try:
+                response = session.get(url, **kwargs)
+            except requests.RequestException as exception:
+                if self.cancelled.is_set():
+                    # The connection was aborted because the search was stopped, possibly in the middle of the body
+                    raise SearchCancelled(url) from exception
+                # Only a timeout may come from Genius being overloaded, retrying the other errors would not help
+                if not isinstance(exception, requests.Timeout):
+                    raise
+                timed_out = True
+                backoff = self.get_backoff(attempt, None)
+                if attempt >= self.max_retries or time.monotonic() + backoff > deadline:
+                    raise
+                log.warning("Error while requesting '%s' : %s", url, str(exception))
+            finally:
+                # The request is done on every path, even an unexpected error, so that its slot is never lost
+                if response is None and not timed_out:
+                    self.release(None)
+                else:
+                    self.release(
+                        time.monotonic() - start,
+                        timed_out or self.is_throttled(response.status_code),
+                    )
+
+            if response is None:
+                self.wait(url, backoff)
+                attempt += 1
+                continue
+
+            throttled = self.is_throttled(response.status_code)
+            if not throttled or attempt >= self.max_retries:
+                return response
+            backoff = self.get_backoff(attempt, self.get_retry_after(response.headers))
+            if time.monotonic() + backoff > deadline:
+                return response
+
+            log.warning(
+                "Request '%s' throttled by Genius : %s", url, response.status_code
+            )
+            if response.status_code == 429:
+                # Genius asks to slow down, so stop sending requests from every worker
+                self.pause(backoff)
+            self.wait(url, backoff)
+            attempt += 1
+
+    def wait(self, url: str, delay: float) -> None:
+        """Wait `delay` seconds before retrying the request to `url`.
+
+        Args:
+            url (str): URL of the request.
+            delay (float): Delay in seconds.
+
+        Raises:
+            SearchCancelled: If the scheduler was cancelled while waiting.
+        """
+        if self.cancelled.wait(delay):
+            raise SearchCancelled(url)
@@ -0,0 +1,451 @@
+"""Engine searching for lyrics with asyncio, as an alternative to the pool of workers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging as log
+import math
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Optional
+
+import aiohttp
+import genius
+from genius.exceptions import APIException
+
+from src.consts import DEADLINE_REQUEST_GENIUS, INTERVAL_LOCK_SEARCH, MAX_SEARCH_INDEX
+from src.exceptions import DiscardLyrics, SearchCancelled
+from src.genius_client import GeniusClient
+from src.scheduler import SearchScheduler
+from src.tag import WorkerSearchLyrics, extract_lyrics
+
+
+class AsyncSearchEngine:
+    """Engine searching for the lyrics of the tracks on an event loop running in its own thread.
+
+    A `WorkerSearchLyrics` run by the pool blocks a thread for each request in flight.
+    The engine runs the same search as a task of its event loop instead, so that the number of requests in flight
+    is only limited by the scheduler, and not by the number of threads.
+    The workers are only used to hold the tracks and the results, and their signal is emitted once they are searched.
+
+    The requests are sent through the same scheduler as the pool of workers.
+    The engine listens to the scheduler, so that the searches waiting for a request are woken up
+    whenever a request is done, including the requests of the workers.
+    Nothing blocks the event loop: the scheduler is only used when no other thread holds it,
+    and the lyrics cache is used by the threads of the executor of the loop.
+
+    Attributes:
+        genius (GeniusClient): Genius client, of which the token, scheduler and timeouts are used.
+        scheduler (SearchScheduler): Scheduler of the requests.
+        loop (asyncio.AbstractEventLoop): Event loop running the searches.
+        thread (threading.Thread): Thread running the event loop.
+        session (aiohttp.ClientSession | None): Session sending the requests, created with the first search.
+        tasks (set[asyncio.Task]): Searches in progress.
+        waiters (deque[asyncio.Future]): Searches waiting for the scheduler to allow a request, in order.
+    """
+
+    def __init__(self, genius_client: GeniusClient) -> None:
+        """Init AsyncSearchEngine.
+
+        Args:
+            genius_client (GeniusClient): Genius client, of which the token, scheduler and timeouts are used.
+        """
+        self.genius: GeniusClient = genius_client
+        self.scheduler: SearchScheduler = genius_client.scheduler
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.thread: threading.Thread = threading.Thread(
+            target=self.loop.run_forever, name="AsyncSearchEngine", daemon=True
+        )
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.tasks: set[asyncio.Task] = set()
+        self.waiters: deque[asyncio.Future] = deque()
+
+        self.thread.start()
+        self.scheduler.add_listener(self.scheduler_changed)
+
+    def start(self, worker: WorkerSearchLyrics) -> None:
+        """Start searching for the lyrics of the tracks of the `worker`.
+
+        Args:
+            worker (WorkerSearchLyrics): Worker holding the tracks to search.
+        """
+        self.loop.call_soon_threadsafe(self.create_task, worker)
+
+    def cancel(self) -> None:
+        """Cancel the searches in progress, including their requests in flight."""
+        self.loop.call_soon_threadsafe(self.cancel_tasks)
+
+    def close(self) -> None:
+        """Cancel the searches in progress, close the connections and stop the event loop."""
+        self.scheduler.remove_listener(self.scheduler_changed)
+        asyncio.run_coroutine_threadsafe(self.close_session(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def create_task(self, worker: WorkerSearchLyrics) -> None:
+        """Create the task searching for the lyrics of the tracks of the `worker`.
+
+        Called in the thread of the event loop.
+
+        Args:
+            worker (WorkerSearchLyrics): Worker holding the tracks to search.
+        """
+        if self.session is None:
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=self.genius.timeout[0], sock_read=self.genius.timeout[1]
+            )
+            connector = aiohttp.TCPConnector(limit=self.genius.pool_size)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+        task = self.loop.create_task(self.search(worker))
+        self.tasks.add(task)
+        task.add_done_callback(partial(self.task_done, worker))
+
+    def task_done(self, worker: WorkerSearchLyrics, task: asyncio.Task) -> None:
+        """Report the `worker` as searched, even if its `task` was cancelled before it started.
+
+        Args:
+            worker (WorkerSearchLyrics): Worker holding the tracks that were searched.
+            task (asyncio.Task): Task that searched the tracks.
+        """
+        self.tasks.discard(task)
+        # If the search was cancelled, the tracks keep their state, so that they are searched again next time
+        if not task.cancelled() and not isinstance(task.exception(), SearchCancelled):
+            if task.exception() is not None:
+                log.error(
+                    "Unexpected exception while searching for the track '%s': %s",
+                    worker.track.get_title(),
+                    task.exception(),
+                )
+        worker.signals.signal_lyrics_searched.emit(worker)
+
+    def cancel_tasks(self) -> None:
+        """Cancel the searches in progress. Called in the thread of the event loop."""
+        for task in self.tasks:
+            task.cancel()
+
+    async def close_session(self) -> None:
+        """Cancel the searches in progress and close the session."""
+        self.cancel_tasks()
+        if len(self.tasks) > 0:
+            await asyncio.wait(self.tasks)
+        if self.session is not None:
+            await self.session.close()
+        # Wait for the lyrics cache and the scheduler to be done with the searches
+        await self.loop.shutdown_default_executor()
+
+    async def search(self, worker: WorkerSearchLyrics) -> None:
+        """Search for the lyrics of the tracks of the `worker`, the same way `WorkerSearchLyrics.run` does.
+
+        Args:
+            worker (WorkerSearchLyrics): Worker holding the tracks to search.
+
+        Raises:
+            SearchCancelled: If the search was stopped while requesting Genius.
+        """
+        tracks = worker.get_tracks_to_search()
+        if len(tracks) == 0 or worker.stop_search:
+            return
+
+        worker.track = tracks[0]
+        lyrics = await self.search_lyrics(worker)
+        worker.set_lyrics(tracks, lyrics)
+
+    async def search_lyrics(self, worker: WorkerSearchLyrics) -> str:
+        """Search the lyrics of the track of the `worker`, consulting the lyrics cache first.
+
+        Args:
+            worker (WorkerSearchLyrics): Worker holding the track to search.
+
+        Returns:
+            str: Lyrics of the track, or an empty string if they were not found.
+
+        Raises:
+            SearchCancelled: If the search was stopped while requesting Genius.
+        """
+        track = worker.track
+        key = worker.get_search_key(track)
+        if key is None:
+            return ""
+
+        lyrics_cache = worker.gtagger.lyrics_cache
+        lyrics = await self.loop.run_in_executor(None, lyrics_cache.load, *key)
+        if lyrics is None:
+            worker.requested = True
+            try:
+                lyrics = await self.fetch_lyrics(worker, worker.get_search_title(track))
+            except SearchCancelled:
+                raise
+            except Exception as exception:
+                # Don't cache the failure, so that the track is searched again next time
+                log.error(
+                    "Unexpected exception while searching for the track '%s': %s",
+                    track.get_title(),
+                    exception,
+                )
+                return ""
+            await self.loop.run_in_executor(None, lyrics_cache.save, *key, lyrics)
+
+        return lyrics
+
+    async def fetch_lyrics(self, worker: WorkerSearchLyrics, search_title: str) -> str:
+        """Fetch the lyrics of the track of the `worker` from Genius, the same way `WorkerSearchLyrics.fetch_lyrics` does.
+
+        Args:
+            worker (WorkerSearchLyrics): Worker holding the track to search.
+            search_title (str): Title of the track used to search it.
+
+        Returns:
+            str: Formatted lyrics, or an empty string if no correct lyrics were found.
+
+        Raises:
+            Exception: If the request to Genius failed.
+        """
+        if worker.song is not None:
+            lyrics = await self.fetch_candidates(worker, [worker.song])
+            if lyrics != "":
+                return lyrics
+
+        # Search for the track
+        artist = worker.track.get_main_artist()
+        songs = await self.search_songs(f"{search_title} {artist}")
+        candidates = worker.rank_candidates(search_title, artist, songs)
+        if len(candidates) == 0:
+            log.warning(
+                "Track '%s' by %s not found on Genius",
+                worker.track.get_title(),
+                artist,
+            )
+            return ""
+
+        return await self.fetch_candidates(worker, candidates)
+
+    async def fetch_candidates(
+        self, worker: WorkerSearchLyrics, candidates: list[genius.api.Song]
+    ) -> str:
+        """Fetch the lyrics of the `candidates` until correct ones are found.
+
+        Args:
+            worker (WorkerSearchLyrics): Worker holding the track to search.
+            candidates (list[genius.api.Song]): Candidates, from the best to the worst.
+
+        Returns:
+            str: Formatted lyrics, or an empty string if no correct lyrics were found.
+
+        Raises:
+            Exception: If the request to Genius failed.
+        """
+        for searched_track in candidates[:MAX_SEARCH_INDEX]:
+            response, html = await self.get(searched_track.url)
+            response.raise_for_status()
+            try:
+                searched_lyrics, lyrics = await asyncio.wrap_future(
+                    self.genius.executor.submit(
+                        extract_lyrics, html, worker.track.get_title()
+                    )
+                )
+            except DiscardLyrics as exception:
+                log.error(exception)
+                continue
+            if worker.check_lyrics(searched_lyrics):
+                return lyrics
+
+        return ""
+
+    async def search_songs(self, text: str) -> list[genius.api.Song]:
+        """Search for the songs on Genius that match the `text`, like `genius.Genius.search`.
+
+        Args:
+            text (str): Text to search.
+
+        Returns:
+            list[genius.api.Song]: Songs found.
+
+        Raises:
+            Exception: If the request to Genius failed.
+        """
+        result = await self.call_api("search", q=text, page=1, per_page=20)
+        return [genius.api.Song(self.genius, hit["result"]) for hit in result["hits"]]
+
+    async def call_api(self, service: str, **params) -> dict[str, Any]:
+        """Call the `service` of the API with the `params`, like `PooledAPI`.
+
+        Args:
+            service (str): Service to call.
+            **params: Parameters of the request.
+
+        Returns:
+            dict[str, Any]: Response of the API.
+
+        Raises:
+            aiohttp.ClientError: If the request failed.
+            APIException: If the API returned an error.
+        """
+        params["text_format"] = "plain"
+        response, text = await self.get(
+            f"{self.genius.api.BASE_URL}/{service}",
+            params=params,
+            headers={"Authorization": self.genius.api.access_token},
+        )
+        if response.status == 429 or response.status >= 500:
+            response.raise_for_status()
+        data = json.loads(text)
+        if data["meta"]["status"] != 200:
+            raise APIException(
+                status=data["meta"]["status"],
+                message=data["meta"]["message"],
+                url=str(response.url),
+            )
+        return data["response"]
+
+    async def acquire(self, url: str) -> None:
+        """Wait until the scheduler allows a request to be sent, without blocking the event loop.
+
+        Args:
+            url (str): URL of the request.
+
+        Raises:
+            SearchCancelled: If the scheduler was cancelled.
+        """
+        while True:
+            if not self.scheduler.condition.acquire(blocking=False):
+                # The scheduler is held by another thread, which must not block the event loop
+                await asyncio.sleep(INTERVAL_LOCK_SEARCH)
+                continue
+            try:
+                delay = self.scheduler.try_acquire(url)
+            finally:
+                self.scheduler.condition.release()
+            if delay == 0:
+                # The scheduler may allow another request, which the next search will check
+                self.wake_up()
+                return
+            waiter = self.loop.create_future()
+            self.waiters.append(waiter)
+            timer = None
+            if delay != math.inf:
+                timer = self.loop.call_later(delay, self.set_waiter_done, waiter)
+            try:
+                await waiter
+            finally:
+                if timer is not None:
+                    timer.cancel()
+
+    def call_scheduler(self, function: Callable[..., None], *args) -> None:
+        """Call the `function` of the scheduler, without blocking the event loop.
+
+        The scheduler is also held by the workers of the pool and by the GUI.
+        If another thread holds it, the `function` is called by a thread of the executor of the loop instead.
+
+        Args:
+            function (Callable[..., None]): Function of the scheduler.
+            *args: Arguments of the function.
+        """
+        if not self.scheduler.condition.acquire(blocking=False):
+            self.loop.run_in_executor(None, partial(function, *args))
+            return
+        try:
+            function(*args)
+        finally:
+            self.scheduler.condition.release()
+
+    def scheduler_changed(self) -> None:
+        """Wake up a search waiting for a request when the state of the scheduler changed.
+
+        Called by the scheduler from any thread, such as when a worker of the pool released its request.
+        """
+        self.loop.call_soon_threadsafe(self.wake_up)
+
+    def wake_up(self) -> None:
+        """Wake up the search that has been waiting the longest for a request to be allowed.
+
+        Only one search is woken up, instead of all of them competing for the same request.
+        """
+        while len(self.waiters) > 0:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    @staticmethod
+    def set_waiter_done(waiter: asyncio.Future) -> None:
+        """Wake up the search waiting on the `waiter`, once it waited as long as the scheduler asked.
+
+        Args:
+            waiter (asyncio.Future): Future the search is waiting on.
+        """
+        if not waiter.done():
+            waiter.set_result(None)
+
+    async def get(self, url: str, **kwargs) -> tuple[aiohttp.ClientResponse, str]:
+        """Send a GET request to `url` once the scheduler allows it, retrying it like `SearchScheduler.get`.
+
+        Args:
+            url (str): URL of the request.
+            **kwargs: Arguments of `aiohttp.ClientSession.get`.
+
+        Returns:
+            tuple[aiohttp.ClientResponse, str]: Response to the request and its body. It can be a throttled
+                or failed response if the request still failed after the retries.
+
+        Raises:
+            aiohttp.ClientError: If the connection failed, or still timed out after the retries.
+            asyncio.TimeoutError: If the request still timed out after the retries.
+            SearchCancelled: If the scheduler was cancelled before the request succeeded.
+        """
+        deadline = time.monotonic() + DEADLINE_REQUEST_GENIUS
+        attempt = 0
+        while True:
+            await self.acquire(url)
+            start = time.monotonic()
+            response = None
+            text = None
+            timed_out = False
+            try:
+                async with self.session.get(url, **kwargs) as response:
+                    text = await response.text()
+            except asyncio.TimeoutError as exception:
+                # Only a timeout may come from Genius being overloaded, retrying the other errors would not help
+                timed_out = True
+                backoff = self.scheduler.get_backoff(attempt, None)
+                if (
+                    attempt >= self.scheduler.max_retries
+                    or time.monotonic() + backoff > deadline
+                ):
+                    raise
+                log.warning("Error while requesting '%s' : %s", url, str(exception))
+            finally:
+                # The request is released whatever happened to it, even if the search was cancelled,
+                # but the limit only adapts to the requests to which Genius responded or that timed out
+                if text is None and not timed_out:
+                    self.call_scheduler(self.scheduler.release, None)
+                else:
+                    self.call_scheduler(
+                        self.scheduler.release,
+                        time.monotonic() - start,
+                        timed_out or self.scheduler.is_throttled(response.status),
+                    )
+            if timed_out:
+                await asyncio.sleep(backoff)
+                attempt += 1
+                continue
+
+            throttled = self.scheduler.is_throttled(response.status)
+            if not throttled or attempt >= self.scheduler.max_retries:
+                return response, text
+            backoff = self.scheduler.get_backoff(
+                attempt, self.scheduler.get_retry_after(response.headers)
+            )
+            if time.monotonic() + backoff > deadline:
+                return response, text
+
+            log.warning("Request '%s' throttled by Genius : %s", url, response.status)
+            if response.status == 429:
+                # Genius asks to slow down, so stop sending requests from every search
+                self.call_scheduler(self.scheduler.pause, backoff)
+            await asyncio.sleep(backoff)
+            attempt += 1
@@ -0,0 +1,135 @@
+"""Index of the tracks used to filter them."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from src.consts import SEPARATOR_SEARCH_INDEX, SIZE_NGRAM_SEARCH_INDEX
+from src.track import Track
+
+
+class SearchIndex:
+    """Index of the titles and artists of the tracks, used to filter them by text.
+
+    The title and artists of each track are computed, joined and casefolded once, when the track is added.
+    Each n-gram of these casefolded strings points to the tracks containing it,
+    so that a search only checks the tracks containing all the n-grams of the text instead of every track.
+
+    The matches of the last search are kept: when the text of the next search contains the previous one
+    (for example when a character is typed), only these matches are checked.
+
+    Attributes:
+        keys (dict[Track, str]): Title and artists of each track.
+        keys_casefold (dict[Track, str]): Casefolded title and artists of each track.
+        ngrams (dict[str, set[Track]]): Tracks containing each n-gram.
+        last_text (str | None): Text of the last search, or `None` if the index changed since.
+        last_match_case (bool): If the last search matched the case.
+        last_matches (set[Track]): Tracks that matched the last search.
+    """
+
+    def __init__(self) -> None:
+        """Init SearchIndex."""
+        self.keys: dict[Track, str] = {}
+        self.keys_casefold: dict[Track, str] = {}
+        self.ngrams: dict[str, set[Track]] = {}
+        self.last_text: Optional[str] = None
+        self.last_match_case: bool = False
+        self.last_matches: set[Track] = set()
+
+    @staticmethod
+    def get_ngrams(text: str) -> set[str]:
+        """Return the n-grams of the `text`.
+
+        Args:
+            text (str): Text to split.
+
+        Returns:
+            set[str]: N-grams of the text.
+        """
+        return {
+            text[index : index + SIZE_NGRAM_SEARCH_INDEX]
+            for index in range(len(text) - SIZE_NGRAM_SEARCH_INDEX + 1)
+        }
+
+    def add_track(self, track: Track) -> None:
+        """Add the `track` to the index.
+
+        Args:
+            track (Track): Track to add.
+        """
+        # The separator cannot be entered in the filter, so the text cannot match across the title and the artists
+        key = f"{track.get_title()}{SEPARATOR_SEARCH_INDEX}{track.get_artists()}"
+        self.keys[track] = key
+        self.keys_casefold[track] = key.casefold()
+        for ngram in self.get_ngrams(self.keys_casefold[track]):
+            self.ngrams.setdefault(ngram, set()).add(track)
+        self.last_text = None
+
+    def remove_track(self, track: Track) -> None:
+        """Remove the `track` from the index.
+
+        Args:
+            track (Track): Track to remove.
+        """
+        if track not in self.keys:
+            return
+        del self.keys[track]
+        for ngram in self.get_ngrams(self.keys_casefold.pop(track)):
+            tracks = self.ngrams[ngram]
+            tracks.discard(track)
+            if len(tracks) == 0:
+                del self.ngrams[ngram]
+        self.last_text = None
+
+    def matches(self, track: Track, text: str, match_case: bool) -> bool:
+        """Return If the title or the artists of the `track` contain the `text`.
+
+        Args:
+            track (Track): Track to check.
+            text (str): Text to find.
+            match_case (bool): If the case should be matched.
+
+        Returns:
+            bool: If the track matches the text.
+        """
+        if match_case:
+            return text in self.keys[track]
+        return text.casefold() in self.keys_casefold[track]
+
+    def search(self, text: str, match_case: bool) -> set[Track]:
+        """Return the tracks of which the title or the artists contain the `text`.
+
+        Args:
+            text (str): Text to find.
+            match_case (bool): If the case should be matched.
+
+        Returns:
+            set[Track]: Tracks matching the text.
+        """
+        if not match_case:
+            text = text.casefold()
+        keys = self.keys if match_case else self.keys_casefold
+
+        if (
+            self.last_text is not None
+            and match_case == self.last_match_case
+            and self.last_text in text
+        ):
+            # The text was extended, so the matches can only be among the last ones
+            matches = {track for track in self.last_matches if text in keys[track]}
+        else:
+            ngrams = self.get_ngrams(text.casefold())
+            if len(ngrams) == 0:
+                matches = {track for track, key in keys.items() if text in key}
+            else:
+                # Intersect starting with the rarest n-grams
+                sets = sorted(
+                    (self.ngrams.get(ngram, set()) for ngram in ngrams), key=len
+                )
+                candidates = sets[0].intersection(*sets[1:])
+                matches = {track for track in candidates if text in keys[track]}
+
+        self.last_text = text
+        self.last_match_case = match_case
+        self.last_matches = matches
+        return matches
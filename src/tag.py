@@ -3,24 +3,39 @@
 from __future__ import annotations
 
 import logging as log
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Optional
 
 import genius
 from PySide6 import QtCore
 
 from src.consts import (
+    ATTEMPTS_ALBUM,
     DISCARD_ARTISTS,
-    LINES_LYRICS,
+    INTERVAL_BATCH_TRACKS,
+    MAX_PAGES_ARTIST,
     MAX_SEARCH_INDEX,
+    MIN_SEARCHES_ALBUM,
+    MIN_SEARCHES_ARTIST,
+    MIN_SIMILARITY_ARTIST_CANDIDATE,
+    MIN_SIMILARITY_POSITION_ALBUM,
+    MIN_SIMILARITY_TITLE_CANDIDATE,
     MISSING_LYRICS,
     RE_REMOVE_LINES,
-    UNWANTED_TITLE_TEXT,
+    SIZE_BATCH_TRACKS,
+    SIZE_PAGE_ALBUM,
+    SIZE_PAGE_ARTIST,
 )
 from src.enums import State
-from src.exceptions import DiscardLyrics
+from src.exceptions import DiscardLyrics, SearchCancelled
+from src.genius_client import GeniusClient
+from src.matching import clean_title, get_similarity, normalize
 from src.track import Track
-from src.track_layout import TrackLayout
+from src.write_planner import WritePlanner
 
 if TYPE_CHECKING:
     from gtagger import GTagger
@@ -29,45 +44,306 @@ if TYPE_CHECKING:
 class ThreadReadTracks(QtCore.QThread):
     """Reads the tags of the files.
 
+    The files are read in parallel by a pool of `workers` threads,
+    and the tracks are sent back in the order in which their reading completes.
+    The tags of the files that didn't change since they were last read are restored from the scan cache.
+
+    `files` can be a generator (for example when walking a directory):
+    the files are consumed as they are found, so that they are read while the enumeration is still running.
+
+    The tracks are sent by batches of `SIZE_BATCH_TRACKS` tracks, or of the tracks read during
+    `INTERVAL_BATCH_TRACKS` seconds, to avoid flooding the GUI thread with one signal per file.
+
+    The reading can be stopped with `stop_read`: the files not read yet are skipped.
+
     Signals:
-        add_track (object): Emitted when the tags of a file have been read and a track can be added.
+        add_tracks (object, int): Emitted with a batch of tracks that can be added,
+            and the number of files read for this batch (including the ones that were skipped).
+        files_found (int): Emitted with the number of files found so far, before each batch of tracks.
 
     Attributes:
-        files (list[Path]): List of files to read.
+        files (Iterable[Path]): Files to read.
+        workers (int): Number of workers reading the files in parallel.
         gtagger (GTagger): GTagger application.
+        stop_read (bool): If the reading was stopped.
+        count (int): Number of files found so far.
+        batch (list[Track]): Tracks read since the last batch was sent.
+        batch_read (int): Number of files read since the last batch was sent.
+        batch_time (float): Time at which the last batch was sent.
     """
 
-    add_track = QtCore.Signal(object)
+    add_tracks = QtCore.Signal(object, int)
+    files_found = QtCore.Signal(int)
 
     def __init__(
         self,
-        files: list[Path],
+        files: Iterable[Path],
+        workers: int,
         gtagger: GTagger,
     ) -> None:
         """Init ThreadReadTracks.
 
         Args:
-            files (list[Path]): List of files to read.
+            files (Iterable[Path]): Files to read.
+            workers (int): Number of workers reading the files in parallel.
             gtagger (GTagger): GTagger application.
         """
         super().__init__()
-        self.files: list[Path] = files
+        self.files: Iterable[Path] = files
+        self.workers: int = workers
         self.gtagger: GTagger = gtagger
+        self.stop_read: bool = False
+        self.count: int = 0
+        self.batch: list[Track] = []
+        self.batch_read: int = 0
+        self.batch_time: float = time.monotonic()
 
     def run(self):
         """Run ThreadReadTracks."""
-        for file in self.files:
-            # Create the track and read its tags
-            track = Track(file)
-            tags_read = track.read_tags()
-
-            # Signal to WindowMain to skip the track
-            if not tags_read:
-                self.add_track.emit(None)
-                continue
+        pending: set[Future] = set()
+        self.batch_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for file in self.files:
+                if self.stop_read:
+                    break
+                pending.add(executor.submit(self.read_track, file))
+                self.count += 1
 
-            # Signal to WindowMain to add the track
-            self.add_track.emit(track)
+                # Collect the tracks already read, and wait if enough files are queued
+                pending = self.collect_tracks(pending, self.workers * 2)
+
+            self.collect_tracks(pending, 1)
+        self.send_tracks()
+        self.gtagger.scan_cache.commit()
+
+    def collect_tracks(self, pending: set[Future], limit: int) -> set[Future]:
+        """Collect the tracks read by the `pending` futures, waiting as long as at least `limit` of them are pending.
+
+        The batch of tracks is sent whenever it is full or old enough.
+
+        Args:
+            pending (set[Future]): Futures reading the tracks.
+            limit (int): Number of pending futures under which to stop waiting.
+
+        Returns:
+            set[Future]: Futures still pending.
+        """
+        while True:
+            timeout = INTERVAL_BATCH_TRACKS if len(pending) >= limit else 0
+            done, pending = wait(pending, timeout, FIRST_COMPLETED)
+            for future in done:
+                track = future.result()
+                self.batch_read += 1
+                # Skip the track if its tags could not be read
+                if track is not None:
+                    self.batch.append(track)
+
+            if (
+                len(self.batch) >= SIZE_BATCH_TRACKS
+                or time.monotonic() - self.batch_time >= INTERVAL_BATCH_TRACKS
+            ):
+                self.send_tracks()
+            if len(pending) < limit:
+                return pending
+
+    def send_tracks(self) -> None:
+        """Signal to WindowMain to add the batch of tracks.
+
+        The number of files found is sent first, so that the progress bar never exceeds its maximum.
+        """
+        self.files_found.emit(self.count)
+        if self.batch_read > 0:
+            self.add_tracks.emit(self.batch, self.batch_read)
+        self.batch = []
+        self.batch_read = 0
+        self.batch_time = time.monotonic()
+
+    def read_track(self, file: Path) -> Track | None:
+        """Create the track of the `file` and read its tags.
+
+        The tags are restored from the scan cache if the file didn't change,
+        otherwise they are read with `mutagen` and stored in the cache.
+        The sort keys of the track are computed here, outside of the GUI thread.
+
+        Args:
+            file (Path): File to read.
+
+        Returns:
+            Track | None: Track of the file, or `None` if its tags could not be read or the reading was stopped.
+        """
+        if self.stop_read:
+            return None
+        track = Track(file)
+        if not track.read_stat():
+            return None
+        if not self.gtagger.scan_cache.load_track(track):
+            if not track.read_tags():
+                return None
+            self.gtagger.scan_cache.save_track(track)
+            # The file is opened again only if needed, to avoid keeping all the tags (and pictures) in memory
+            track.file = None
+        track.compute_sort_keys()
+        return track
+
+
+class ThreadSaveTracks(QtCore.QThread):
+    """Saves the new lyrics of the tracks to their files.
+
+    The files are grouped by storage device, and the files of each device are saved in parallel
+    by its own pool of `workers` threads, so that a slow drive doesn't hold back the others.
+    The states of the tracks are sent back by batches, like the tracks read by `ThreadReadTracks`.
+
+    The saves are planned first by the `planner`, to report how many files will be rewritten entirely
+    because their new tags don't fit in their padding. The padding policy of the planner is applied to the saves.
+
+    The tags kept in memory and in the scan cache are updated with the lyrics that were written,
+    the files are only read again if they were changed by another program since their tags were read.
+
+    The save can be stopped with `stop_save`: the files not saved yet are skipped,
+    but the files being saved are always written completely.
+
+    Signals:
+        tracks_saved (object, int): Emitted with a batch of states of the tracks that were saved or not,
+            and the number of tracks processed for this batch (including the ones that were skipped).
+        save_planned (int, int): Emitted once the saves are planned, with the number of files that will be rewritten,
+            and the number of bytes that will be rewritten.
+
+    Attributes:
+        tracks (list[Track]): Tracks to save.
+        workers (int): Number of workers saving the files of each storage device in parallel.
+        gtagger (GTagger): GTagger application.
+        planner (WritePlanner): Planner of the saves, choosing the padding kept after the tags.
+        stop_save (bool): If the save was stopped.
+        batch (dict[Track, State]): States of the tracks saved since the last batch was sent.
+        batch_processed (int): Number of tracks processed since the last batch was sent.
+        batch_time (float): Time at which the last batch was sent.
+    """
+
+    tracks_saved = QtCore.Signal(object, int)
+    save_planned = QtCore.Signal(int, int)
+
+    def __init__(
+        self, tracks: list[Track], workers: int, padding: int, gtagger: GTagger
+    ) -> None:
+        """Init ThreadSaveTracks.
+
+        Args:
+            tracks (list[Track]): Tracks to save.
+            workers (int): Number of workers saving the files of each storage device in parallel.
+            padding (int): Padding in bytes reserved after the tags when a file is rewritten.
+            gtagger (GTagger): GTagger application.
+        """
+        super().__init__()
+        self.tracks: list[Track] = tracks
+        self.workers: int = workers
+        self.gtagger: GTagger = gtagger
+        self.planner: WritePlanner = WritePlanner(padding)
+        self.stop_save: bool = False
+        self.batch: dict[Track, State] = {}
+        self.batch_processed: int = 0
+        self.batch_time: float = time.monotonic()
+
+    def run(self):
+        """Run ThreadSaveTracks."""
+        pending: set[Future] = set()
+        self.batch_time = time.monotonic()
+        devices = self.group_by_device()
+        executors = [ThreadPoolExecutor(max_workers=self.workers) for _ in devices]
+        try:
+            for executor, tracks in zip(executors, devices.values()):
+                for track in tracks:
+                    pending.add(executor.submit(self.plan_track, track))
+            wait(pending)
+            if not self.stop_save:
+                self.save_planned.emit(
+                    self.planner.files_rewritten, self.planner.bytes_rewritten
+                )
+
+            pending = set()
+            for executor, tracks in zip(executors, devices.values()):
+                for track in tracks:
+                    pending.add(executor.submit(self.save_track, track))
+
+            while len(pending) > 0:
+                done, pending = wait(pending, INTERVAL_BATCH_TRACKS, FIRST_COMPLETED)
+                for future in done:
+                    track, state = future.result()
+                    self.batch_processed += 1
+                    # The state of a skipped track is left unchanged
+                    if state is not None:
+                        self.batch[track] = state
+
+                if (
+                    len(self.batch) >= SIZE_BATCH_TRACKS
+                    or time.monotonic() - self.batch_time >= INTERVAL_BATCH_TRACKS
+                ):
+                    self.send_states()
+        finally:
+            for executor in executors:
+                executor.shutdown(cancel_futures=True)
+        self.send_states()
+        self.gtagger.scan_cache.commit()
+
+    def group_by_device(self) -> dict[int, list[Track]]:
+        """Group the tracks by the storage device of their files.
+
+        The files that cannot be accessed are grouped together, their save fails and is logged by the workers.
+
+        Returns:
+            dict[int, list[Track]]: Tracks grouped by device.
+        """
+        devices: dict[int, list[Track]] = {}
+        for track in self.tracks:
+            try:
+                device = os.stat(track.filepath).st_dev
+            except OSError:
+                device = -1
+            devices.setdefault(device, []).append(track)
+        return devices
+
+    def send_states(self) -> None:
+        """Signal to WindowMain to update the states of the batch of tracks."""
+        if self.batch_processed > 0:
+            self.tracks_saved.emit(self.batch, self.batch_processed)
+        self.batch = {}
+        self.batch_processed = 0
+        self.batch_time = time.monotonic()
+
+    def plan_track(self, track: Track) -> None:
+        """Plan the save of the new lyrics of the `track`.
+
+        Args:
+            track (Track): Track to plan.
+        """
+        if not self.stop_save:
+            self.planner.plan_track(track)
+
+    def save_track(self, track: Track) -> tuple[Track, Optional[State]]:
+        """Save the new lyrics of the `track` to its file and update its tags.
+
+        Args:
+            track (Track): Track to save.
+
+        Returns:
+            tuple[Track, State | None]: Track and its new state, or `None` if the save was stopped before it.
+        """
+        if self.stop_save:
+            # The file kept by the plan must not be written by a later save, since it may change in the meantime
+            track.file = None
+            return track, None
+        changed = track.has_changed()
+        if not track.save_lyrics(self.planner.get_padding):
+            track.file = None
+            return track, State.LYRICS_NOT_SAVED
+        if changed:
+            # The other tags may have been changed too, so the file is read again
+            if track.read_stat() and track.read_tags():
+                self.gtagger.scan_cache.save_track(track)
+        elif track.lyrics_saved():
+            self.gtagger.scan_cache.save_track(track)
+        # The file is opened again only if needed, to avoid keeping all the tags (and pictures) in memory
+        track.file = None
+        return track, State.LYRICS_SAVED
 
 
 class WorkerSearchLyricsSignals(QtCore.QObject):
@@ -81,134 +357,304 @@ class WorkerSearchLyricsSignals(QtCore.QObject):
 
 
 class WorkerSearchLyrics(QtCore.QRunnable):
-    """Worker to search for the lyrics of a track.
+    """Worker to search for the lyrics of a group of tracks.
+
+    The tracks of the group share the same search key (for example copies of the same song in different formats,
+    or on an album and a compilation). The lyrics are searched once, with the first track that needs them,
+    and set to every track of the group.
 
     Attributes:
         stop_search (bool): If the search should be stopped.
-        genius (genius.Genius): `wrap-genius` instance.
-        track (Track): Track to search the lyrics for.
+        genius (GeniusClient): Genius client shared by the workers.
+        tracks (list[Track]): Tracks to search the lyrics for, sharing the same search key.
+        track (Track): Track used to search the lyrics.
         overwrite_lyrics (bool): If the lyrics should be overwritten.
         gtagger (GTagger): GTagger application.
+        song (genius.api.Song | None): Song already matched to the tracks by a search of their artist, if any.
         signals (WorkerSearchLyricsSignals): Signals of the worker.
+        states (dict[Track, State]): New state of each track that was searched.
+        requested (bool): If Genius was requested, because the lyrics were not in the lyrics cache.
+        requests_saved (int): Number of searches on Genius saved by searching the group at once.
     """
 
     def __init__(
         self,
-        token: str,
-        track: Track,
-        layout: TrackLayout,
+        genius_client: GeniusClient,
+        tracks: list[Track],
         overwrite_lyrics: bool,
         gtagger: GTagger,
+        song: Optional[genius.api.Song] = None,
     ) -> None:
         """Init WorkerSearchLyrics.
 
         Args:
-            token (str): Genius client access token.
-            track (Track): Track to search the lyrics for.
-            layout (TrackLayout): Layout of the track.
+            genius_client (GeniusClient): Genius client shared by the workers.
+            tracks (list[Track]): Tracks to search the lyrics for, sharing the same search key.
             overwrite_lyrics (bool): If the lyrics should be overwritten.
             gtagger (GTagger): GTagger application.
+            song (genius.api.Song | None): Song already matched to the tracks by a search of their artist, if any.
+                Defaults to `None`.
         """
         super().__init__()
 
         self.stop_search = False
-        self.genius: genius.Genius = genius.Genius(token)
-        self.track: Track = track
-        self.layout: TrackLayout = layout
+        self.genius: GeniusClient = genius_client
+        self.tracks: list[Track] = tracks
+        self.track: Track = tracks[0]
         self.overwrite_lyrics: bool = overwrite_lyrics
         self.gtagger: GTagger = gtagger
+        self.song: Optional[genius.api.Song] = song
         self.signals = WorkerSearchLyricsSignals()
+        self.states: dict[Track, State] = {}
+        self.requested: bool = False
+        self.requests_saved: int = 0
 
     def run(self):
         """Run WorkerSearchLyrics."""
-        if (
-            (not self.overwrite_lyrics and self.track.has_lyrics_original())
-            or self.track.has_lyrics_new()
-            or self.stop_search
-        ):
+        tracks = self.get_tracks_to_search()
+        if len(tracks) == 0 or self.stop_search:
             self.signals.signal_lyrics_searched.emit(self)
             return
 
-        new_state = (
-            State.LYRICS_FOUND if self.search_lyrics() else State.LYRICS_NOT_FOUND
-        )
-        self.layout.label_lyrics.setText(self.track.get_lyrics(lines=LINES_LYRICS))
-        self.layout.set_state(new_state)
+        self.track = tracks[0]
+        try:
+            lyrics = self.search_lyrics()
+        except SearchCancelled:
+            # The tracks keep their state, so that they are searched again next time
+            self.signals.signal_lyrics_searched.emit(self)
+            return
+
+        self.set_lyrics(tracks, lyrics)
         self.signals.signal_lyrics_searched.emit(self)
 
-    def search_lyrics(self) -> bool:
+    def get_tracks_to_search(self) -> list[Track]:
+        """Return the tracks of the group of which the lyrics should be searched.
+
+        Returns:
+            list[Track]: Tracks to search.
+        """
+        return [
+            track
+            for track in self.tracks
+            if self.needs_search(track, self.overwrite_lyrics)
+        ]
+
+    def set_lyrics(self, tracks: list[Track], lyrics: str) -> None:
+        """Set the `lyrics` that were searched to the `tracks`, and their new state.
+
+        Args:
+            tracks (list[Track]): Tracks that were searched.
+            lyrics (str): Lyrics found, or an empty string if they were not found.
+        """
+        for track in tracks:
+            if lyrics != "":
+                track.set_lyrics_new(lyrics)
+                self.states[track] = State.LYRICS_FOUND
+            else:
+                self.states[track] = State.LYRICS_NOT_FOUND
+        if self.requested:
+            self.requests_saved = len(tracks) - 1
+
+    @staticmethod
+    def needs_search(track: Track, overwrite_lyrics: bool) -> bool:
+        """Return if the lyrics of the `track` should be searched.
+
+        Args:
+            track (Track): Track to check.
+            overwrite_lyrics (bool): If the lyrics should be overwritten.
+
+        Returns:
+            bool: If the lyrics of the track should be searched.
+        """
+        return not (
+            (not overwrite_lyrics and track.has_lyrics_original())
+            or track.has_lyrics_new()
+        )
+
+    @staticmethod
+    def get_search_title(track: Track) -> str:
+        """Return the title of the `track` used to search it.
+
+        Args:
+            track (Track): Track to search.
+
+        Returns:
+            str: Title of the track without the featured artists and the mentions of the version,
+                that would probably make the search fail.
+        """
+        return clean_title(track.title)
+
+    @staticmethod
+    def get_search_key(track: Track) -> Optional[tuple[str, str]]:
+        """Return the key identifying the search of the `track`.
+
+        The tracks with the same key get the same lyrics, so they only need to be searched once.
+        The tracks without a title or a main artist can't be searched, and are never grouped with other tracks.
+
+        Args:
+            track (Track): Track to search.
+
+        Returns:
+            tuple[str, str] | None: Normalized search title and main artist of the track,
+                or `None` if the track doesn't have a title or a main artist.
+        """
+        key = (
+            normalize(WorkerSearchLyrics.get_search_title(track)),
+            normalize(track.main_artist),
+        )
+        if key[0] == "" or key[1] == "":
+            return None
+        return key
+
+    def search_lyrics(self) -> str:
         """Search the lyrics of the track.
 
-        Use `wrap-genius` to search for a track on Genius based on its title and artist, and fetch its lyrics.
+        The lyrics cache is consulted first. If the track was not searched before, or the cached result expired,
+        the lyrics are fetched from Genius and the result is stored into the cache, even if no lyrics were found.
 
         Returns:
-            bool: If the lyrics of the track were found.
+            str: Lyrics of the track, or an empty string if they were not found.
+
+        Raises:
+            SearchCancelled: If the search was stopped while requesting Genius.
         """
-        if self.track.get_title() == "" or self.track.get_main_artist() == "":
-            return False
+        key = self.get_search_key(self.track)
+        if key is None:
+            return ""
+
+        lyrics = self.gtagger.lyrics_cache.load(*key)
+        if lyrics is None:
+            self.requested = True
+            try:
+                lyrics = self.fetch_lyrics(self.get_search_title(self.track))
+            except SearchCancelled:
+                raise
+            except Exception as exception:
+                # Don't cache the failure, so that the track is searched again next time
+                log.error(
+                    "Unexpected exception while searching for the track '%s': %s",
+                    self.track.get_title(),
+                    exception,
+                )
+                return ""
+            self.gtagger.lyrics_cache.save(*key, lyrics)
+
+        return lyrics
+
+    @staticmethod
+    def rank_candidates(
+        search_title: str, artist: str, searched_tracks: Iterable[genius.api.Song]
+    ) -> list[genius.api.Song]:
+        """Rank the results of the search from the most to the least likely to be the track.
+
+        Only the data of the search response is used, so that the lyrics are fetched only for the best candidates.
+        The results of which the artist should be discarded, or of which the title or the artist
+        are too different from the track's, are not candidates.
+
+        Args:
+            search_title (str): Title of the track used to search it.
+            artist (str): Main artist of the track.
+            searched_tracks (Iterable[genius.api.Song]): Results of the search.
+
+        Returns:
+            list[genius.api.Song]: Candidates, from the best to the worst.
+        """
+        candidates: list[tuple[float, genius.api.Song]] = []
+        for searched_track in searched_tracks:
+            # The track's artist indicates it should be discarded
+            if searched_track.artist.name in DISCARD_ARTISTS:
+                continue
+
+            similarity_title = get_similarity(
+                search_title, clean_title(searched_track.title)
+            )
+            similarity_artist = get_similarity(artist, searched_track.artist.name)
+            if (
+                similarity_title < MIN_SIMILARITY_TITLE_CANDIDATE
+                or similarity_artist < MIN_SIMILARITY_ARTIST_CANDIDATE
+            ):
+                continue
+            candidates.append((similarity_title + similarity_artist, searched_track))
+
+        # The sort is stable, so the order of Genius is kept between equally similar candidates
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        return [searched_track for _, searched_track in candidates]
+
+    def fetch_lyrics(self, search_title: str) -> str:
+        """Fetch the lyrics of the track from Genius.
+
+        If a song was matched to the track by a search of its artist, its lyrics are fetched first.
+        Otherwise, or if they are discarded, use `wrap-genius` to search for a track on Genius
+        based on its title and artist, rank the results, and fetch the lyrics of the best candidate.
+
+        Args:
+            search_title (str): Title of the track used to search it.
 
-        # Remove unwanted text from the title that would probably make the search fail
-        search_title = self.track.get_title()
-        for re_unwanted_text in UNWANTED_TITLE_TEXT:
-            search_title = re_unwanted_text.sub("", search_title)
-        search_title = search_title.strip()
+        Returns:
+            str: Formatted lyrics, or an empty string if no correct lyrics were found.
+
+        Raises:
+            Exception: If the request to Genius failed.
+        """
+        if self.song is not None:
+            lyrics = self.fetch_candidates([self.song])
+            if lyrics != "":
+                return lyrics
 
         # Search for the track
         search = f"{search_title} {self.track.get_main_artist()}"
-        try:
-            searched_tracks = self.genius.search(search)
-        except Exception as exception:
-            log.error(
-                "Unexpected exception while searching for the track '%s': %s",
+        candidates = self.rank_candidates(
+            search_title, self.track.get_main_artist(), self.genius.search(search)
+        )
+        if len(candidates) == 0:
+            log.warning(
+                "Track '%s' by %s not found on Genius",
                 self.track.get_title(),
-                exception,
+                self.track.get_main_artist(),
             )
-            return False
+            return ""
 
-        for _ in range(MAX_SEARCH_INDEX):
-            # Select the next result of the search
-            try:
-                searched_track = next(searched_tracks)
-            except StopIteration:
-                log.warning(
-                    "Track '%s' by %s not found on Genius",
-                    self.track.get_title(),
-                    self.track.get_main_artist(),
-                )
-                return False
+        return self.fetch_candidates(candidates)
 
-            searched_lyrics = searched_track.lyrics
-            if not self.check_lyrics(searched_track, searched_lyrics):
-                continue
+    def fetch_candidates(self, candidates: list[genius.api.Song]) -> str:
+        """Fetch the lyrics of the `candidates` until correct ones are found.
+
+        Args:
+            candidates (list[genius.api.Song]): Candidates, from the best to the worst.
 
+        Returns:
+            str: Formatted lyrics, or an empty string if no correct lyrics were found.
+
+        Raises:
+            Exception: If the request to Genius failed.
+        """
+        for searched_track in candidates[:MAX_SEARCH_INDEX]:
+            html = self.genius.get_page(searched_track.url)
             try:
-                self.track.set_lyrics_new(
-                    self.format_lyrics(self.track.get_title(), searched_lyrics)
-                )
-                break
+                searched_lyrics, lyrics = self.genius.executor.submit(
+                    extract_lyrics, html, self.track.get_title()
+                ).result()
             except DiscardLyrics as exception:
                 log.error(exception)
                 continue
+            if self.check_lyrics(searched_lyrics):
+                return lyrics
 
-        return True
+        return ""
 
-    def check_lyrics(
-        self, searched_track: genius.api.Song, searched_lyrics: list[str]
-    ) -> bool:
+    def check_lyrics(self, searched_lyrics: list[str]) -> bool:
         """Check for issues in the lyrics of the track.
 
         Args:
-            searched_track (genius.api.Song): Track that was searched.
             searched_lyrics (list[str]): Lyrics of the track that was searched.
 
         Returns:
             bool: If the lyrics seem correct.
         """
-        # The track's artist indicates it should be discarded
-        if searched_track.artist.name in DISCARD_ARTISTS:
+        # The lyrics could not be fetched
+        if len(searched_lyrics) == 0:
             log.error(
-                "Discarded the lyrics because the artist was '%s' for the track '%s'",
-                searched_track.artist.name,
+                "Discarded the lyrics because they could not be fetched for the track '%s'",
                 self.track.get_title(),
             )
             return False
@@ -258,3 +704,361 @@ class WorkerSearchLyrics(QtCore.QRunnable):
         lyrics = RE_REMOVE_LINES.sub("\n\n", lyrics)
         lyrics = lyrics.strip()
         return lyrics
+
+
+def extract_lyrics(html: str, title: str) -> tuple[list[str], str]:
+    """Extract the lyrics from the `html` of the page of a song, and format them.
+
+    Run by the pool of processes of the Genius client, since parsing the page is CPU-bound.
+
+    Args:
+        html (str): HTML of the page of the song.
+        title (str): Title of the track.
+
+    Returns:
+        tuple[list[str], str]: Lines of the lyrics, to check them, and formatted lyrics.
+
+    Raises:
+        DiscardLyrics: If the lyrics should be discarded.
+    """
+    searched_lyrics = GeniusClient.parse_lyrics(html)
+    # The lines are formatted in place, so a copy is formatted to keep them intact
+    lyrics = WorkerSearchLyrics.format_lyrics(title, list(searched_lyrics))
+    return searched_lyrics, lyrics
+
+
+class WorkerMatchSongsSignals(QtCore.QObject):
+    """Signals for `WorkerMatchSongs`.
+
+    Signals:
+        signal_songs_matched (object): Emitted when the songs have been matched to the tracks.
+    """
+
+    signal_songs_matched = QtCore.Signal(object)
+
+
+class WorkerMatchSongs(QtCore.QRunnable):
+    """Worker to match songs listed on Genius to many tracks at once, instead of searching each track.
+
+    The songs are matched by the `matcher`, which defines how they are listed on Genius.
+    The tracks that are not matched are searched individually afterward by `WorkerSearchLyrics`.
+
+    Attributes:
+        matcher (SongsMatcher): Matcher of the songs to the tracks.
+        signals (WorkerMatchSongsSignals): Signals of the worker.
+    """
+
+    def __init__(self, matcher: SongsMatcher) -> None:
+        """Init WorkerMatchSongs.
+
+        Args:
+            matcher (SongsMatcher): Matcher of the songs to the tracks.
+        """
+        super().__init__()
+
+        self.matcher: SongsMatcher = matcher
+        self.signals = WorkerMatchSongsSignals()
+
+    def run(self):
+        """Run WorkerMatchSongs."""
+        self.matcher.match()
+        self.signals.signal_songs_matched.emit(self)
+
+
+class SongsMatcher(ABC):
+    """Base strategy to match songs listed on Genius to many tracks sharing the same main artist.
+
+    Attributes:
+        MIN_SEARCHES (int): Minimum number of searches for matching the songs to be worth it.
+        stop_search (bool): If the search should be stopped.
+        genius (GeniusClient): Genius client shared by the workers.
+        groups (dict[tuple[str, str], list[Track]]): Tracks to match, grouped by search key.
+        artist (str): Main artist of the tracks.
+        gtagger (GTagger): GTagger application.
+        songs (dict[tuple[str, str], genius.api.Song]): Song matched to each search key.
+        requests (int): Number of requests sent to Genius to match the songs.
+        requests_saved (int): Number of searches on Genius saved by matching the songs at once.
+    """
+
+    MIN_SEARCHES: int = 1
+
+    def __init__(
+        self,
+        genius_client: GeniusClient,
+        groups: dict[tuple[str, str], list[Track]],
+        gtagger: GTagger,
+    ) -> None:
+        """Init SongsMatcher.
+
+        Args:
+            genius_client (GeniusClient): Genius client shared by the workers.
+            groups (dict[tuple[str, str], list[Track]]): Tracks to match, grouped by search key.
+                The tracks must share the same main artist.
+            gtagger (GTagger): GTagger application.
+        """
+        self.stop_search = False
+        self.genius: GeniusClient = genius_client
+        self.groups: dict[tuple[str, str], list[Track]] = groups
+        self.artist: str = next(iter(groups.values()))[0].main_artist
+        self.gtagger: GTagger = gtagger
+        self.songs: dict[tuple[str, str], genius.api.Song] = {}
+        self.requests: int = 0
+        self.requests_saved: int = 0
+
+    def match(self) -> None:
+        """Match the songs to the tracks of which the lyrics are not cached, if there are enough of them."""
+        if self.stop_search:
+            return
+
+        # The tracks of which the lyrics are cached don't need to be matched
+        keys = {
+            key[0]: key
+            for key in self.groups
+            if self.gtagger.lyrics_cache.load(*key) is None
+        }
+        if len(keys) >= self.MIN_SEARCHES:
+            try:
+                self.match_songs(keys)
+            except SearchCancelled:
+                # The songs matched before the search was stopped are kept
+                pass
+            except Exception as exception:
+                log.error(
+                    "Unexpected exception while matching the songs of '%s': %s",
+                    self.artist,
+                    exception,
+                )
+            # Matching can send more requests than songs it matched, which saves nothing
+            self.requests_saved = max(0, len(self.songs) - self.requests)
+
+    @abstractmethod
+    def match_songs(self, keys: dict[str, tuple[str, str]]) -> None:
+        """Match the songs to the search `keys`.
+
+        Args:
+            keys (dict[str, tuple[str, str]]): Search keys to match, by normalized search title.
+
+        Raises:
+            Exception: If a request to Genius failed.
+        """
+
+    @staticmethod
+    def match_title(
+        title: str, songs: dict[str, genius.api.Song]
+    ) -> Optional[genius.api.Song]:
+        """Return the song of which the title is the most similar to the `title`.
+
+        Args:
+            title (str): Normalized search title.
+            songs (dict[str, genius.api.Song]): Songs, by normalized title.
+
+        Returns:
+            genius.api.Song | None: Most similar song, or `None` if no song is similar enough.
+        """
+        if title in songs:
+            return songs[title]
+
+        best_similarity = 0.0
+        best_song = None
+        for song_title, song in songs.items():
+            similarity = get_similarity(title, song_title)
+            if (
+                similarity >= MIN_SIMILARITY_TITLE_CANDIDATE
+                and similarity > best_similarity
+            ):
+                best_similarity = similarity
+                best_song = song
+        return best_song
+
+
+class ArtistSongsMatcher(SongsMatcher):
+    """Matcher of the songs of an artist to many tracks at once.
+
+    The artist is searched once, and their songs are listed from the most to the least popular
+    until every track is matched by its title.
+    """
+
+    MIN_SEARCHES = MIN_SEARCHES_ARTIST
+
+    def search_artist(self) -> Optional[int]:
+        """Search the artist on Genius.
+
+        Returns:
+            int | None: ID of the artist, or `None` if they were not found.
+        """
+        self.requests += 1
+        best_similarity = 0.0
+        artist_id = None
+        for searched_track in self.genius.search(self.artist):
+            similarity = get_similarity(self.artist, searched_track.artist.name)
+            if (
+                similarity >= MIN_SIMILARITY_ARTIST_CANDIDATE
+                and similarity > best_similarity
+            ):
+                best_similarity = similarity
+                artist_id = searched_track.artist.id
+        return artist_id
+
+    def match_songs(self, keys: dict[str, tuple[str, str]]) -> None:
+        """Match the songs of the artist to the search `keys`.
+
+        The songs are listed page by page, from the most to the least popular, until every key is matched.
+        The songs are first matched by their normalized title, then the keys left are matched by similarity.
+
+        Args:
+            keys (dict[str, tuple[str, str]]): Search keys to match, by normalized search title.
+
+        Raises:
+            Exception: If a request to Genius failed.
+        """
+        artist_id = self.search_artist()
+        if artist_id is None:
+            log.warning("Artist '%s' not found on Genius", self.artist)
+            return
+
+        songs: dict[str, genius.api.Song] = {}
+        for page in range(1, MAX_PAGES_ARTIST + 1):
+            if self.stop_search or len(self.songs) == len(keys):
+                break
+            page_songs = list(
+                self.genius.get_artist_songs(
+                    artist_id, page=page, per_page=SIZE_PAGE_ARTIST, sort="popularity"
+                )
+            )
+            self.requests += 1
+            for song in page_songs:
+                title = normalize(clean_title(song.title))
+                songs.setdefault(title, song)
+                if title in keys:
+                    self.songs.setdefault(keys[title], song)
+            if len(page_songs) < SIZE_PAGE_ARTIST:
+                break
+
+        for title, key in keys.items():
+            if key not in self.songs:
+                song = self.match_title(title, songs)
+                if song is not None:
+                    self.songs[key] = song
+
+
+class AlbumSongsMatcher(SongsMatcher):
+    """Matcher of the tracklist of an album to its tracks at once.
+
+    A track of the album is searched, then its album is looked up on Genius to get the tracklist.
+    The songs of the tracklist are assigned to the tracks by their title, or by their position
+    if their title is only roughly similar.
+
+    Attributes:
+        album (str): Album of the tracks.
+    """
+
+    MIN_SEARCHES = MIN_SEARCHES_ALBUM
+
+    def __init__(
+        self,
+        genius_client: GeniusClient,
+        groups: dict[tuple[str, str], list[Track]],
+        gtagger: GTagger,
+    ) -> None:
+        """Init AlbumSongsMatcher.
+
+        Args:
+            genius_client (GeniusClient): Genius client shared by the workers.
+            groups (dict[tuple[str, str], list[Track]]): Tracks to match, grouped by search key.
+                The tracks must share the same album and main artist.
+            gtagger (GTagger): GTagger application.
+        """
+        super().__init__(genius_client, groups, gtagger)
+
+        self.album: str = next(iter(groups.values()))[0].album
+
+    def search_album(self, keys: dict[str, tuple[str, str]]) -> Optional[int]:
+        """Search the album on Genius, through the first tracks of the album.
+
+        Args:
+            keys (dict[str, tuple[str, str]]): Search keys to match, by normalized search title.
+
+        Returns:
+            int | None: ID of the album, or `None` if it was not found.
+        """
+        album = normalize(clean_title(self.album))
+        for key in list(keys.values())[:ATTEMPTS_ALBUM]:
+            search_title = WorkerSearchLyrics.get_search_title(self.groups[key][0])
+            self.requests += 1
+            candidates = WorkerSearchLyrics.rank_candidates(
+                search_title,
+                self.artist,
+                self.genius.search(f"{search_title} {self.artist}"),
+            )
+            if len(candidates) == 0:
+                continue
+
+            # The album is only returned with the full song
+            self.requests += 1
+            song = self.genius.api.get_song(candidates[0].id)
+            if song is None or song.get("album") is None:
+                continue
+            if (
+                get_similarity(album, normalize(clean_title(song["album"]["name"])))
+                >= MIN_SIMILARITY_TITLE_CANDIDATE
+            ):
+                return song["album"]["id"]
+        return None
+
+    def get_tracklist(self, album_id: int) -> list[tuple[int, genius.api.Song]]:
+        """Return the tracklist of the album.
+
+        Args:
+            album_id (int): ID of the album.
+
+        Returns:
+            list[tuple[int, genius.api.Song]]: Position (0 if unknown) and song of each track of the album.
+
+        Raises:
+            Exception: If a request to Genius failed.
+        """
+        tracklist = []
+        page = 1
+        while not self.stop_search:
+            page_tracks = self.genius.api.get_album_songs(
+                album_id, page=page, per_page=SIZE_PAGE_ALBUM
+            )
+            self.requests += 1
+            tracklist += [
+                (track.get("number") or 0, genius.api.Song(self.genius, track["song"]))
+                for track in page_tracks
+            ]
+            if len(page_tracks) < SIZE_PAGE_ALBUM:
+                break
+            page += 1
+        return tracklist
+
+    def match_songs(self, keys: dict[str, tuple[str, str]]) -> None:
+        """Match the tracklist of the album to the search `keys`.
+
+        Args:
+            keys (dict[str, tuple[str, str]]): Search keys to match, by normalized search title.
+
+        Raises:
+            Exception: If a request to Genius failed.
+        """
+        album_id = self.search_album(keys)
+        if album_id is None:
+            log.warning("Album '%s' by %s not found on Genius", self.album, self.artist)
+            return
+
+        tracklist = self.get_tracklist(album_id)
+        songs = {normalize(clean_title(song.title)): song for _, song in tracklist}
+        positions = {position: song for position, song in tracklist if position > 0}
+        for title, key in keys.items():
+            song = songs.get(title)
+            if song is None:
+                # The song at the position of the track is accepted with a roughly similar title
+                song = positions.get(self.groups[key][0].track_number)
+                if song is None or (
+                    get_similarity(title, normalize(clean_title(song.title)))
+                    < MIN_SIMILARITY_POSITION_ALBUM
+                ):
+                    song = self.match_title(title, songs)
+            if song is not None:
+                self.songs[key] = song
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
+import locale
 import logging as log
 import os
 import re
 import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 import mutagen
 from mutagen.flac import Picture as FLACPicture
@@ -17,25 +19,40 @@ from mutagen.id3._frames import USLT
 from mutagen.mp3 import MPEGInfo as MP3Info
 from PySide6 import QtCore, QtGui
 
-from src.consts import SIZE_COVER, SPLITTERS
-from src.enums import CustomColors, FileType
-from src.icons import get_icon
+from src.consts import ASPECT_RATIO_COVER, SIZE_COVER, SPLITTERS
+from src.enums import FileType
 
 
 class Track(QtCore.QObject):
     """Represents a music track.
 
+    The tags needed by GTagger are read once and kept in memory (or restored from the scan cache),
+    so that the file only needs to be opened by `mutagen` again when the lyrics are saved.
+
     Signals:
         signal_lyrics_changed (QtCore.QObject): Emitted when the lyrics of the track are changed.
 
     Attributes:
         filepath (Path): Filepath of the track.
         filename (str): Filename of the track.
-        cover (QtGui.QPixmap): Cover of the track.
+        size (int): Size of the file in bytes when its tags were read.
+        mtime (int): Modification time of the file in nanoseconds when its tags were read.
+        file_type (FileType): Type of the file.
+        title (str): Title of the track.
         artists (list[str]): Artists of the track.
         main_artist (str): Main artist of the track.
+        album (str): Album of the track.
+        track_number (int): Position of the track in its album, or 0 if it is not set.
+        duration (float): Duration of the track in seconds.
+        lyrics_original (str): Original lyrics of the track read by `mutagen`.
+        cover (QtGui.QImage | None): Cover of the track, or `None` if the track doesn't have one.
+        cover_hash (str): Hash of the cover data, or an empty string if the track doesn't have a cover.
         lyrics_new (str): New lyrics of the track.
-        self.file (mutagen.FileType): File read by `mutagen`, containing tags and metadata.
+        sort_title (str): Key used to sort the track by title.
+        sort_artists (str): Key used to sort the track by artists.
+        sort_album (str): Key used to sort the track by album.
+        file (mutagen.FileType | None): File read by `mutagen`, containing tags and metadata.
+            Only loaded when needed.
     """
 
     signal_lyrics_changed = QtCore.Signal(QtCore.QObject)
@@ -50,11 +67,42 @@ class Track(QtCore.QObject):
 
         self.filepath: Path = filepath
         self.filename: str = os.path.basename(filepath)
-        self.cover: QtGui.QPixmap
+        self.size: int = 0
+        self.mtime: int = 0
+        self.file_type: FileType = FileType.NOT_SUPPORTED
+        self.title: str = ""
         self.artists: list[str] = []
         self.main_artist: str = ""
+        self.album: str = ""
+        self.track_number: int = 0
+        self.duration: float = 0
+        self.lyrics_original: str = ""
+        self.cover: Optional[QtGui.QImage] = None
+        self.cover_hash: str = ""
         self.lyrics_new: str = ""
-        self.file: mutagen.FileType
+        self.sort_title: str = ""
+        self.sort_artists: str = ""
+        self.sort_album: str = ""
+        self.file: Optional[mutagen.FileType] = None
+
+    def read_stat(self) -> bool:
+        """Read the size and modification time of the file.
+
+        Returns:
+            bool: If the size and modification time were successfully read.
+        """
+        try:
+            stat = os.stat(self.filepath)
+        except OSError as exception:
+            log.error(
+                "Error while accessing the file '%s' : %s",
+                self.filename,
+                str(exception),
+            )
+            return False
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime_ns
+        return True
 
     def read_tags(self) -> bool:
         """Use mutagen to read the tags from the file and sets them.
@@ -76,28 +124,60 @@ class Track(QtCore.QObject):
             return False
 
         try:
+            self.file_type = self.read_file_type()
+            self.duration = self.file.info.length
+
             # Cover
+            # A `QImage` is used because the tags can be read outside of the GUI thread, where `QPixmap` is not safe
             if self.has_pictures():
                 # The track has a cover
                 picture = self.get_picture()
-                cover = QtGui.QPixmap()
+                cover = QtGui.QImage()
                 cover.loadFromData(picture.data)
+                self.cover = cover.scaled(
+                    SIZE_COVER,
+                    SIZE_COVER,
+                    ASPECT_RATIO_COVER,
+                )
+                self.cover_hash = hashlib.sha1(picture.data).hexdigest()
             else:
-                # The track doesn't have a cover, build the placeholder
-                icon_cover: QtGui.QIcon = get_icon(
-                    "image-off", color=CustomColors.LIGHT_GREY.value
+                # The track doesn't have a cover, the placeholder is built by the GUI
+                self.cover = None
+                self.cover_hash = ""
+
+            # Title, album, track number and lyrics
+            if self.file_type == FileType.FLAC:
+                self.title = (
+                    self.file.tags["title"][0] if "title" in self.file.tags else ""
                 )
-                cover = icon_cover.pixmap(
-                    icon_cover.actualSize(QtCore.QSize(SIZE_COVER, SIZE_COVER))
+                self.album = (
+                    self.file.tags["album"][0] if "album" in self.file.tags else ""
                 )
-            self.cover = cover.scaled(
-                SIZE_COVER,
-                SIZE_COVER,
-                QtCore.Qt.AspectRatioMode.KeepAspectRatio,
-            )
+                self.track_number = (
+                    self.parse_track_number(self.file.tags["tracknumber"][0])
+                    if "tracknumber" in self.file.tags
+                    else 0
+                )
+                if "lyrics" in self.file.tags and len(self.file.tags["lyrics"]) > 0:
+                    self.lyrics_original = self.file.tags["lyrics"][0]
+            elif self.file.tags is not None:
+                self.title = (
+                    self.file.tags["TIT2"].text[0] if "TIT2" in self.file.tags else ""
+                )
+                self.album = (
+                    self.file.tags["TALB"].text[0] if "TALB" in self.file.tags else ""
+                )
+                self.track_number = (
+                    self.parse_track_number(self.file.tags["TRCK"].text[0])
+                    if "TRCK" in self.file.tags
+                    else 0
+                )
+                uslt = self.get_uslt()
+                if uslt is not None and len(uslt.text) > 0:
+                    self.lyrics_original = uslt.text
 
             # Artists: all and main
-            if self.get_file_type() == FileType.FLAC:
+            if self.file_type == FileType.FLAC:
                 if "artist" in self.file.tags:
                     self.artists = re.split(SPLITTERS, self.file.tags["artist"][0])
                     self.main_artist = self.artists[0]
@@ -115,6 +195,52 @@ class Track(QtCore.QObject):
 
         return True
 
+    @staticmethod
+    def parse_track_number(text: str) -> int:
+        """Parse the track number tag, in the format `N` or `N/TOTAL`.
+
+        Args:
+            text (str): Value of the tag.
+
+        Returns:
+            int: Track number, or 0 if it could not be parsed.
+        """
+        try:
+            return int(text.split("/")[0])
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def get_collation_key(text: str) -> str:
+        """Return the key used to sort the `text`, ignoring its case and according to the locale.
+
+        Args:
+            text (str): Text to sort.
+
+        Returns:
+            str: Collation key of the text.
+        """
+        return locale.strxfrm(text.casefold())
+
+    def compute_sort_keys(self) -> None:
+        """Compute the keys used to sort the track.
+
+        They are computed once when the tags are read, so that sorting the tracks only compares these keys.
+        """
+        self.sort_title = self.get_collation_key(self.title)
+        self.sort_artists = self.get_collation_key(", ".join(self.artists))
+        self.sort_album = self.get_collation_key(self.album)
+
+    def get_file(self) -> mutagen.FileType:
+        """Return the file read by `mutagen`, opening it if it was not already.
+
+        Returns:
+            mutagen.FileType: File read by `mutagen`.
+        """
+        if self.file is None:
+            self.file = mutagen.File(self.filepath)
+        return self.file
+
     def get_filepath(self) -> str:
         """Return the path to the file.
 
@@ -131,7 +257,7 @@ class Track(QtCore.QObject):
         Returns:
             str: Formatted duration of the track
         """
-        duration = time.gmtime(round(self.file.info.length))
+        duration = time.gmtime(round(self.duration))
         return time.strftime("%M:%S", duration)
 
     def get_title(self) -> str:
@@ -140,16 +266,10 @@ class Track(QtCore.QObject):
         Returns:
             str: Title of the track.
         """
-        if self.get_file_type() == FileType.FLAC:
-            if "title" in self.file.tags:
-                return self.file.tags["title"][0]
-            else:
-                return "No title"
+        if self.title == "":
+            return "No title"
         else:
-            if self.file.tags is not None and "TIT2" in self.file.tags:
-                return self.file.tags["TIT2"].text[0]
-            else:
-                return "No title"
+            return self.title
 
     def get_artists(self) -> str:
         """Return the artists of the track, or "No artist(s)" if the artists are not set.
@@ -179,16 +299,10 @@ class Track(QtCore.QObject):
         Returns:
             str: Album of the track.
         """
-        if self.get_file_type() == FileType.FLAC:
-            if "album" in self.file.tags:
-                return self.file.tags["album"][0]
-            else:
-                return "No album"
+        if self.album == "":
+            return "No album"
         else:
-            if self.file.tags is not None and "TALB" in self.file.tags:
-                return self.file.tags["TALB"].text[0]
-            else:
-                return "No album"
+            return self.album
 
     def get_picture(self) -> Union[FLACPicture, MP3Picture]:
         """Return the first picture of the track.
@@ -215,6 +329,14 @@ class Track(QtCore.QObject):
     def get_file_type(self) -> FileType:
         """Return the type of the file.
 
+        Returns:
+            FileType: Type of the file.
+        """
+        return self.file_type
+
+    def read_file_type(self) -> FileType:
+        """Return the type of the file read by `mutagen`.
+
         Returns:
             FileType: Type of the file.
         """
@@ -265,10 +387,7 @@ class Track(QtCore.QObject):
             str: Original lyrics of the track.
         """
         if self.has_lyrics_original():
-            if self.get_file_type() == FileType.FLAC:
-                return self.file.tags["lyrics"][0]
-            else:
-                return self.get_uslt().text
+            return self.lyrics_original
         else:
             return "No lyrics"
 
@@ -284,20 +403,51 @@ class Track(QtCore.QObject):
         self.lyrics_new = lyrics
         self.signal_lyrics_changed.emit(self)
 
-    def save_lyrics(self) -> bool:
+    def has_lyrics_to_save(self) -> bool:
+        """Return if the track has new lyrics that are not the same as the lyrics already in its file.
+
+        Returns:
+            bool: If the lyrics of the track need to be saved.
+        """
+        return self.has_lyrics_new() and self.lyrics_new != self.lyrics_original
+
+    def write_lyrics(
+        self, padding: Optional[Callable[[mutagen.PaddingInfo], int]] = None
+    ) -> None:
+        """Write the new lyrics to the file.
+
+        Args:
+            padding (Callable[[mutagen.PaddingInfo], int] | None): Function returning the padding
+                to keep after the tags, or `None` to use the default padding of `mutagen`. Defaults to `None`.
+
+        Raises:
+            Exception: Any error raised by `mutagen`, or by the `padding` function.
+        """
+        file = self.get_file()
+        if self.get_file_type() == FileType.FLAC:
+            file.tags["lyrics"] = self.lyrics_new
+        else:
+            file.tags.delall("USLT")
+            file.tags.add(USLT(text=self.lyrics_new))
+        file.save(padding=padding)
+
+    def save_lyrics(
+        self, padding: Optional[Callable[[mutagen.PaddingInfo], int]] = None
+    ) -> bool:
         """Save the lyrics to the file.
 
+        The file is not written if the new lyrics are the same as the lyrics it already contains.
+
+        Args:
+            padding (Callable[[mutagen.PaddingInfo], int] | None): Function returning the padding
+                to keep after the tags, or `None` to use the default padding of `mutagen`. Defaults to `None`.
+
         Returns:
             bool: If the lyrics were successfully saved.
         """
-        if self.has_lyrics_new():
+        if self.has_lyrics_to_save():
             try:
-                if self.get_file_type() == FileType.FLAC:
-                    self.file.tags["lyrics"] = self.lyrics_new
-                else:
-                    self.file.tags.delall("USLT")
-                    self.file.tags.add(USLT(text=self.lyrics_new))
-                self.file.save()
+                self.write_lyrics(padding)
             except Exception as exception:
                 log.error(
                     "Error while saving the lyrics of file '%s' : %s",
@@ -307,20 +457,36 @@ class Track(QtCore.QObject):
                 return False
         return True
 
+    def has_changed(self) -> bool:
+        """Return if the file changed since its tags were read, according to its size and modification time.
+
+        Returns:
+            bool: If the file changed, or if it cannot be accessed anymore.
+        """
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return True
+        return stat.st_size != self.size or stat.st_mtime_ns != self.mtime
+
+    def lyrics_saved(self) -> bool:
+        """Update the tags kept in memory after the new lyrics were saved, without parsing the file again.
+
+        Only the lyrics, size and modification time of the file are changed by the save.
+
+        Returns:
+            bool: If the size and modification time were successfully read.
+        """
+        self.lyrics_original = self.lyrics_new
+        return self.read_stat()
+
     def has_lyrics_original(self) -> bool:
         """Return If the track has original lyrics read by `mutagen`.
 
         Returns:
             bool: If the track has original lyrics.
         """
-        if self.get_file_type() == FileType.FLAC:
-            return "lyrics" in self.file.tags and len(self.file.tags["lyrics"]) > 0
-        else:
-            return (
-                self.file.tags is not None
-                and self.get_uslt() is not None
-                and len(self.get_uslt().text) > 0
-            )
+        return self.lyrics_original != ""
 
     def has_lyrics_new(self) -> bool:
         """Return If the track has new lyrics.
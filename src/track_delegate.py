@@ -0,0 +1,411 @@
+"""Delegate painting the information of a track."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from src.consts import (
+    LINES_LYRICS,
+    MARGIN_TRACK_LAYOUT,
+    PADDING_TRACK_LAYOUT,
+    SIZE_COVER,
+    SIZE_ICON,
+    SIZE_ICON_INDICATOR,
+    SPACING_TRACK_LAYOUT,
+)
+from src.enums import CustomColors, State
+from src.icons import get_icon
+from src.track import Track
+from src.tracks_list import TracksModel
+
+if TYPE_CHECKING:
+    from gtagger import GTagger
+
+
+class TrackRects:
+    """Geometry of the elements of a track layout.
+
+    Attributes:
+        frame (QtCore.QRect): Frame of the track.
+        play (QtCore.QRect): Button to play the track.
+        filename (QtCore.QRect): Filename of the track.
+        cover (QtCore.QRect): Cover of the track.
+        title (QtCore.QRect): Title of the track.
+        artists (QtCore.QRect): Artists of the track.
+        album (QtCore.QRect): Album of the track.
+        duration (QtCore.QRect): Duration of the track.
+        lyrics (QtCore.QRect): Lyrics of the track.
+        button_lyrics (QtCore.QRect): Button to show the full lyrics.
+        button_copy (QtCore.QRect): Button to copy the lyrics.
+    """
+
+    def __init__(self, rect: QtCore.QRect) -> None:
+        """Init TrackRects.
+
+        Args:
+            rect (QtCore.QRect): Rectangle of the item.
+        """
+        self.frame = rect.adjusted(0, 0, -MARGIN_TRACK_LAYOUT, -MARGIN_TRACK_LAYOUT)
+        content = self.frame.adjusted(
+            PADDING_TRACK_LAYOUT,
+            PADDING_TRACK_LAYOUT,
+            -PADDING_TRACK_LAYOUT,
+            -PADDING_TRACK_LAYOUT,
+        )
+
+        # Columns: cover and information, lyrics, buttons
+        width_buttons = SIZE_ICON + 2 * SPACING_TRACK_LAYOUT
+        width_information = max(
+            SIZE_COVER, (content.width() - width_buttons) * 2 // 5 - SIZE_COVER
+        )
+        left_information = content.left() + SIZE_COVER + SPACING_TRACK_LAYOUT
+        left_lyrics = left_information + width_information + SPACING_TRACK_LAYOUT
+        left_buttons = content.right() - width_buttons + 1
+
+        self.play = QtCore.QRect(
+            content.left(), content.top(), SIZE_ICON_INDICATOR, SIZE_ICON_INDICATOR
+        )
+        self.filename = QtCore.QRect(
+            self.play.right() + SPACING_TRACK_LAYOUT,
+            content.top(),
+            left_lyrics - self.play.right() - 2 * SPACING_TRACK_LAYOUT,
+            SIZE_ICON_INDICATOR,
+        )
+
+        top_body = content.top() + SIZE_ICON_INDICATOR + SPACING_TRACK_LAYOUT
+        self.cover = QtCore.QRect(content.left(), top_body, SIZE_COVER, SIZE_COVER)
+        height_line = SIZE_COVER // 4
+        self.title = QtCore.QRect(
+            left_information, top_body, width_information, height_line
+        )
+        self.artists = self.title.translated(0, height_line)
+        self.album = self.artists.translated(0, height_line)
+        self.duration = self.album.translated(0, height_line)
+
+        self.lyrics = QtCore.QRect(
+            left_lyrics,
+            content.top(),
+            left_buttons - left_lyrics - SPACING_TRACK_LAYOUT,
+            content.height(),
+        )
+        height_button = content.height() // 2
+        self.button_lyrics = QtCore.QRect(
+            left_buttons, content.top(), width_buttons, height_button
+        )
+        self.button_copy = self.button_lyrics.translated(0, height_button)
+
+
+class TrackDelegate(QtWidgets.QStyledItemDelegate):
+    """Delegate painting the information of a track.
+
+    Only the visible tracks are painted, so that the cost of the list doesn't grow with the number of tracks.
+    It paints the same information as the former track layout: state indicator, filename, cover,
+    title, artists, album, duration, lyrics and the buttons to show and copy them.
+
+    Signals:
+        signal_show_lyrics (str, str): Emitted when the user clicks on the button to show the full lyrics.
+
+    Attributes:
+        gtagger (GTagger): GTagger application.
+        icons_play (dict[State, QtGui.QIcon]): Icons of the state indicator.
+        icon_lyrics (QtGui.QIcon): Icon of the button to show the full lyrics.
+        icon_copy (QtGui.QIcon): Icon of the button to copy the lyrics.
+        cover_placeholder (QtGui.QPixmap): Cover shown when the track doesn't have one.
+    """
+
+    signal_show_lyrics = QtCore.Signal(str, str)
+
+    def __init__(self, gtagger: GTagger) -> None:
+        """Init TrackDelegate.
+
+        Args:
+            gtagger (GTagger): GTagger application.
+        """
+        super().__init__()
+
+        self.gtagger: GTagger = gtagger
+        self.icons_play: dict[State, QtGui.QIcon] = {
+            state: get_icon(
+                "play-circle", color=state.value.value, color_active=state.value.value
+            )
+            for state in State
+        }
+        self.icon_lyrics: QtGui.QIcon = get_icon("eye")
+        self.icon_copy: QtGui.QIcon = get_icon(
+            "content-copy", color_active=CustomColors.LIGHT_GREEN.value
+        )
+        icon_cover = get_icon("image-off", color=CustomColors.LIGHT_GREY.value)
+        self.cover_placeholder: QtGui.QPixmap = icon_cover.pixmap(
+            icon_cover.actualSize(QtCore.QSize(SIZE_COVER, SIZE_COVER))
+        ).scaled(
+            SIZE_COVER,
+            SIZE_COVER,
+            QtCore.Qt.AspectRatioMode.KeepAspectRatio,
+        )
+
+    @staticmethod
+    def get_font(
+        font: QtGui.QFont, point_size: int, weight: QtGui.QFont.Weight
+    ) -> QtGui.QFont:
+        """Return a copy of the `font` with the `point_size` and `weight`.
+
+        Args:
+            font (QtGui.QFont): Font to copy.
+            point_size (int): Point size of the font.
+            weight (QtGui.QFont.Weight): Weight of the font.
+
+        Returns:
+            QtGui.QFont: Font with the `point_size` and `weight`.
+        """
+        font = QtGui.QFont(font)
+        font.setPointSize(point_size)
+        font.setWeight(weight)
+        return font
+
+    def sizeHint(
+        self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex
+    ) -> QtCore.QSize:
+        """Return the size of a track.
+
+        All the tracks have the same size.
+
+        Args:
+            option (QtWidgets.QStyleOptionViewItem): Style options of the item.
+            index (QtCore.QModelIndex): Index of the track.
+
+        Returns:
+            QtCore.QSize: Size of the track.
+        """
+        height_lyrics = LINES_LYRICS * option.fontMetrics.lineSpacing()
+        height_body = SIZE_ICON_INDICATOR + SPACING_TRACK_LAYOUT + SIZE_COVER
+        height = (
+            max(height_lyrics, height_body)
+            + 2 * PADDING_TRACK_LAYOUT
+            + MARGIN_TRACK_LAYOUT
+        )
+        return QtCore.QSize(option.rect.width(), height)
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> None:
+        """Paint the track at `index`.
+
+        Args:
+            painter (QtGui.QPainter): Painter of the view.
+            option (QtWidgets.QStyleOptionViewItem): Style options of the item.
+            index (QtCore.QModelIndex): Index of the track.
+        """
+        track: Track = index.data(TracksModel.ROLE_TRACK)
+        state: State = index.data(TracksModel.ROLE_STATE)
+        selected: bool = index.data(TracksModel.ROLE_SELECTED)
+        rects = TrackRects(option.rect)
+        color_text = option.palette.color(QtGui.QPalette.ColorRole.Text)
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+
+        # Frame
+        path = QtGui.QPainterPath()
+        path.addRoundedRect(
+            QtCore.QRectF(rects.frame).adjusted(0.5, 0.5, -0.5, -0.5), 4, 4
+        )
+        if selected:
+            painter.fillPath(path, QtGui.QColor(CustomColors.DARK_BLUE.value))
+        painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Mid))
+        painter.drawPath(path)
+
+        # State indicator and filename
+        self.icons_play[state].paint(painter, rects.play)
+        painter.setFont(option.font)
+        painter.setPen(color_text)
+        self.draw_text(painter, rects.filename, track.filename)
+
+        # Cover
+        if track.cover is not None:
+            cover_rect = QtCore.QRect(QtCore.QPoint(0, 0), track.cover.size())
+            cover_rect.moveCenter(rects.cover.center())
+            painter.drawImage(cover_rect, track.cover)
+        else:
+            cover_rect = QtCore.QRect(
+                QtCore.QPoint(0, 0),
+                self.cover_placeholder.deviceIndependentSize().toSize(),
+            )
+            cover_rect.moveCenter(rects.cover.center())
+            painter.drawPixmap(cover_rect, self.cover_placeholder)
+
+        # Information
+        painter.setFont(self.get_font(option.font, 15, QtGui.QFont.Weight.ExtraBold))
+        self.draw_text(painter, rects.title, track.get_title())
+        painter.setFont(self.get_font(option.font, 12, QtGui.QFont.Weight.DemiBold))
+        self.draw_text(painter, rects.artists, track.get_artists())
+        painter.setFont(self.get_font(option.font, 11, QtGui.QFont.Weight.Normal))
+        self.draw_text(painter, rects.album, track.get_album())
+        font_duration = QtGui.QFont(option.font)
+        font_duration.setItalic(True)
+        painter.setFont(font_duration)
+        self.draw_text(painter, rects.duration, track.get_duration())
+
+        # Lyrics
+        painter.setFont(option.font)
+        if track.has_lyrics_new():
+            painter.setPen(QtGui.QColor(CustomColors.LIGHT_GREEN.value))
+        painter.setClipRect(rects.lyrics)
+        painter.drawText(
+            rects.lyrics,
+            QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter,
+            track.get_lyrics(lines=LINES_LYRICS),
+        )
+        painter.setClipping(False)
+
+        # Buttons
+        mode = (
+            QtGui.QIcon.Mode.Normal if track.has_lyrics() else QtGui.QIcon.Mode.Disabled
+        )
+        self.icon_lyrics.paint(
+            painter, self.get_button_rect(rects.button_lyrics), mode=mode
+        )
+        self.icon_copy.paint(
+            painter, self.get_button_rect(rects.button_copy), mode=mode
+        )
+
+        painter.restore()
+
+    @staticmethod
+    def draw_text(painter: QtGui.QPainter, rect: QtCore.QRect, text: str) -> None:
+        """Draw the `text` in the `rect`, elided if it is too long.
+
+        Args:
+            painter (QtGui.QPainter): Painter of the view.
+            rect (QtCore.QRect): Rectangle in which to draw the text.
+            text (str): Text to draw.
+        """
+        text = painter.fontMetrics().elidedText(
+            text, QtCore.Qt.TextElideMode.ElideRight, rect.width()
+        )
+        painter.drawText(
+            rect,
+            QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
+            text,
+        )
+
+    @staticmethod
+    def get_button_rect(rect: QtCore.QRect) -> QtCore.QRect:
+        """Return the rectangle of the icon of a button.
+
+        Args:
+            rect (QtCore.QRect): Rectangle of the button.
+
+        Returns:
+            QtCore.QRect: Rectangle of the icon.
+        """
+        icon_rect = QtCore.QRect(0, 0, SIZE_ICON, SIZE_ICON)
+        icon_rect.moveCenter(rect.center())
+        return icon_rect
+
+    def editorEvent(
+        self,
+        event: QtCore.QEvent,
+        model: QtCore.QAbstractItemModel,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> bool:
+        """Intercept the mouse events on a track.
+
+        Enables the user to play the track, show or copy its lyrics with the buttons,
+        and to (de)select the track by clicking anywhere else.
+
+        Args:
+            event (QtCore.QEvent): Event.
+            model (QtCore.QAbstractItemModel): Model of the tracks.
+            option (QtWidgets.QStyleOptionViewItem): Style options of the item.
+            index (QtCore.QModelIndex): Index of the track.
+
+        Returns:
+            bool: If the event was handled.
+        """
+        if event.type() != QtCore.QEvent.Type.MouseButtonRelease:
+            return False
+        # The event can only be a QMouseEvent
+        if event.button() != QtCore.Qt.MouseButton.LeftButton:  # type: ignore
+            return False
+
+        track: Track = index.data(TracksModel.ROLE_TRACK)
+        position = event.position().toPoint()  # type: ignore
+        rects = TrackRects(option.rect)
+        if rects.play.contains(position):
+            self.play(track)
+        elif rects.button_lyrics.contains(position) or rects.button_copy.contains(
+            position
+        ):
+            if track.has_lyrics() and rects.button_lyrics.contains(position):
+                self.signal_show_lyrics.emit(track.get_lyrics(), track.get_title())
+            elif track.has_lyrics():
+                self.copy_lyrics(track)
+        elif rects.frame.contains(position):
+            model.toggle_selection(track)  # type: ignore
+        return True
+
+    def helpEvent(
+        self,
+        event: QtGui.QHelpEvent,
+        view: QtWidgets.QAbstractItemView,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> bool:
+        """Show the tooltips of the elements of a track.
+
+        Args:
+            event (QtGui.QHelpEvent): Help event.
+            view (QtWidgets.QAbstractItemView): View of the tracks.
+            option (QtWidgets.QStyleOptionViewItem): Style options of the item.
+            index (QtCore.QModelIndex): Index of the track.
+
+        Returns:
+            bool: If the event was handled.
+        """
+        if event.type() != QtCore.QEvent.Type.ToolTip or not index.isValid():
+            return super().helpEvent(event, view, option, index)
+
+        track: Track = index.data(TracksModel.ROLE_TRACK)
+        rects = TrackRects(option.rect)
+        tooltips = [
+            (rects.play, "Play the track in the default application"),
+            (rects.filename, track.get_filepath()),
+            (rects.title, track.get_title()),
+            (rects.artists, track.get_artists()),
+            (rects.album, track.get_album()),
+            (rects.button_lyrics, "Show the full lyrics"),
+            (rects.button_copy, "Copy the lyrics to the clipboard"),
+        ]
+        for rect, tooltip in tooltips:
+            if rect.contains(event.pos()):
+                QtWidgets.QToolTip.showText(event.globalPos(), tooltip, view, rect)
+                return True
+
+        QtWidgets.QToolTip.hideText()
+        event.ignore()
+        return True
+
+    @staticmethod
+    def play(track: Track) -> None:
+        """Play the `track` in the default application.
+
+        Args:
+            track (Track): Track to play.
+        """
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(track.filepath))
+
+    @staticmethod
+    def copy_lyrics(track: Track) -> None:
+        """Copy the lyrics of the `track` to the clipboard.
+
+        Args:
+            track (Track): Track of which to copy the lyrics.
+        """
+        clipboard = QtWidgets.QApplication.clipboard()
+        clipboard.setText(track.get_lyrics())
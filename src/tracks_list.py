@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import bisect
+from itertools import compress
+from operator import attrgetter
 from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
 
 from PySide6 import QtCore, QtWidgets
 
+from src.consts import MAX_RANGES_FILTER_TRACKS
+from src.enums import Sort, SortField, State
+from src.search_index import SearchIndex
+from src.track import Track
 
-class CustomListWidget(QtWidgets.QListWidget):
-    """Custom implementation of a `QListWidget` accepting files and directories drop events.
+
+class CustomListView(QtWidgets.QListView):
+    """Custom implementation of a `QListView` accepting files and directories drop events.
 
     Signals:
         dropped_elements (list): Elements (files or directories) were dropped.
@@ -17,10 +26,16 @@ class CustomListWidget(QtWidgets.QListWidget):
     dropped_elements = QtCore.Signal(list)
 
     def __init__(self):
-        """Init CustomListWidget."""
+        """Init CustomListView."""
         super().__init__()
 
         self.setAcceptDrops(True)
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(
+            QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel
+        )
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
 
     def dragEnterEvent(self, event: QtCore.QEvent.Type.DragEnter):
         """Intercept the drag enter event.
@@ -61,34 +76,537 @@ class CustomListWidget(QtWidgets.QListWidget):
             event.ignore()
 
 
-class CustomListWidgetItem(QtWidgets.QListWidgetItem):
-    """Custom implementation of a `QListWidgetItem` containing the title of the track.
+class TracksModel(QtCore.QAbstractListModel):
+    """Model of the list of tracks.
+
+    All the tracks are kept sorted (in ascending order) along with their sort key,
+    so that a new track is inserted at its place with a binary search instead of sorting the whole list.
+    The sort keys are built from the collation keys computed once per track when it is read,
+    so that changing the sort field is a single key-based sort of the tracks.
+    `rows` contains the tracks that pass the filter, in the same order.
+    The descending order is obtained by reading `rows` backwards.
+
+    The state and selection of the tracks are kept by the model and painted by the delegate.
+    The selected tracks, the tracks with new lyrics and the selected tracks with new lyrics are kept in sets
+    updated on each change, so that the actions depending on them are toggled without scanning the tracks.
+
+    When the filter changes, only the rows that appear or disappear are inserted or removed,
+    so that the view keeps its position and doesn't lay out every row again.
+
+    Signals:
+        signal_counters_changed (): Emitted when the selected tracks or the tracks with new lyrics changed.
 
     Attributes:
-        title (str): Title of the track used for comparison.
+        tracks (list[Track]): All the tracks, sorted in ascending order.
+        keys (list[Any]): Sort keys of `tracks`.
+        rows (list[Track]): Tracks that pass the filter, sorted in ascending order.
+        rows_keys (list[Any]): Sort keys of `rows`.
+        states (dict[Track, State]): State of each track.
+        selected (set[Track]): Selected tracks.
+        lyrics_new (set[Track]): Tracks with new lyrics that differ from the lyrics of their files, not saved yet.
+            Saving the lyrics only goes through these tracks.
+        selected_lyrics_new (set[Track]): Selected tracks with new lyrics to save.
+        sort (Sort): Sort mode of the tracks.
+        sort_field (SortField): Field by which the tracks are sorted.
+        sort_key (Callable[[Track], tuple]): Function building the sort key of a track.
+        filter (Callable[[Track], bool] | None): Filter that the tracks must pass to be shown,
+            or `None` to show all of them.
+        search_index (SearchIndex): Index of the tracks used to filter them by text.
     """
 
-    def __init__(self, title: str, listview: QtWidgets.QListWidget | None = ...):
-        """Init CustomListWidgetItem.
+    ROLE_TRACK = QtCore.Qt.ItemDataRole.UserRole
+    ROLE_STATE = QtCore.Qt.ItemDataRole.UserRole + 1
+    ROLE_SELECTED = QtCore.Qt.ItemDataRole.UserRole + 2
+
+    # Order of the states when sorting by state
+    ORDER_STATES = {state: order for order, state in enumerate(State)}
+
+    signal_counters_changed = QtCore.Signal()
+
+    def __init__(self) -> None:
+        """Init TracksModel."""
+        super().__init__()
+
+        self.tracks: list[Track] = []
+        self.keys: list[Any] = []
+        self.rows: list[Track] = []
+        self.rows_keys: list[Any] = []
+        self.states: dict[Track, State] = {}
+        self.selected: set[Track] = set()
+        self.lyrics_new: set[Track] = set()
+        self.selected_lyrics_new: set[Track] = set()
+        self.sort: Sort = Sort.ASCENDING
+        self.sort_field: SortField = SortField.TITLE
+        self.sort_key: Callable[[Track], tuple] = self.get_sort_key_function()
+        self.filter: Optional[Callable[[Track], bool]] = None
+        self.search_index: SearchIndex = SearchIndex()
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """Return the number of tracks shown.
+
+        Args:
+            parent (QtCore.QModelIndex): Parent index. Defaults to an invalid index.
+
+        Returns:
+            int: Number of tracks shown.
+        """
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def data(
+        self,
+        index: QtCore.QModelIndex,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        """Return the data of the track at `index` for the `role`.
+
+        Args:
+            index (QtCore.QModelIndex): Index of the track.
+            role (int): Role of the data. Defaults to `DisplayRole`.
+
+        Returns:
+            Any: Data of the track.
+        """
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+
+        track = self.get_track(index.row())
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return track.get_title()
+        if role == self.ROLE_TRACK:
+            return track
+        if role == self.ROLE_STATE:
+            return self.states[track]
+        if role == self.ROLE_SELECTED:
+            return track in self.selected
+        return None
+
+    def get_sort_key_function(self) -> Callable[[Track], tuple]:
+        """Return the function building the key used to sort a track according to the sort field.
+
+        The tracks are then sorted by title, and by artists if they have the same title.
+
+        Returns:
+            Callable[[Track], tuple]: Function building the sort key of a track.
+        """
+        if self.sort_field == SortField.ARTISTS:
+            return attrgetter("sort_artists", "sort_title")
+        if self.sort_field == SortField.ALBUM:
+            return attrgetter("sort_album", "sort_title", "sort_artists")
+        if self.sort_field == SortField.DURATION:
+            return attrgetter("duration", "sort_title", "sort_artists")
+        if self.sort_field == SortField.STATE:
+            states = self.states
+            order_states = self.ORDER_STATES
+            return lambda track: (
+                order_states[states[track]],
+                track.sort_title,
+                track.sort_artists,
+            )
+        return attrgetter("sort_title", "sort_artists")
+
+    def get_sort_key(self, track: Track) -> tuple:
+        """Return the key used to sort the `track` according to the sort field.
+
+        Args:
+            track (Track): Track to sort.
+
+        Returns:
+            tuple: Sort key of the track.
+        """
+        return self.sort_key(track)
+
+    def get_track(self, row: int) -> Track:
+        """Return the track shown at `row`.
+
+        Args:
+            row (int): Row of the track.
+
+        Returns:
+            Track: Track shown at `row`.
+        """
+        if self.sort == Sort.ASCENDING:
+            return self.rows[row]
+        return self.rows[len(self.rows) - 1 - row]
+
+    def get_row(self, position: int) -> int:
+        """Return the row at which the track at `position` in `rows` is shown.
+
+        Args:
+            position (int): Position of the track in `rows`.
+
+        Returns:
+            int: Row of the track.
+        """
+        if self.sort == Sort.ASCENDING:
+            return position
+        return len(self.rows) - 1 - position
+
+    def find_position(self, track: Track) -> int:
+        """Return the position of the `track` in `rows`, or -1 if it is not shown.
+
+        Args:
+            track (Track): Track to find.
+
+        Returns:
+            int: Position of the track in `rows`.
+        """
+        key = self.get_sort_key(track)
+        position = bisect.bisect_left(self.rows_keys, key)
+        while position < len(self.rows) and self.rows_keys[position] == key:
+            if self.rows[position] is track:
+                return position
+            position += 1
+        return -1
+
+    def get_index(self, track: Track) -> QtCore.QModelIndex:
+        """Return the index of the `track`, or an invalid index if it is not shown.
+
+        Args:
+            track (Track): Track to find.
+
+        Returns:
+            QtCore.QModelIndex: Index of the track.
+        """
+        position = self.find_position(track)
+        if position < 0:
+            return QtCore.QModelIndex()
+        return self.index(self.get_row(position))
+
+    def is_shown(self, track: Track) -> bool:
+        """Return If the `track` passes the filter.
+
+        Args:
+            track (Track): Track to check.
+
+        Returns:
+            bool: If the track passes the filter.
+        """
+        return self.filter is None or self.filter(track)
+
+    def add_tracks(self, tracks: Iterable[Track]) -> None:
+        """Add the `tracks` at their place.
+
+        Args:
+            tracks (Iterable[Track]): Tracks to add.
+        """
+        for track in tracks:
+            self.states[track] = State.TAGS_READ
+            self.search_index.add_track(track)
+            self.insert_track(track)
+
+    def insert_track(self, track: Track) -> None:
+        """Insert the `track` at its place, and show it if it passes the filter.
+
+        Args:
+            track (Track): Track to insert.
+        """
+        key = self.get_sort_key(track)
+        position = bisect.bisect_right(self.keys, key)
+        self.tracks.insert(position, track)
+        self.keys.insert(position, key)
+
+        if not self.is_shown(track):
+            return
+        position = bisect.bisect_right(self.rows_keys, key)
+        row = position if self.sort == Sort.ASCENDING else len(self.rows) - position
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.rows.insert(position, track)
+        self.rows_keys.insert(position, key)
+        self.endInsertRows()
+
+    def take_track(self, track: Track) -> None:
+        """Take the `track` out of its place, before its sort key changes.
+
+        Args:
+            track (Track): Track to take out.
+        """
+        position = self.find_position(track)
+        if position >= 0:
+            row = self.get_row(position)
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self.rows[position]
+            del self.rows_keys[position]
+            self.endRemoveRows()
+
+        key = self.get_sort_key(track)
+        position = bisect.bisect_left(self.keys, key)
+        while self.tracks[position] is not track:
+            position += 1
+        del self.tracks[position]
+        del self.keys[position]
+
+    def remove_tracks(self, tracks: Iterable[Track]) -> None:
+        """Remove the `tracks`.
+
+        Args:
+            tracks (Iterable[Track]): Tracks to remove.
+        """
+        tracks = set(tracks)
+        if len(tracks) == 0:
+            return
+
+        self.beginResetModel()
+        kept = [
+            (track, key)
+            for track, key in zip(self.tracks, self.keys)
+            if track not in tracks
+        ]
+        self.tracks = [track for track, _ in kept]
+        self.keys = [key for _, key in kept]
+        for track in tracks:
+            self.states.pop(track, None)
+            self.search_index.remove_track(track)
+        self.selected.difference_update(tracks)
+        self.lyrics_new.difference_update(tracks)
+        self.selected_lyrics_new.difference_update(tracks)
+        self.update_rows()
+        self.endResetModel()
+        self.signal_counters_changed.emit()
+
+    def update_rows(self) -> None:
+        """Update the tracks shown according to the filter."""
+        self.rows, self.rows_keys = self.filter_rows()
+
+    def filter_rows(
+        self, shown: Optional[set[Track]] = None
+    ) -> tuple[list[Track], list[Any]]:
+        """Return the tracks that pass the filter and their sort keys.
 
         Args:
-            title (str): Title of the track used for comparison.
-            listview (QtWidgets.QListWidget | None): `QListWidget` to pass to the parent class.
+            shown (set[Track] | None): Tracks that pass the filter if they are already known,
+                to avoid calling it on every track. Defaults to `None`.
+
+        Returns:
+            tuple[list[Track], list[Any]]: Tracks that pass the filter and their sort keys.
         """
-        super().__init__(listview)
+        if self.filter is None:
+            return list(self.tracks), list(self.keys)
 
-        self.title: str = title
+        if shown is None:
+            flags = [self.filter(track) for track in self.tracks]
+        else:
+            flags = [track in shown for track in self.tracks]
+        return list(compress(self.tracks, flags)), list(compress(self.keys, flags))
 
-    def __lt__(self, other: CustomListWidgetItem) -> bool:
-        """Return If the title of this item is lower than the `other`'s one.
+    @staticmethod
+    def get_ranges(
+        flags: Iterable[bool], limit: int
+    ) -> Optional[list[tuple[int, int]]]:
+        """Return the ranges of consecutive positions where the `flags` are set.
 
         Args:
-            other (CustomListWidgetItem): Other item on which to perform the comparison.
+            flags (Iterable[bool]): Flags to group.
+            limit (int): Maximum number of ranges.
 
         Returns:
-            bool: If the title of this item is lower than the `other`'s one.
+            list[tuple[int, int]] | None: First and last positions of each range,
+                or `None` if there are more than `limit` ranges.
+        """
+        ranges = []
+        first = None
+        position = -1
+        for position, flag in enumerate(flags):
+            if flag and first is None:
+                first = position
+            elif not flag and first is not None:
+                if len(ranges) == limit:
+                    return None
+                ranges.append((first, position - 1))
+                first = None
+        if first is not None:
+            if len(ranges) == limit:
+                return None
+            ranges.append((first, position))
+        return ranges
+
+    def set_filter(
+        self,
+        filter_: Optional[Callable[[Track], bool]],
+        shown: Optional[set[Track]] = None,
+    ) -> None:
+        """Set the filter that the tracks must pass to be shown.
+
+        Only the rows that changed are removed and inserted, unless they are scattered in too many ranges,
+        in which case the model is reset.
+
+        Args:
+            filter_ (Callable[[Track], bool] | None): Filter, or `None` to show all the tracks.
+            shown (set[Track] | None): Tracks that pass the filter if they are already known,
+                to avoid calling it on every track. Defaults to `None`.
+        """
+        self.filter = filter_
+        rows, rows_keys = self.filter_rows(shown)
+
+        shown_rows = shown if shown is not None else set(rows)
+        shown_before = set(self.rows)
+        removed = self.get_ranges(
+            (track not in shown_rows for track in self.rows), MAX_RANGES_FILTER_TRACKS
+        )
+        inserted = None
+        if removed is not None:
+            inserted = self.get_ranges(
+                (track not in shown_before for track in rows),
+                MAX_RANGES_FILTER_TRACKS - len(removed),
+            )
+        if inserted is None:
+            self.beginResetModel()
+            self.rows = rows
+            self.rows_keys = rows_keys
+            self.endResetModel()
+            return
+
+        # Remove from the end so that the positions of the next ranges don't change
+        for first, last in reversed(removed):
+            self.beginRemoveRows(
+                QtCore.QModelIndex(),
+                *sorted((self.get_row(first), self.get_row(last))),
+            )
+            del self.rows[first : last + 1]
+            del self.rows_keys[first : last + 1]
+            self.endRemoveRows()
+
+        # Insert from the start so that the tracks before each range are already in place
+        for first, last in inserted:
+            count = last - first + 1
+            if self.sort == Sort.ASCENDING:
+                rows_range = (first, last)
+            else:
+                rows_range = (
+                    len(self.rows) - first,
+                    len(self.rows) - first + count - 1,
+                )
+            self.beginInsertRows(QtCore.QModelIndex(), *rows_range)
+            self.rows[first:first] = rows[first : last + 1]
+            self.rows_keys[first:first] = rows_keys[first : last + 1]
+            self.endInsertRows()
+
+    def set_sort(self, sort: Sort) -> None:
+        """Set the sort mode of the tracks.
+
+        Args:
+            sort (Sort): Sort mode.
         """
-        try:
-            return self.title < other.title
-        except AttributeError:
-            return False
+        if sort == self.sort:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent_indexes = self.persistentIndexList()
+        tracks = [self.get_track(index.row()) for index in persistent_indexes]
+        self.sort = sort
+        self.changePersistentIndexList(
+            persistent_indexes, [self.get_index(track) for track in tracks]
+        )
+        self.layoutChanged.emit()
+
+    def set_sort_field(self, sort_field: SortField) -> None:
+        """Set the field by which the tracks are sorted.
+
+        Args:
+            sort_field (SortField): Sort field.
+        """
+        if sort_field == self.sort_field:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent_indexes = self.persistentIndexList()
+        tracks = [self.get_track(index.row()) for index in persistent_indexes]
+        shown = set(self.rows)
+
+        self.sort_field = sort_field
+        self.sort_key = self.get_sort_key_function()
+        keys = list(map(self.sort_key, self.tracks))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.tracks = [self.tracks[position] for position in order]
+        self.keys = [keys[position] for position in order]
+        self.rows, self.rows_keys = self.filter_rows(shown)
+
+        self.changePersistentIndexList(
+            persistent_indexes, [self.get_index(track) for track in tracks]
+        )
+        self.layoutChanged.emit()
+
+    def set_state(self, track: Track, state: State) -> None:
+        """Set the `state` of the `track`.
+
+        If the tracks are sorted by state, the track is moved to its new place.
+
+        Args:
+            track (Track): Track of which to set the state.
+            state (State): State of the track.
+        """
+        if track not in self.states:
+            return
+        if self.sort_field == SortField.STATE and state != self.states[track]:
+            self.take_track(track)
+            self.states[track] = state
+            self.insert_track(track)
+            return
+        self.states[track] = state
+        self.track_changed(track)
+
+    def track_changed(self, track: Track) -> None:
+        """Signal to the view that the `track` changed and should be painted again.
+
+        Args:
+            track (Track): Track that changed.
+        """
+        index = self.get_index(track)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def toggle_selection(self, track: Track) -> None:
+        """Toggle the selection of the `track`.
+
+        Args:
+            track (Track): Track to (de)select.
+        """
+        if track in self.selected:
+            self.selected.remove(track)
+            self.selected_lyrics_new.discard(track)
+        else:
+            self.selected.add(track)
+            if track in self.lyrics_new:
+                self.selected_lyrics_new.add(track)
+        self.track_changed(track)
+        self.signal_counters_changed.emit()
+
+    def set_selection(self, selected: bool) -> None:
+        """Select or deselect all the tracks.
+
+        Args:
+            selected (bool): If the tracks should be selected.
+        """
+        if selected:
+            self.selected = set(self.tracks)
+            self.selected_lyrics_new = set(self.lyrics_new)
+        else:
+            self.selected = set()
+            self.selected_lyrics_new = set()
+        if len(self.rows) > 0:
+            self.dataChanged.emit(self.index(0), self.index(len(self.rows) - 1))
+        self.signal_counters_changed.emit()
+
+    def lyrics_changed(self, track: Track) -> None:
+        """Update the tracks with new lyrics after the lyrics of the `track` changed.
+
+        Args:
+            track (Track): Track of which the lyrics changed.
+        """
+        if track not in self.states:
+            return
+
+        self.track_changed(track)
+        # New lyrics that are the same as the lyrics of the file don't need to be saved
+        has_lyrics_to_save = track.has_lyrics_to_save()
+        if has_lyrics_to_save == (track in self.lyrics_new):
+            return
+        if has_lyrics_to_save:
+            self.lyrics_new.add(track)
+            if track in self.selected:
+                self.selected_lyrics_new.add(track)
+        else:
+            self.lyrics_new.remove(track)
+            self.selected_lyrics_new.discard(track)
+        self.signal_counters_changed.emit()
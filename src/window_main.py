@@ -6,28 +6,42 @@ Handles the creation of the main window and the interactions with the user.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
+import genius
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from src.consts import (
+    DEADLINE_SHUTDOWN_SEARCH,
+    DELAY_FILTER_TRACKS,
     HEIGHT_PROGRESS_BAR,
-    LINES_LYRICS,
     MARGIN_CENTRAL_WIDGET,
-    MARGIN_TRACK_LAYOUT,
     SIZE_BUTTON,
     SIZE_ICON,
     SIZE_ICON_TOOLBAR,
     URL_TOKEN,
     WIDTH_PROGRESS_BAR,
 )
-from src.enums import CustomColors, FileType, Logo, Settings, Sort, State
+from src.enums import CustomColors, Logo, Settings, Sort, SortField, State
+from src.files import iterate_directory
+from src.genius_client import GeniusClient
 from src.icons import get_icon, get_resource_path
+from src.matching import clean_title, normalize
 from src.popup_lyrics import PopupLyrics
-from src.tag import ThreadReadTracks, WorkerSearchLyrics
+from src.scheduler import SearchScheduler
+from src.search_async import AsyncSearchEngine
+from src.tag import (
+    AlbumSongsMatcher,
+    ArtistSongsMatcher,
+    SongsMatcher,
+    ThreadReadTracks,
+    ThreadSaveTracks,
+    WorkerMatchSongs,
+    WorkerSearchLyrics,
+)
 from src.track import Track
-from src.track_layout import TrackLayout
-from src.tracks_list import CustomListWidget, CustomListWidgetItem
+from src.track_delegate import TrackDelegate
+from src.tracks_list import CustomListView, TracksModel
 from src.window_help import WindowHelp
 from src.window_information import WindowInformation
 from src.window_settings import WindowSettings
@@ -41,16 +55,27 @@ class WindowMain(QtWidgets.QMainWindow):
 
     Attributes:
         gtagger (GTagger): GTagger application.
-        track_layouts_items (dict[Track, tuple[TrackLayout, CustomListWidgetItem]]): Layouts and items containing
-            the information of each track added by the user.
+        model_tracks (TracksModel): Model containing the tracks added by the user.
         window_settings (WindowSettings): Settings window.
         window_information (WindowInformation): Information window.
         window_help (WindowHelp) : Help window.
         popup_lyrics (PopupLyrics): Lyrics popup.
         thread_read_tracks (ThreadReadTracks): Thread to read the tracks.
+        thread_save_tracks (ThreadSaveTracks | None): Thread saving the lyrics of the tracks, while they are saved.
         pool_search_lyrics (QtCore.QThreadPool): Pool to search for the lyrics.
         workers_search_lyrics (list[WorkerSearchLyrics]): Workers to search for the lyrics.
+        workers_match_songs (list[WorkerMatchSongs]): Workers to match the songs of the albums and artists to the tracks.
+        scheduler_search (SearchScheduler): Scheduler of the requests sent to Genius by the workers.
+        genius_client (GeniusClient | None): Genius client shared by the workers, created with the first search.
+        search_engine (AsyncSearchEngine | None): Engine searching for the lyrics with asyncio,
+            created with the first search using it.
+        async_search (bool): If the lyrics of the last search are searched by the engine instead of the pool.
+        requests_saved (int): Number of searches on Genius saved during the last search,
+            by grouping the duplicate tracks and matching the songs of the albums and artists at once.
+        pipeline_search (bool): If the lyrics of the tracks are searched as soon as they are read.
+        tracks_queued (int): Number of tracks queued for the search while they are read.
         sort (Sort): Sort mode for the list of tracks.
+        timer_filter_tracks (QtCore.QTimer): Timer delaying the filtering of the tracks while the user types.
     """
 
     def __init__(self, gtagger: GTagger) -> None:
@@ -64,17 +89,31 @@ class WindowMain(QtWidgets.QMainWindow):
         self.installEventFilter(self)
 
         self.gtagger: GTagger = gtagger
-        self.track_layouts_items: dict[
-            Track, tuple[TrackLayout, CustomListWidgetItem]
-        ] = {}
+        self.model_tracks: TracksModel = TracksModel()
         self.window_settings: WindowSettings = WindowSettings(self, self.gtagger)
         self.window_information: WindowInformation = WindowInformation(self)
         self.window_help: WindowHelp = WindowHelp(self)
         self.popup_lyrics: PopupLyrics = PopupLyrics(self)
         self.thread_read_tracks: ThreadReadTracks
+        self.thread_save_tracks: Optional[ThreadSaveTracks] = None
         self.pool_search_lyrics: QtCore.QThreadPool = QtCore.QThreadPool()
         self.workers_search_lyrics: list[WorkerSearchLyrics] = []
+        self.workers_match_songs: list[WorkerMatchSongs] = []
+        self.scheduler_search: SearchScheduler = SearchScheduler(
+            self.window_settings.spinbox_rate_search.value(),
+            self.window_settings.spinbox_concurrency_search.value(),
+            self.window_settings.spinbox_retries_search.value(),
+        )
+        self.genius_client: Optional[GeniusClient] = None
+        self.search_engine: Optional[AsyncSearchEngine] = None
+        self.async_search: bool = False
+        self.requests_saved: int = 0
+        self.pipeline_search: bool = False
+        self.tracks_queued: int = 0
         self.sort: Sort = Sort.ASCENDING
+        self.timer_filter_tracks: QtCore.QTimer = QtCore.QTimer(self)
+        self.timer_filter_tracks.setSingleShot(True)
+        self.timer_filter_tracks.setInterval(DELAY_FILTER_TRACKS)
 
         self.setup_ui()
 
@@ -186,39 +225,37 @@ class WindowMain(QtWidgets.QMainWindow):
         self.button_filter_lyrics.setFixedSize(SIZE_BUTTON, SIZE_BUTTON)
         self.button_filter_lyrics.setStyleSheet(f"""icon-size: {SIZE_ICON}px""")
 
-        # Title sort
-        self.button_sort_title = QtWidgets.QPushButton()
-        self.button_sort_title.setToolTip("Sort based on title")
-        self.button_sort_title.setFixedSize(SIZE_BUTTON, SIZE_BUTTON)
-        self.button_sort_title.setStyleSheet(f"""icon-size: {SIZE_ICON}px""")
+        # Sort field
+        self.combo_sort_field = QtWidgets.QComboBox()
+        self.combo_sort_field.setToolTip("Sort field")
+        self.combo_sort_field.setFixedHeight(SIZE_BUTTON)
+        for sort_field in SortField:
+            self.combo_sort_field.addItem(sort_field.value, sort_field)
+
+        # Sort order
+        self.button_sort = QtWidgets.QPushButton()
+        self.button_sort.setToolTip("Sort order")
+        self.button_sort.setFixedSize(SIZE_BUTTON, SIZE_BUTTON)
+        self.button_sort.setStyleSheet(f"""icon-size: {SIZE_ICON}px""")
 
         # List of the tracks
-        self.list_tracks = CustomListWidget()
-        self.list_tracks.setSortingEnabled(True)
+        # Only the visible tracks are painted by the delegate
+        self.delegate_tracks = TrackDelegate(self.gtagger)
+        self.list_tracks = CustomListView()
+        self.list_tracks.setModel(self.model_tracks)
+        self.list_tracks.setItemDelegate(self.delegate_tracks)
         self.list_tracks.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
-        self.list_tracks.setStyleSheet(
-            """QListWidget::item {margin-bottom: """
-            + str(MARGIN_TRACK_LAYOUT)
-            + """px; margin-right: """
-            + str(MARGIN_TRACK_LAYOUT)
-            + """px;}"""
-        )
-
-        # Scroll are for the list of tracks
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidget(self.list_tracks)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
 
         # Central widget's layout
         self.layout_widget_central = QtWidgets.QGridLayout()
-        self.layout_widget_central.addWidget(self.input_token, 0, 0, 1, 3)
-        self.layout_widget_central.addWidget(self.button_token, 0, 3, 1, 1)
+        self.layout_widget_central.addWidget(self.input_token, 0, 0, 1, 4)
+        self.layout_widget_central.addWidget(self.button_token, 0, 4, 1, 1)
         self.layout_widget_central.addWidget(self.input_filter_text, 1, 0, 1, 1)
         self.layout_widget_central.addWidget(self.button_filter_case, 1, 1, 1, 1)
         self.layout_widget_central.addWidget(self.button_filter_lyrics, 1, 2, 1, 1)
-        self.layout_widget_central.addWidget(self.button_sort_title, 1, 3, 1, 1)
-        self.layout_widget_central.addWidget(self.scroll_area, 3, 0, 1, 4)
+        self.layout_widget_central.addWidget(self.combo_sort_field, 1, 3, 1, 1)
+        self.layout_widget_central.addWidget(self.button_sort, 1, 4, 1, 1)
+        self.layout_widget_central.addWidget(self.list_tracks, 3, 0, 1, 5)
         self.layout_widget_central.setContentsMargins(MARGIN_CENTRAL_WIDGET)
 
         # Central widget
@@ -268,12 +305,17 @@ class WindowMain(QtWidgets.QMainWindow):
         self.action_help.triggered.connect(self.open_help)
         self.input_token.textChanged.connect(self.token_changed)
         self.button_token.clicked.connect(self.open_token_page)
-        self.input_filter_text.textChanged.connect(self.filter_tracks)
+        self.input_filter_text.textChanged.connect(self.timer_filter_tracks.start)
+        self.timer_filter_tracks.timeout.connect(self.filter_tracks)
         self.button_filter_lyrics.clicked.connect(self.filter_tracks)
         self.button_filter_case.clicked.connect(self.filter_tracks)
-        self.button_sort_title.clicked.connect(self.sort_tracks)
+        self.combo_sort_field.currentIndexChanged.connect(self.sort_field_changed)
+        self.button_sort.clicked.connect(self.sort_tracks)
         self.button_stop_search.clicked.connect(self.stop_search)
+        self.button_stop_search.clicked.connect(self.stop_save)
         self.list_tracks.dropped_elements.connect(self.add_files)
+        self.model_tracks.signal_counters_changed.connect(self.counters_changed)
+        self.delegate_tracks.signal_show_lyrics.connect(self.open_popup_lyrics)
 
     def setup_style(self):
         """Set up the custom colors and icons for diverse elements of the application."""
@@ -304,8 +346,8 @@ class WindowMain(QtWidgets.QMainWindow):
         icon_token = get_icon("launch", color_active=CustomColors.YELLOW_GENIUS.value)
         icon_filter_lyrics = get_icon("file-music-outline")
         icon_filter_case = get_icon("format-letter-case")
-        self.icon_sort_title_ascending = get_icon("sort-alphabetical-ascending")
-        self.icon_sort_title_descending = get_icon("sort-alphabetical-descending")
+        self.icon_sort_ascending = get_icon("sort-ascending")
+        self.icon_sort_descending = get_icon("sort-descending")
         icon_stop_search = get_icon("stop", color=CustomColors.RED.value)
 
         self.action_add_files.setIcon(icon_add_files)
@@ -322,33 +364,20 @@ class WindowMain(QtWidgets.QMainWindow):
         self.button_token.setIcon(icon_token)
         self.button_filter_lyrics.setIcon(icon_filter_lyrics)
         self.button_filter_case.setIcon(icon_filter_case)
-        self.button_sort_title.setIcon(self.icon_sort_title_ascending)
+        self.button_sort.setIcon(self.icon_sort_ascending)
         self.button_stop_search.setIcon(icon_stop_search)
 
-        # Change the cover placeholders and if needed,
-        # as well as the lyrics color
-        for track, layout_item in self.track_layouts_items.items():
-            track_layout = layout_item[0]
-            if not track_layout.selected:
-                track_layout.label_cover.setPixmap(track.cover)
-                if track.lyrics_new != "":
-                    track_layout.label_lyrics.setStyleSheet(
-                        f"color: {CustomColors.LIGHT_GREEN.value}"
-                    )
-                else:
-                    track_layout.label_lyrics.setStyleSheet("")
-
         # Change the color of the token line edit
         self.token_changed()
 
         # Change the color of the links
         self.window_information.set_texts(CustomColors.YELLOW_GENIUS)
 
-    def select_files(self) -> list[Path]:
+    def select_files(self) -> Optional[list[Path]]:
         """Ask the user to select files.
 
         Returns:
-            list[Path]: Paths of the files.
+            Optional[list[Path]]: Paths of the files, or `None` if the user cancelled.
         """
         file_dialog = QtWidgets.QFileDialog()
         files = file_dialog.getOpenFileNames(
@@ -356,20 +385,22 @@ class WindowMain(QtWidgets.QMainWindow):
         )
 
         if len(files[0]) == 0:
-            return []
+            return None
 
         return [Path(file) for file in files[0]]
 
-    def select_directory(self, directory: str = "") -> list[Path]:
+    def select_directory(self, directory: str = "") -> Optional[Iterator[Path]]:
         """Ask the user to select a directory.
 
         `directory` should be an empty string if a button was used, or the path to a directory that was dropped.
 
+        The files of the directory are enumerated lazily, so that they can be read while the directory is walked.
+
         Args:
             directory (str): Path to the directory. Defaults to `""`.
 
         Returns:
-            list[Path]: Paths of the files in the directory.
+            Optional[Iterator[Path]]: Paths of the files in the directory, or `None` if the user cancelled.
         """
         if directory == "":
             # Ask the user to select a directory
@@ -378,16 +409,11 @@ class WindowMain(QtWidgets.QMainWindow):
                 caption="Select directory"
             )
             if directory == "":
-                return []
+                return None
 
-        files: list[Path] = []
-        if self.window_settings.checkbox_recursive.isChecked():
-            for file_type in FileType:
-                files.extend(list(Path(directory).rglob("*." + file_type.value)))
-        else:
-            for file_type in FileType:
-                files.extend(list(Path(directory).glob("*." + file_type.value)))
-        return files
+        return iterate_directory(
+            Path(directory), self.window_settings.checkbox_recursive.isChecked()
+        )
 
     def is_token_valid(self) -> bool:
         """Check to see if the token is in a valid format.
@@ -402,9 +428,13 @@ class WindowMain(QtWidgets.QMainWindow):
         # validate() returns an untyped object
         return validate[0] == QtGui.QValidator.State.Acceptable  # type: ignore
 
-    def increment_progress_bar(self) -> None:
-        """Increments the progress bar by 1."""
-        self.progress_bar.setValue(self.progress_bar.value() + 1)
+    def increment_progress_bar(self, increment: int = 1) -> None:
+        """Increments the progress bar by `increment`.
+
+        Args:
+            increment (int): Value to add to the progress bar. Defaults to 1.
+        """
+        self.progress_bar.setValue(self.progress_bar.value() + increment)
 
     def set_maximum_progress_bar(self, list_: list | dict) -> None:
         """Set the maximum of the progress bar.
@@ -425,7 +455,15 @@ class WindowMain(QtWidgets.QMainWindow):
         Returns:
             bool: If GTagger is searching for lyrics.
         """
-        return len(self.workers_search_lyrics) > 0
+        return len(self.workers_search_lyrics) > 0 or len(self.workers_match_songs) > 0
+
+    def is_saving_lyrics(self) -> bool:
+        """Check if GTagger is saving the lyrics.
+
+        Returns:
+            bool: If GTagger is saving the lyrics.
+        """
+        return self.thread_save_tracks is not None
 
     @QtCore.Slot()
     def add_files(self, paths: list[Path], select_directory: bool = False) -> None:
@@ -438,7 +476,7 @@ class WindowMain(QtWidgets.QMainWindow):
             paths (list[Path]): Paths of the elements to add.
             select_directory (bool): If the user adds a directory. Defaults to `False`.
         """
-        files: list[Path] = []
+        files: Optional[Iterable[Path]] = None
         if len(paths) == 1:
             # On element was dropped
             if paths[0].is_dir():
@@ -446,7 +484,7 @@ class WindowMain(QtWidgets.QMainWindow):
                 files = self.select_directory(str(paths[0]))
             else:
                 # A file was dropped
-                files.extend(paths)
+                files = paths
         elif len(paths) == 0:
             # A button was used
             if select_directory:
@@ -455,80 +493,273 @@ class WindowMain(QtWidgets.QMainWindow):
                 files = self.select_files()
         else:
             # Multiple files were dropped
-            files.extend(path for path in paths if path.is_file())
+            files = [path for path in paths if path.is_file()]
 
-        if len(files) <= 0:
+        if files is None:
             return
 
         self.read_files(files)
 
     @QtCore.Slot()
-    def read_files(self, files: list[Path]) -> None:
+    def read_files(self, files: Iterable[Path]) -> None:
         """Read the information of the `files`.
 
+        The maximum of the progress bar grows as the files are found.
+
         Args:
-            files (list[Path]): Paths of the files to read.
+            files (Iterable[Path]): Paths of the files to read.
         """
         self.progress_bar.reset()
-        self.set_maximum_progress_bar(files)
+        self.progress_bar.setMaximum(0)
+        self.progress_bar.setValue(0)
 
         self.action_add_files.setEnabled(False)
         self.action_add_folder.setEnabled(False)
 
-        self.thread_read_tracks = ThreadReadTracks(files, self.gtagger)
-        self.thread_read_tracks.add_track.connect(self.add_track)
+        self.thread_read_tracks = ThreadReadTracks(
+            files,
+            self.window_settings.spinbox_workers_read.value(),
+            self.gtagger,
+        )
+        # The lyrics can be searched while the files are read, only if a search could be started
+        self.pipeline_search = (
+            self.window_settings.checkbox_pipeline_search.isChecked()
+            and self.is_token_valid()
+            and not self.is_searching_lyrics()
+        )
+        self.tracks_queued = 0
+        if self.pipeline_search:
+            self.prepare_search()
+
+        self.thread_read_tracks.add_tracks.connect(self.add_tracks)
+        self.thread_read_tracks.files_found.connect(self.files_found)
         self.thread_read_tracks.started.connect(self.read_tracks_started)
         self.thread_read_tracks.finished.connect(self.read_tracks_finished)
         self.thread_read_tracks.start()
 
     @QtCore.Slot()
-    def add_track(self, track: Track):
-        """Add the track `track` to the scroll area.
+    def add_tracks(self, tracks: list[Track], read: int) -> None:
+        """Add a batch of `tracks` to the list.
+
+        The list is updated only once for the whole batch.
 
         Args:
-            track (Track): Track to add.
+            tracks (list[Track]): Tracks to add.
+            read (int): Number of files read for this batch, including the ones that were skipped.
         """
-        # Skip the file if the tags could not be read
-        if track is None:
-            self.increment_progress_bar()
-            return
+        self.list_tracks.setUpdatesEnabled(False)
+        for track in tracks:
+            track.signal_lyrics_changed.connect(self.lyrics_changed)
+        self.model_tracks.add_tracks(tracks)
+        self.list_tracks.setUpdatesEnabled(True)
+        self.increment_progress_bar(read)
+        if self.pipeline_search:
+            self.queue_search(tracks)
 
-        # Create the track layout and add it
-        layout = TrackLayout(
-            track,
-            State.TAGS_READ,
-            self.gtagger,
-        )
-        track.signal_lyrics_changed.connect(self.lyrics_changed)
-        layout.signal_mouse_event.connect(self.selection_changed)
-        layout.signal_show_lyrics.connect(self.open_popup_lyrics)
-        item = CustomListWidgetItem(track.get_title(), self.list_tracks)
-        item.setSizeHint(layout.sizeHint())
-        self.list_tracks.addItem(item)
-        self.list_tracks.setItemWidget(item, layout)
-        self.track_layouts_items[track] = (layout, item)
-        self.increment_progress_bar()
+    @QtCore.Slot()
+    def files_found(self, found: int) -> None:
+        """Number of files to read grew.
+
+        The tracks queued for the search while they are read are counted by the progress bar too.
+
+        Args:
+            found (int): Number of files found.
+        """
+        self.progress_bar.setMaximum(found + self.tracks_queued)
+
+    def queue_search(self, tracks: list[Track]) -> None:
+        """Search for the lyrics of the `tracks` that were just read.
+
+        The tracks are searched individually, since the other tracks of their album or artist may not be read yet.
+
+        Args:
+            tracks (list[Track]): Tracks read.
+        """
+        overwrite_lyrics = self.window_settings.checkbox_overwrite.isChecked()
+        groups: dict[tuple[str, str], list[Track]] = {}
+        ungrouped: list[list[Track]] = []
+        for track in tracks:
+            if WorkerSearchLyrics.needs_search(track, overwrite_lyrics):
+                key = WorkerSearchLyrics.get_search_key(track)
+                if key is None:
+                    ungrouped.append([track])
+                else:
+                    groups.setdefault(key, []).append(track)
+
+        for group in [*groups.values(), *ungrouped]:
+            self.tracks_queued += len(group)
+            self.progress_bar.setMaximum(self.progress_bar.maximum() + len(group))
+            self.start_search_lyrics(self.genius_client, group)
 
     @QtCore.Slot()
     def search_lyrics(self) -> None:
         """Search for the lyrics of the files."""
         self.progress_bar.reset()
-        self.set_maximum_progress_bar(self.track_layouts_items)
+        self.set_maximum_progress_bar(self.model_tracks.tracks)
+        genius_client = self.prepare_search()
+
+        # Group the tracks sharing the same search key to search their lyrics only once,
+        # the tracks without a search key are searched alone
+        groups: dict[tuple[str, str], list[Track]] = {}
+        ungrouped: list[list[Track]] = []
+        for track in self.model_tracks.tracks:
+            key = WorkerSearchLyrics.get_search_key(track)
+            if key is None:
+                ungrouped.append([track])
+            else:
+                groups.setdefault(key, []).append(track)
+
+        # The searches of the tracks that need lyrics can be matched at once with the songs listed on Genius
+        overwrite_lyrics = self.window_settings.checkbox_overwrite.isChecked()
+        pending = [
+            key
+            for key, tracks in groups.items()
+            if any(
+                WorkerSearchLyrics.needs_search(track, overwrite_lyrics)
+                for track in tracks
+            )
+        ]
+
+        # Group the searches by album and main artist, to match the tracklists of the albums
+        albums: dict[tuple[str, str], dict[tuple[str, str], list[Track]]] = {}
+        for key in pending:
+            album = normalize(clean_title(groups[key][0].album))
+            if album != "":
+                albums.setdefault((album, key[1]), {})[key] = groups[key]
+        self.start_match_songs(AlbumSongsMatcher, albums.values(), groups)
+
+        # Group the searches left by main artist, to match the songs of the artists
+        artists: dict[str, dict[tuple[str, str], list[Track]]] = {}
+        for key in pending:
+            if key in groups:
+                artists.setdefault(key[1], {})[key] = groups[key]
+        self.start_match_songs(ArtistSongsMatcher, artists.values(), groups)
+
+        for tracks in [*groups.values(), *ungrouped]:
+            self.start_search_lyrics(genius_client, tracks)
+
+    def prepare_search(self) -> GeniusClient:
+        """Prepare a new search for the lyrics with the current settings.
+
+        Returns:
+            GeniusClient: Genius client shared by the workers.
+        """
         self.search_lyrics_started()
 
-        for track, layout_item in self.track_layouts_items.items():
-            layout = layout_item[0]
-            worker = WorkerSearchLyrics(
-                self.input_token.text(),
-                track,
-                layout,
-                self.window_settings.checkbox_overwrite.isChecked(),
-                self.gtagger,
+        self.requests_saved = 0
+        concurrency_search = self.window_settings.spinbox_concurrency_search.value()
+        self.scheduler_search.configure(
+            self.window_settings.spinbox_rate_search.value(),
+            concurrency_search,
+            self.window_settings.spinbox_retries_search.value(),
+            not self.is_searching_lyrics(),
+        )
+        # The workers only wait for the scheduler, so one worker per request in flight is enough
+        self.pool_search_lyrics.setMaxThreadCount(concurrency_search)
+        genius_client = self.get_genius_client()
+        self.async_search = self.window_settings.checkbox_async_search.isChecked()
+        if self.async_search:
+            self.get_search_engine(genius_client)
+        return genius_client
+
+    def start_match_songs(
+        self,
+        matcher_class: type[SongsMatcher],
+        batches: Iterable[dict[tuple[str, str], list[Track]]],
+        groups: dict[tuple[str, str], list[Track]],
+    ) -> None:
+        """Start a worker matching the songs with a `matcher_class` for each batch of searches large enough.
+
+        The searches of these batches are removed from the `groups`, they are started once their songs are matched.
+
+        Args:
+            matcher_class (type[SongsMatcher]): Type of the matchers.
+            batches (Iterable[dict[tuple[str, str], list[Track]]]): Batches of tracks, grouped by search key.
+            groups (dict[tuple[str, str], list[Track]]): Tracks left to search, grouped by search key.
+        """
+        for batch in batches:
+            if len(batch) < matcher_class.MIN_SEARCHES:
+                continue
+            for key in batch:
+                del groups[key]
+            worker = WorkerMatchSongs(
+                matcher_class(self.genius_client, batch, self.gtagger)
             )
-            worker.signals.signal_lyrics_searched.connect(self.lyrics_searched)
-            self.workers_search_lyrics.append(worker)
+            worker.signals.signal_songs_matched.connect(self.songs_matched)
+            self.workers_match_songs.append(worker)
+            self.pool_search_lyrics.start(worker)
+
+    def start_search_lyrics(
+        self,
+        genius_client: GeniusClient,
+        tracks: list[Track],
+        song: Optional[genius.api.Song] = None,
+        stop_search: bool = False,
+    ) -> None:
+        """Start a worker to search for the lyrics of the `tracks`.
+
+        Args:
+            genius_client (GeniusClient): Genius client shared by the workers.
+            tracks (list[Track]): Tracks to search the lyrics for, sharing the same search key.
+            song (genius.api.Song | None): Song already matched to the tracks, if any. Defaults to `None`.
+            stop_search (bool): If the search was stopped. Defaults to `False`.
+        """
+        worker = WorkerSearchLyrics(
+            genius_client,
+            tracks,
+            self.window_settings.checkbox_overwrite.isChecked(),
+            self.gtagger,
+            song,
+        )
+        worker.stop_search = stop_search
+        worker.signals.signal_lyrics_searched.connect(self.lyrics_searched)
+        self.workers_search_lyrics.append(worker)
+        if stop_search:
+            # There is no need to queue a worker that would not search anything
+            self.lyrics_searched(worker)
+        elif self.async_search:
+            self.search_engine.start(worker)
+        else:
             self.pool_search_lyrics.start(worker)
 
+    def get_genius_client(self) -> GeniusClient:
+        """Return the Genius client shared by the workers, creating it if the token or the number of workers changed.
+
+        While a search is running, its client is kept, since closing it would break the requests of its workers.
+        The client is created again with the new settings by the next search.
+
+        Returns:
+            GeniusClient: Genius client.
+        """
+        token = self.input_token.text()
+        pool_size = self.pool_search_lyrics.maxThreadCount()
+        if self.genius_client is not None and self.is_searching_lyrics():
+            return self.genius_client
+        if (
+            self.genius_client is None
+            or self.genius_client.access_token != token
+            or self.genius_client.pool_size != pool_size
+        ):
+            if self.genius_client is not None:
+                self.genius_client.close()
+            self.genius_client = GeniusClient(token, pool_size, self.scheduler_search)
+        return self.genius_client
+
+    def get_search_engine(self, genius_client: GeniusClient) -> AsyncSearchEngine:
+        """Return the engine searching for the lyrics with asyncio, creating it if the Genius client changed.
+
+        Args:
+            genius_client (GeniusClient): Genius client shared by the workers.
+
+        Returns:
+            AsyncSearchEngine: Engine searching for the lyrics.
+        """
+        if self.search_engine is None or self.search_engine.genius is not genius_client:
+            if self.search_engine is not None:
+                self.search_engine.close()
+            self.search_engine = AsyncSearchEngine(genius_client)
+        return self.search_engine
+
     @QtCore.Slot()
     def token_changed(self) -> None:
         """Token changed by the user.
@@ -549,7 +780,9 @@ class WindowMain(QtWidgets.QMainWindow):
                 f"border: 2px solid {CustomColors.LIGHT_GREEN.value}"
             )
             self.input_token.setToolTip("Valid token")
-            self.action_search_lyrics.setEnabled(len(self.track_layouts_items) > 0)
+            self.action_search_lyrics.setEnabled(
+                len(self.model_tracks.tracks) > 0 and not self.is_saving_lyrics()
+            )
         else:
             # Token is not valid
             self.input_token.setStyleSheet(
@@ -560,67 +793,104 @@ class WindowMain(QtWidgets.QMainWindow):
 
     @QtCore.Slot()
     def save_lyrics(self) -> None:
-        """Save the lyrics to the files."""
+        """Save the lyrics to the files.
+
+        Only the tracks with new lyrics are saved, the other files are not touched.
+        The files are saved by a thread, so that the window stays responsive and the save can be stopped.
+        """
+        tracks = list(self.model_tracks.lyrics_new)
+        if self.is_saving_lyrics() or len(tracks) == 0:
+            return
+
         self.progress_bar.reset()
-        self.set_maximum_progress_bar(self.track_layouts_items)
-        for track, layout_item in self.track_layouts_items.items():
-            layout = layout_item[0]
-            saved = track.save_lyrics()
-            if saved:
-                layout.set_state(State.LYRICS_SAVED)
-                track.read_tags()
+        self.set_maximum_progress_bar(tracks)
+
+        self.thread_save_tracks = ThreadSaveTracks(
+            tracks,
+            self.window_settings.spinbox_workers_save.value(),
+            self.window_settings.spinbox_padding_save.value() * 1024,
+            self.gtagger,
+        )
+        self.thread_save_tracks.tracks_saved.connect(self.tracks_saved)
+        self.thread_save_tracks.save_planned.connect(self.save_planned)
+        self.thread_save_tracks.started.connect(self.save_tracks_started)
+        self.thread_save_tracks.finished.connect(self.save_tracks_finished)
+        self.thread_save_tracks.start()
+
+    @QtCore.Slot()
+    def tracks_saved(self, states: dict[Track, State], processed: int) -> None:
+        """Lyrics of a batch of tracks saved.
+
+        Args:
+            states (dict[Track, State]): States of the tracks that were saved or not.
+            processed (int): Number of tracks processed for this batch, including the ones that were skipped.
+        """
+        self.list_tracks.setUpdatesEnabled(False)
+        for track, state in states.items():
+            self.model_tracks.set_state(track, state)
+            if state == State.LYRICS_SAVED:
                 track.set_lyrics_new("")
-                layout.label_lyrics.setText(track.get_lyrics(lines=LINES_LYRICS))
-            else:
-                layout.set_state(State.LYRICS_NOT_SAVED)
-            self.increment_progress_bar()
+        self.list_tracks.setUpdatesEnabled(True)
+        self.increment_progress_bar(processed)
+
+    @QtCore.Slot()
+    def save_planned(self, files_rewritten: int, bytes_rewritten: int) -> None:
+        """Saves of the lyrics planned.
+
+        Show how many files must be rewritten entirely, because their new tags don't fit in their padding.
+
+        Args:
+            files_rewritten (int): Number of files that will be rewritten.
+            bytes_rewritten (int): Number of bytes that will be rewritten.
+        """
+        if files_rewritten > 0:
+            self.status_bar.showMessage(
+                f"{files_rewritten} files rewritten entirely ({bytes_rewritten / 2**20:.1f} MiB)"
+            )
+        else:
+            self.status_bar.showMessage("All the files updated in place")
+
+    @QtCore.Slot()
+    def stop_save(self) -> None:
+        """Stop saving the lyrics.
+
+        The files being saved are written completely, the others are skipped.
+        """
+        if self.is_saving_lyrics():
+            self.button_stop_search.setEnabled(False)
+            self.thread_save_tracks.stop_save = True
 
     @QtCore.Slot()
     def cancel_rows(self) -> None:
         """Remove the added lyrics from the files."""
-        for track, layout_item in self.track_layouts_items.items():
-            layout = layout_item[0]
-            if layout.selected:
-                track.set_lyrics_new("")
-                layout.label_lyrics.setText(track.get_lyrics(lines=LINES_LYRICS))
-                layout.set_state(State.TAGS_READ)
+        for track in self.model_tracks.selected:
+            track.set_lyrics_new("")
+            self.model_tracks.set_state(track, State.TAGS_READ)
 
     @QtCore.Slot()
     def remove_selected_layouts(self) -> None:
         """Remove the selected layouts."""
-        for track, layout_item in self.track_layouts_items.copy().items():
-            layout = layout_item[0]
-            item = layout_item[1]
-            if layout.selected:
-                self.list_tracks.takeItem(self.list_tracks.row(item))
-                self.track_layouts_items.pop(track)
-
-        self.selection_changed()
+        for track in self.model_tracks.selected:
+            track.signal_lyrics_changed.disconnect(self.lyrics_changed)
+        self.model_tracks.remove_tracks(self.model_tracks.selected)
 
-        if len(self.track_layouts_items) == 0:
+        if len(self.model_tracks.tracks) == 0:
             self.action_select.setEnabled(False)
             self.action_deselect.setEnabled(False)
 
     @QtCore.Slot()
-    def selection_changed(self) -> None:
-        """Tracks' selection changed.
+    def counters_changed(self) -> None:
+        """Selected tracks or tracks with new lyrics changed.
 
         Toggle the cancel, remove and save buttons.
         """
-        enable_cancel = False
-        enable_remove = False
-        enable_save = False
-        for track, layout_item in self.track_layouts_items.items():
-            layout = layout_item[0]
-            if layout.selected:
-                enable_remove = True
-            if layout.selected and track.has_lyrics_new():
-                enable_cancel = True
-            if track.has_lyrics_new():
-                enable_save = True
-        self.action_cancel_rows.setEnabled(enable_cancel)
-        self.action_remove_rows.setEnabled(enable_remove)
-        self.action_save_lyrics.setEnabled(enable_save)
+        self.action_cancel_rows.setEnabled(
+            len(self.model_tracks.selected_lyrics_new) > 0
+        )
+        self.action_remove_rows.setEnabled(len(self.model_tracks.selected) > 0)
+        self.action_save_lyrics.setEnabled(
+            len(self.model_tracks.lyrics_new) > 0 and not self.is_saving_lyrics()
+        )
 
     @QtCore.Slot()
     def lyrics_changed(self, track: Track) -> None:
@@ -629,42 +899,42 @@ class WindowMain(QtWidgets.QMainWindow):
         Args:
             track (Track): Track of which lyrics have changed.
         """
-        layout = self.track_layouts_items[track][0]
-        if track.has_lyrics_new():
-            layout.label_lyrics.setStyleSheet(
-                f"color: {CustomColors.LIGHT_GREEN.value}"
-            )
-        else:
-            layout.label_lyrics.setStyleSheet("")
-
-        layout.button_lyrics.setEnabled(track.has_lyrics())
-        layout.button_copy.setEnabled(track.has_lyrics())
-
-        self.selection_changed()
+        self.model_tracks.lyrics_changed(track)
 
     @QtCore.Slot()
     def filter_tracks(self) -> None:
-        """Apply the filters to the track layouts."""
+        """Apply the filters to the tracks.
+
+        The text is searched in the search index of the model, and only the rows that changed are updated.
+        """
         show_lyrics = self.button_filter_lyrics.isChecked()
         match_case = self.button_filter_case.isChecked()
         text = self.input_filter_text.text()
-        if not match_case:
-            text = text.casefold()
+        search_index = self.model_tracks.search_index
+
+        def filter_track(track: Track) -> bool:
+            """Return If the `track` passes the filters.
+
+            Args:
+                track (Track): Track to filter.
+
+            Returns:
+                bool: If the track passes the filters.
+            """
+            if not show_lyrics and track.has_lyrics_original():
+                return False
+            return search_index.matches(track, text, match_case)
 
         # Apply the filters
-        for track, layout_items in self.track_layouts_items.items():
-            item = layout_items[1]
-            visible = False
-            if show_lyrics or not track.has_lyrics_original():
-                if not match_case:
-                    title = track.get_title().casefold()
-                    artists = track.get_artists().casefold()
-                else:
-                    title = track.get_title()
-                    artists = track.get_artists()
-                if text in title or text in artists:
-                    visible = True
-            item.setHidden(not visible)
+        if show_lyrics and text == "":
+            self.model_tracks.set_filter(None)
+        else:
+            shown = {
+                track
+                for track in search_index.search(text, match_case)
+                if show_lyrics or not track.has_lyrics_original()
+            }
+            self.model_tracks.set_filter(filter_track, shown)
 
         # Update the lyrics filter button
         if show_lyrics:
@@ -674,23 +944,65 @@ class WindowMain(QtWidgets.QMainWindow):
 
     @QtCore.Slot()
     def sort_tracks(self) -> None:
-        """Sort the tracks based on their title."""
+        """Reverse the sort order of the tracks."""
         if self.sort == Sort.ASCENDING:
             self.sort = Sort.DESCENDING
-            self.button_sort_title.setIcon(self.icon_sort_title_descending)
-            self.list_tracks.sortItems(QtCore.Qt.SortOrder.DescendingOrder)
+            self.button_sort.setIcon(self.icon_sort_descending)
         elif self.sort == Sort.DESCENDING:
             self.sort = Sort.ASCENDING
-            self.button_sort_title.setIcon(self.icon_sort_title_ascending)
-            self.list_tracks.sortItems(QtCore.Qt.SortOrder.AscendingOrder)
+            self.button_sort.setIcon(self.icon_sort_ascending)
+        self.model_tracks.set_sort(self.sort)
+
+    @QtCore.Slot()
+    def sort_field_changed(self) -> None:
+        """Sort the tracks by the selected field."""
+        self.model_tracks.set_sort_field(self.combo_sort_field.currentData())
 
     @QtCore.Slot()
     def stop_search(self) -> None:
-        """Stop searching for the lyrics."""
+        """Stop searching for the lyrics.
+
+        The workers that have not started yet are removed from the queue, and the requests to Genius
+        that are waiting or in flight are cancelled, so that the running workers stop as soon as possible.
+        """
+        if self.pipeline_search:
+            # The tracks read from now on are not searched
+            self.pipeline_search = False
+            if not self.is_searching_lyrics():
+                self.search_lyrics_finished()
+
         if self.is_searching_lyrics():
             self.button_stop_search.setEnabled(False)
-            for worker in self.workers_search_lyrics:
+            for worker in list(self.workers_match_songs):
+                worker.matcher.stop_search = True
+                if self.pool_search_lyrics.tryTake(worker):
+                    self.songs_matched(worker)
+            for worker in list(self.workers_search_lyrics):
                 worker.stop_search = True
+                if self.pool_search_lyrics.tryTake(worker):
+                    self.lyrics_searched(worker)
+            self.scheduler_search.cancel()
+            if self.genius_client is not None:
+                self.genius_client.abort()
+            if self.search_engine is not None:
+                self.search_engine.cancel()
+
+    @QtCore.Slot()
+    def songs_matched(self, worker: WorkerMatchSongs) -> None:
+        """Songs matched to a batch of tracks.
+
+        Start searching for the lyrics of the tracks, with the songs that were matched to them.
+
+        Args:
+            worker (WorkerMatchSongs): Worker that matched the songs.
+        """
+        self.workers_match_songs.remove(worker)
+        matcher = worker.matcher
+        self.requests_saved += matcher.requests_saved
+        for key, tracks in matcher.groups.items():
+            self.start_search_lyrics(
+                matcher.genius, tracks, matcher.songs.get(key), matcher.stop_search
+            )
 
     @QtCore.Slot()
     def lyrics_searched(self, worker: WorkerSearchLyrics) -> None:
@@ -700,8 +1012,12 @@ class WindowMain(QtWidgets.QMainWindow):
             worker (WorkerSearchLyrics): Worker that searched the lyrics of the track.
         """
         self.workers_search_lyrics.remove(worker)
-        self.increment_progress_bar()
-        if not self.is_searching_lyrics():
+        for track, state in worker.states.items():
+            self.model_tracks.set_state(track, state)
+        self.requests_saved += worker.requests_saved
+        self.increment_progress_bar(len(worker.tracks))
+        # While the files are read, more tracks can still be queued for the search
+        if not self.is_searching_lyrics() and not self.pipeline_search:
             self.search_lyrics_finished()
 
     @QtCore.Slot()
@@ -747,35 +1063,53 @@ class WindowMain(QtWidgets.QMainWindow):
         self.action_select.setEnabled(True)
         self.action_deselect.setEnabled(True)
 
+        if self.pipeline_search:
+            self.pipeline_search = False
+            if not self.is_searching_lyrics():
+                self.search_lyrics_finished()
+
     def search_lyrics_started(self) -> None:
         """Thread searching for the lyrics has started."""
         self.button_stop_search.setEnabled(True)
+        self.button_stop_search.setToolTip("Stop searching")
+        self.status_bar.clearMessage()
 
     def search_lyrics_finished(self) -> None:
         """Thread searching for the lyrics has finished."""
-        self.button_stop_search.setEnabled(False)
+        self.button_stop_search.setEnabled(self.is_saving_lyrics())
+        if self.requests_saved > 0:
+            self.status_bar.showMessage(
+                f"{self.requests_saved} searches on Genius saved"
+            )
+
+    def save_tracks_started(self) -> None:
+        """Thread saving the lyrics has started."""
+        self.action_save_lyrics.setEnabled(False)
+        self.action_search_lyrics.setEnabled(False)
+        self.button_stop_search.setEnabled(True)
+        self.button_stop_search.setToolTip("Stop saving")
+
+    def save_tracks_finished(self) -> None:
+        """Thread saving the lyrics has finished."""
+        self.thread_save_tracks = None
+        self.button_stop_search.setEnabled(self.is_searching_lyrics())
+        self.button_stop_search.setToolTip("Stop searching")
+        self.counters_changed()
+        self.token_changed()
 
     def select_tracks(self) -> None:
         """Select all the tracks."""
-        if len(self.track_layouts_items) == 0:
+        if len(self.model_tracks.tracks) == 0:
             return
 
-        for layout_item in self.track_layouts_items.values():
-            track_layout = layout_item[0]
-            track_layout.toggle_selection(force=True)
-
-        self.selection_changed()
+        self.model_tracks.set_selection(True)
 
     def deselect_tracks(self) -> None:
         """Deselect all the tracks."""
-        if len(self.track_layouts_items) == 0:
+        if len(self.model_tracks.tracks) == 0:
             return
 
-        for layout_item in self.track_layouts_items.values():
-            track_layout = layout_item[0]
-            track_layout.toggle_selection(force=False)
-
-        self.selection_changed()
+        self.model_tracks.set_selection(False)
 
     def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
         """Filter the event to intercept the shortcuts.
@@ -824,10 +1158,33 @@ class WindowMain(QtWidgets.QMainWindow):
         Args:
             event (QtGui.QCloseEvent): Close event.
         """
-        # If the lyrics search is running, stop all workers
+        # If the files are being read, skip the files left and wait for the files being read,
+        # since their tags are stored in the scan cache
+        if self.thread_read_tracks.isRunning():
+            self.thread_read_tracks.stop_read = True
+            self.thread_read_tracks.wait()
+
+        # If the lyrics search is running, stop all workers, without waiting for a stalled connection
         if self.is_searching_lyrics():
             self.stop_search()
-            self.pool_search_lyrics.waitForDone()
+            self.pool_search_lyrics.waitForDone(DEADLINE_SHUTDOWN_SEARCH)
+
+        # If the lyrics are being saved, skip the files left and wait for the files being written
+        if self.is_saving_lyrics():
+            self.stop_save()
+            self.thread_save_tracks.wait()
+
+        # Close the connections to Genius
+        if self.search_engine is not None:
+            self.search_engine.close()
+        if self.genius_client is not None:
+            self.genius_client.close()
+
+        # Commit the tags read since the last commit into the scan cache and evict the tracks in excess
+        self.gtagger.scan_cache.close()
+
+        # Evict the expired lyrics and commit the lyrics found since the last commit into the lyrics cache
+        self.gtagger.lyrics_cache.close()
 
         # Save the toolbar position into the settings
         self.gtagger.settings_manager.set_setting(
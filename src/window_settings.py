@@ -9,6 +9,20 @@ from typing import TYPE_CHECKING
 
 from PySide6 import QtCore, QtWidgets
 
+from src.consts import (
+    DEFAULT_CONCURRENCY_SEARCH,
+    DEFAULT_PADDING_SAVE,
+    DEFAULT_RATE_SEARCH,
+    DEFAULT_RETRIES_SEARCH,
+    DEFAULT_WORKERS_READ,
+    DEFAULT_WORKERS_SAVE,
+    MAX_CONCURRENCY_SEARCH,
+    MAX_PADDING_SAVE,
+    MAX_RATE_SEARCH,
+    MAX_RETRIES_SEARCH,
+    MAX_WORKERS_READ,
+    MAX_WORKERS_SAVE,
+)
 from src.enums import Settings
 
 if TYPE_CHECKING:
@@ -44,6 +58,46 @@ class WindowSettings(QtWidgets.QDialog):
         )
         self.checkbox_recursive.setChecked(recursive_search)
 
+        # Number of workers reading the files
+        self.label_workers_read = QtWidgets.QLabel("Number of files read in parallel")
+        self.spinbox_workers_read = QtWidgets.QSpinBox()
+        self.spinbox_workers_read.setRange(1, MAX_WORKERS_READ)
+        self.spinbox_workers_read.setToolTip(
+            "Increase it for slow storage such as network drives"
+        )
+        workers_read = self.gtagger.settings_manager.get_setting(
+            Settings.WORKERS_READ.value, default=DEFAULT_WORKERS_READ, type_=int
+        )
+        self.spinbox_workers_read.setValue(workers_read)
+
+        # Number of workers saving the files
+        self.label_workers_save = QtWidgets.QLabel(
+            "Number of files saved in parallel per drive"
+        )
+        self.spinbox_workers_save = QtWidgets.QSpinBox()
+        self.spinbox_workers_save.setRange(1, MAX_WORKERS_SAVE)
+        self.spinbox_workers_save.setToolTip(
+            "Decrease it for hard drives, increase it for network drives"
+        )
+        workers_save = self.gtagger.settings_manager.get_setting(
+            Settings.WORKERS_SAVE.value, default=DEFAULT_WORKERS_SAVE, type_=int
+        )
+        self.spinbox_workers_save.setValue(workers_save)
+
+        # Padding reserved when a file is rewritten
+        self.label_padding_save = QtWidgets.QLabel(
+            "Space reserved for later edits (KiB)"
+        )
+        self.spinbox_padding_save = QtWidgets.QSpinBox()
+        self.spinbox_padding_save.setRange(0, MAX_PADDING_SAVE)
+        self.spinbox_padding_save.setToolTip(
+            "When the lyrics don't fit in a file, the whole file is rewritten with this space after its tags"
+        )
+        padding_save = self.gtagger.settings_manager.get_setting(
+            Settings.PADDING_SAVE.value, default=DEFAULT_PADDING_SAVE, type_=int
+        )
+        self.spinbox_padding_save.setValue(padding_save)
+
         # Overwrite lyrics
         self.checkbox_overwrite = QtWidgets.QCheckBox(
             "Overwrite already existing lyrics"
@@ -53,15 +107,88 @@ class WindowSettings(QtWidgets.QDialog):
         )
         self.checkbox_overwrite.setChecked(overwrite_lyrics)
 
+        # Number of requests sent to Genius per second
+        self.label_rate_search = QtWidgets.QLabel("Maximum requests per second")
+        self.spinbox_rate_search = QtWidgets.QSpinBox()
+        self.spinbox_rate_search.setRange(1, MAX_RATE_SEARCH)
+        self.spinbox_rate_search.setToolTip(
+            "Decrease it if Genius throttles the requests"
+        )
+        rate_search = self.gtagger.settings_manager.get_setting(
+            Settings.RATE_SEARCH.value, default=DEFAULT_RATE_SEARCH, type_=int
+        )
+        self.spinbox_rate_search.setValue(rate_search)
+
+        # Number of requests to Genius in flight
+        self.label_concurrency_search = QtWidgets.QLabel("Maximum requests in parallel")
+        self.spinbox_concurrency_search = QtWidgets.QSpinBox()
+        self.spinbox_concurrency_search.setRange(1, MAX_CONCURRENCY_SEARCH)
+        self.spinbox_concurrency_search.setToolTip(
+            "Fewer requests are sent in parallel while Genius is slow or throttles them"
+        )
+        concurrency_search = self.gtagger.settings_manager.get_setting(
+            Settings.CONCURRENCY_SEARCH.value,
+            default=DEFAULT_CONCURRENCY_SEARCH,
+            type_=int,
+        )
+        self.spinbox_concurrency_search.setValue(concurrency_search)
+
+        # Number of retries of the requests to Genius
+        self.label_retries_search = QtWidgets.QLabel("Retries of a failed request")
+        self.spinbox_retries_search = QtWidgets.QSpinBox()
+        self.spinbox_retries_search.setRange(0, MAX_RETRIES_SEARCH)
+        retries_search = self.gtagger.settings_manager.get_setting(
+            Settings.RETRIES_SEARCH.value, default=DEFAULT_RETRIES_SEARCH, type_=int
+        )
+        self.spinbox_retries_search.setValue(retries_search)
+
+        # Search with asyncio
+        self.checkbox_async_search = QtWidgets.QCheckBox(
+            "Search without a thread per request"
+        )
+        self.checkbox_async_search.setToolTip(
+            "Send the requests from a single thread with asyncio, so that more of them can be in flight"
+        )
+        async_search = self.gtagger.settings_manager.get_setting(
+            Settings.ASYNC_SEARCH.value, default=False, type_=bool
+        )
+        self.checkbox_async_search.setChecked(async_search)
+
+        # Search while reading the files
+        self.checkbox_pipeline_search = QtWidgets.QCheckBox(
+            "Search for the lyrics while the files are read"
+        )
+        self.checkbox_pipeline_search.setToolTip(
+            "The tracks are searched individually, without matching the tracklists of their albums"
+        )
+        pipeline_search = self.gtagger.settings_manager.get_setting(
+            Settings.PIPELINE_SEARCH.value, default=False, type_=bool
+        )
+        self.checkbox_pipeline_search.setChecked(pipeline_search)
+
         # Files category
         self.grid_files = QtWidgets.QGridLayout()
-        self.grid_files.addWidget(self.checkbox_recursive, 0, 0, 1, 1)
+        self.grid_files.addWidget(self.checkbox_recursive, 0, 0, 1, 2)
+        self.grid_files.addWidget(self.label_workers_read, 1, 0, 1, 1)
+        self.grid_files.addWidget(self.spinbox_workers_read, 1, 1, 1, 1)
+        self.grid_files.addWidget(self.label_workers_save, 2, 0, 1, 1)
+        self.grid_files.addWidget(self.spinbox_workers_save, 2, 1, 1, 1)
+        self.grid_files.addWidget(self.label_padding_save, 3, 0, 1, 1)
+        self.grid_files.addWidget(self.spinbox_padding_save, 3, 1, 1, 1)
         self.box_files = QtWidgets.QGroupBox("Files")
         self.box_files.setLayout(self.grid_files)
 
         # Lyrics category
         self.grid_lyrics = QtWidgets.QGridLayout()
-        self.grid_lyrics.addWidget(self.checkbox_overwrite, 1, 0, 1, 1)
+        self.grid_lyrics.addWidget(self.checkbox_overwrite, 1, 0, 1, 2)
+        self.grid_lyrics.addWidget(self.label_rate_search, 2, 0, 1, 1)
+        self.grid_lyrics.addWidget(self.spinbox_rate_search, 2, 1, 1, 1)
+        self.grid_lyrics.addWidget(self.label_concurrency_search, 3, 0, 1, 1)
+        self.grid_lyrics.addWidget(self.spinbox_concurrency_search, 3, 1, 1, 1)
+        self.grid_lyrics.addWidget(self.label_retries_search, 4, 0, 1, 1)
+        self.grid_lyrics.addWidget(self.spinbox_retries_search, 4, 1, 1, 1)
+        self.grid_lyrics.addWidget(self.checkbox_async_search, 5, 0, 1, 2)
+        self.grid_lyrics.addWidget(self.checkbox_pipeline_search, 6, 0, 1, 2)
         self.box_lyrics = QtWidgets.QGroupBox("Lyrics")
         self.box_lyrics.setLayout(self.grid_lyrics)
 
@@ -75,6 +202,16 @@ class WindowSettings(QtWidgets.QDialog):
 
         self.checkbox_recursive.stateChanged.connect(self.toggle_recursive_search)
         self.checkbox_overwrite.stateChanged.connect(self.toggle_overwrite_lyrics)
+        self.spinbox_workers_read.valueChanged.connect(self.change_workers_read)
+        self.spinbox_workers_save.valueChanged.connect(self.change_workers_save)
+        self.spinbox_padding_save.valueChanged.connect(self.change_padding_save)
+        self.spinbox_rate_search.valueChanged.connect(self.change_rate_search)
+        self.spinbox_concurrency_search.valueChanged.connect(
+            self.change_concurrency_search
+        )
+        self.spinbox_retries_search.valueChanged.connect(self.change_retries_search)
+        self.checkbox_async_search.stateChanged.connect(self.toggle_async_search)
+        self.checkbox_pipeline_search.stateChanged.connect(self.toggle_pipeline_search)
 
     @QtCore.Slot()
     def toggle_recursive_search(self) -> None:
@@ -90,3 +227,67 @@ class WindowSettings(QtWidgets.QDialog):
         self.gtagger.settings_manager.set_setting(
             Settings.OVERWRITE_LYRICS.value, overwrite_lyrics
         )
+
+    @QtCore.Slot()
+    def change_workers_read(self) -> None:
+        """Update the setting for the number of files read in parallel."""
+        workers_read = self.spinbox_workers_read.value()
+        self.gtagger.settings_manager.set_setting(
+            Settings.WORKERS_READ.value, workers_read
+        )
+
+    @QtCore.Slot()
+    def change_workers_save(self) -> None:
+        """Update the setting for the number of files saved in parallel on each drive."""
+        workers_save = self.spinbox_workers_save.value()
+        self.gtagger.settings_manager.set_setting(
+            Settings.WORKERS_SAVE.value, workers_save
+        )
+
+    @QtCore.Slot()
+    def change_padding_save(self) -> None:
+        """Update the setting for the space reserved after the tags when a file is rewritten."""
+        padding_save = self.spinbox_padding_save.value()
+        self.gtagger.settings_manager.set_setting(
+            Settings.PADDING_SAVE.value, padding_save
+        )
+
+    @QtCore.Slot()
+    def change_rate_search(self) -> None:
+        """Update the setting for the number of requests sent to Genius per second."""
+        rate_search = self.spinbox_rate_search.value()
+        self.gtagger.settings_manager.set_setting(
+            Settings.RATE_SEARCH.value, rate_search
+        )
+
+    @QtCore.Slot()
+    def change_concurrency_search(self) -> None:
+        """Update the setting for the number of requests to Genius in flight."""
+        concurrency_search = self.spinbox_concurrency_search.value()
+        self.gtagger.settings_manager.set_setting(
+            Settings.CONCURRENCY_SEARCH.value, concurrency_search
+        )
+
+    @QtCore.Slot()
+    def change_retries_search(self) -> None:
+        """Update the setting for the number of retries of the requests to Genius."""
+        retries_search = self.spinbox_retries_search.value()
+        self.gtagger.settings_manager.set_setting(
+            Settings.RETRIES_SEARCH.value, retries_search
+        )
+
+    @QtCore.Slot()
+    def toggle_async_search(self) -> None:
+        """Update the setting for searching for the lyrics with asyncio."""
+        async_search = self.checkbox_async_search.isChecked()
+        self.gtagger.settings_manager.set_setting(
+            Settings.ASYNC_SEARCH.value, async_search
+        )
+
+    @QtCore.Slot()
+    def toggle_pipeline_search(self) -> None:
+        """Update the setting for searching for the lyrics while the files are read."""
+        pipeline_search = self.checkbox_pipeline_search.isChecked()
+        self.gtagger.settings_manager.set_setting(
+            Settings.PIPELINE_SEARCH.value, pipeline_search
+        )
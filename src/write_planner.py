@@ -0,0 +1,111 @@
+"""Planner of the writes of the lyrics to the files."""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from mutagen import PaddingInfo
+
+from src.exceptions import SavePlanned
+from src.track import Track
+
+
+class WritePlanner:
+    """Plans the writes of the lyrics to the files, and chooses the padding kept after their tags.
+
+    The tags of MP3 (ID3v2) and FLAC files are followed by some padding, so that they can grow without moving the audio.
+    When the new tags don't fit in the padding, `mutagen` rewrites the whole file,
+    which is slow for large files, especially on network storage.
+
+    A save is planned with a dry run: the tags are rendered by `mutagen` as for a real save,
+    but the padding function stops it before anything is written, with the padding that would be left.
+    The file parsed by the dry run is kept by the track, with the new lyrics already in its tags,
+    so that the real save writes it without parsing it again.
+
+    The padding policy is applied to the real saves:
+    - if the new tags fit, the padding left is kept as is, so that the file is updated in place
+    (`mutagen` would otherwise shrink a large padding, and rewrite the file to do so),
+    - otherwise the file is rewritten anyway, and at least `padding` bytes are reserved so that later edits fit
+    (or the default padding of `mutagen` if it is larger, since it grows with the size of the file).
+
+    The planner can be used by multiple threads.
+
+    Attributes:
+        padding (int): Minimum padding in bytes reserved after the tags when a file is rewritten.
+        lock (threading.Lock): Lock protecting the counters.
+        files_rewritten (int): Number of files planned so far that will be rewritten.
+        bytes_rewritten (int): Number of bytes following the tags of these files, that will be rewritten.
+    """
+
+    def __init__(self, padding: int) -> None:
+        """Init WritePlanner.
+
+        Args:
+            padding (int): Minimum padding in bytes reserved after the tags when a file is rewritten.
+        """
+        self.padding: int = padding
+        self.lock: threading.Lock = threading.Lock()
+        self.files_rewritten: int = 0
+        self.bytes_rewritten: int = 0
+
+    def plan_track(self, track: Track) -> Optional[bool]:
+        """Plan the save of the new lyrics of the `track`, and count it if its file will be rewritten.
+
+        The file is opened by `mutagen` but not written. It is kept for the real save,
+        unless the save could not be planned.
+
+        Args:
+            track (Track): Track to plan.
+
+        Returns:
+            bool | None: If the file can be updated in place, or `None` if the save could not be planned.
+        """
+        if not track.has_lyrics_to_save():
+            return True
+
+        info: Optional[PaddingInfo] = None
+        try:
+            track.write_lyrics(self.stop_save)
+        except SavePlanned as planned:
+            info = planned.info
+        except Exception:
+            # The error is logged by the real save, which opens the file again
+            track.file = None
+            return None
+
+        if info is None:
+            # The padding function was never called, so the save could not be planned
+            track.file = None
+            return None
+        if info.padding >= 0:
+            return True
+        with self.lock:
+            self.files_rewritten += 1
+            self.bytes_rewritten += info.size
+        return False
+
+    @staticmethod
+    def stop_save(info: PaddingInfo) -> int:
+        """Padding function of the dry runs, stopping the save before anything is written.
+
+        Args:
+            info (PaddingInfo): Padding left after the tags and size of the data following them.
+
+        Raises:
+            SavePlanned: Always, with the `info`.
+        """
+        raise SavePlanned(info)
+
+    def get_padding(self, info: PaddingInfo) -> int:
+        """Padding function of the real saves, applying the padding policy.
+
+        Args:
+            info (PaddingInfo): Padding left after the tags and size of the data following them.
+
+        Returns:
+            int: Padding to keep after the tags.
+        """
+        if info.padding >= 0:
+            return info.padding
+        return max(self.padding, info.get_default_padding())
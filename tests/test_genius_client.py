@@ -0,0 +1,52 @@
+"""Tests of the extraction of the lyrics from the pages of the songs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+from genius.scraper import _extract_lyrics
+
+from src.genius_client import GeniusClient
+
+# Pages of songs, with the markup of Genius
+PAGES = sorted((Path(__file__).parent / "fixtures" / "genius").glob("*.html"))
+
+
+def extract_lyrics_tree(html: str) -> list[str]:
+    """Extract the lyrics from the `html` the way `genius.api.Song.lyrics` does, by building the tree of the page.
+
+    Args:
+        html (str): HTML of the page of the song.
+
+    Returns:
+        list[str]: Lines of the lyrics.
+    """
+    soup = BeautifulSoup(html, features="html.parser")
+    lyrics = []
+    for div in soup.find_all("div", attrs={"data-lyrics-container": "true"}):
+        lyrics += _extract_lyrics(div)
+    return "".join(lyrics).replace("е", "e").split("\n")
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+def test_parse_lyrics(page: Path) -> None:
+    html = page.read_text(encoding="utf-8")
+    assert GeniusClient.parse_lyrics(html) == extract_lyrics_tree(html)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+def test_parse_lyrics_chunks(page: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Small chunks, so that the parsing stops and resumes everywhere in the lyrics
+    monkeypatch.setattr("src.genius_client.SIZE_CHUNK_LYRICS", 16)
+    html = page.read_text(encoding="utf-8")
+    assert GeniusClient.parse_lyrics(html) == extract_lyrics_tree(html)
+
+
+def test_parse_lyrics_content() -> None:
+    html = (PAGES[0].parent / "song_referents.html").read_text(encoding="utf-8")
+    lyrics = GeniusClient.parse_lyrics(html)
+    assert lyrics[0] == "[Verse 1]"
+    assert "Harbour lights, don't you fade on me" in lyrics
+    assert "Decoy line in the state" not in lyrics
@@ -0,0 +1,37 @@
+"""Tests of the cleaning of the titles searched."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.matching import clean_title
+
+
+@pytest.mark.parametrize(
+    "title, cleaned_title",
+    [
+        ("Bohemian Rhapsody", "Bohemian Rhapsody"),
+        ("Bohemian Rhapsody - Remastered 2011", "Bohemian Rhapsody"),
+        ("Bohemian Rhapsody - 2011 Remaster", "Bohemian Rhapsody"),
+        ("Song - Radio Edit", "Song"),
+        ("Song - Single Version", "Song"),
+        ("Song - Live at Wembley", "Song"),
+        ("Song [Remastered 2011]", "Song"),
+        ("Song (Live)", "Song"),
+        ("Song (feat. Artist)", "Song"),
+        ("Song (ft. Artist)", "Song"),
+        ("Song (with Artist)", "Song"),
+        ("Song [with The Band]", "Song"),
+        ("Song feat. Artist", "Song"),
+        ("Song (with you)", "Song (with you)"),
+        ("Song (With You)", "Song (With You)"),
+        ("Song (without Artist)", "Song (without Artist)"),
+        ("Mono - No Edit", "Mono - No Edit"),
+        ("Party - 1999", "Party - 1999"),
+        ("Live - Forever Young", "Live - Forever Young"),
+        ("Love Me - Do", "Love Me - Do"),
+        ("(Live)", "(Live)"),
+    ],
+)
+def test_clean_title(title: str, cleaned_title: str) -> None:
+    assert clean_title(title) == cleaned_title
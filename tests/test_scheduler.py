@@ -0,0 +1,64 @@
+"""Tests of the retries of the requests sent through the scheduler."""
+
+from __future__ import annotations
+
+import pytest
+import requests
+
+from src.scheduler import SearchScheduler
+
+
+class FailingSession:
+    """Session of which the requests fail with an exception.
+
+    Attributes:
+        exception (type[requests.RequestException]): Type of the exception raised by the requests.
+        sent (int): Number of requests sent.
+    """
+
+    def __init__(self, exception: type[requests.RequestException]) -> None:
+        """Init FailingSession.
+
+        Args:
+            exception (type[requests.RequestException]): Type of the exception raised by the requests.
+        """
+        self.exception: type[requests.RequestException] = exception
+        self.sent: int = 0
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Fail the request to `url`.
+
+        Args:
+            url (str): URL of the request.
+            **kwargs: Arguments of the request.
+
+        Raises:
+            requests.RequestException: Always.
+        """
+        self.sent += 1
+        raise self.exception(url)
+
+
+def test_connection_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a failed connection is raised at once, without changing the concurrency limit."""
+    monkeypatch.setattr(SearchScheduler, "get_backoff", staticmethod(lambda *_: 0))
+    scheduler = SearchScheduler(100, 8, 3)
+    scheduler.limit = 4
+    session = FailingSession(requests.ConnectionError)
+    with pytest.raises(requests.ConnectionError):
+        scheduler.get(session, "https://genius.com")
+    assert session.sent == 1
+    assert scheduler.limit == 4
+    assert scheduler.in_flight == 0
+
+
+def test_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a request timing out is retried, and decreases the concurrency limit."""
+    monkeypatch.setattr(SearchScheduler, "get_backoff", staticmethod(lambda *_: 0))
+    scheduler = SearchScheduler(100, 8, 3)
+    session = FailingSession(requests.ReadTimeout)
+    with pytest.raises(requests.ReadTimeout):
+        scheduler.get(session, "https://genius.com")
+    assert session.sent == 4
+    assert scheduler.limit < 8
+    assert scheduler.in_flight == 0
@@ -0,0 +1,55 @@
+"""Tests of the search keys grouping the tracks searched together."""
+
+from __future__ import annotations
+
+import types
+from pathlib import Path
+
+from src.tag import WorkerSearchLyrics
+from src.track import Track
+
+
+def create_track(title: str, artist: str) -> Track:
+    """Create a track with the `title` and the main `artist`.
+
+    Args:
+        title (str): Title of the track.
+        artist (str): Main artist of the track, or an empty string if it is not set.
+
+    Returns:
+        Track: Track created.
+    """
+    track = Track(Path(f"/music/{artist}/{title}.mp3"))
+    track.title = title
+    track.artists = [artist] if artist != "" else []
+    track.main_artist = artist
+    return track
+
+
+def test_search_key_duplicates() -> None:
+    """Check that the versions of the same song share their search key."""
+    assert WorkerSearchLyrics.get_search_key(
+        create_track("Bohemian Rhapsody", "Queen")
+    ) == WorkerSearchLyrics.get_search_key(
+        create_track("Bohemian Rhapsody - Remastered 2011", "QUEEN")
+    )
+
+
+def test_search_key_untitled() -> None:
+    """Check that two untitled tracks by the same artist don't get a key, and are never searched."""
+    tracks = [create_track("", "Queen"), create_track("", "Queen")]
+    assert [WorkerSearchLyrics.get_search_key(track) for track in tracks] == [
+        None,
+        None,
+    ]
+    # The lyrics cache would fail the test if the search used it
+    gtagger = types.SimpleNamespace(lyrics_cache=None)
+    for track in tracks:
+        worker = WorkerSearchLyrics(None, [track], True, gtagger)
+        assert worker.search_lyrics() == ""
+        assert not worker.requested
+
+
+def test_search_key_no_artist() -> None:
+    """Check that a track without a main artist doesn't get a key."""
+    assert WorkerSearchLyrics.get_search_key(create_track("Song", "")) is None
@@ -0,0 +1,26 @@
+"""Tests of the tracks of the model with new lyrics to save."""
+
+from __future__ import annotations
+
+from src.tracks_list import TracksModel
+from tests.test_tag import create_track
+
+
+def test_lyrics_to_save() -> None:
+    """Check that only the tracks with new lyrics that differ from the lyrics of their files are saved."""
+    model = TracksModel()
+    track = create_track("Song", "Artist")
+    track.lyrics_original = "First line"
+    model.add_tracks([track])
+
+    track.set_lyrics_new("First line")
+    model.lyrics_changed(track)
+    assert track not in model.lyrics_new
+
+    track.set_lyrics_new("Other line")
+    model.lyrics_changed(track)
+    assert track in model.lyrics_new
+
+    track.set_lyrics_new("")
+    model.lyrics_changed(track)
+    assert track not in model.lyrics_new